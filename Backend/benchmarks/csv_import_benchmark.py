@@ -0,0 +1,117 @@
+"""
+    Benchmark of the import of a large users CSV file by `Database.update`, with peak memory reporting.
+
+    Generates a synthetic CSV file of the given size, then measures in a separate process each:
+        - materialized: the previous reading of the file, all the rows loaded as lists then converted to users at once;
+        - import: `Database.update` on an empty database, streaming the file in chunks of 'csv_chunk_size' users;
+        - sync: `Database.update` again on the imported database, every user unchanged.
+    The peak RSS of each process is reported above the RSS of the process before the measure. The LLM is replaced by
+    an offline stand-in returning no keywords, so that only the CSV ingestion and the database writes are measured.
+
+    usage: python csv_import_benchmark.py [--size-mb 50]
+"""
+
+import argparse
+import csv
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from database import Database, DirectoryState  # noqa: E402
+
+TOPICS = ["machine learning", "medical imaging", "epidemiology", "public health", "radiology", "genomics", "biostatistics"]
+
+
+class OfflineLLM:
+    """
+        Stand-in for the LLM processor: no keywords, and the vector store queries are ignored.
+    """
+
+    @staticmethod
+    def query_llm(method_name: str, arguments: list, priority: str = 'interactive') -> list:
+        return []
+
+
+def write_csv(file_path: str, size_mb: int) -> int:
+    rng = random.Random(0)
+    number_of_users = 0
+
+    with open(file_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(Database.required_columns)
+
+        while file.tell() < size_mb * 1024 * 1024:
+            skills = ' '.join(f"I have {rng.randint(2, 30)} years of experience in {rng.choice(TOPICS)}." for _ in range(rng.randint(10, 60)))
+            writer.writerow([
+                "01/15/2023 10:30:00", f"Prénom {number_of_users}", f"Nom {number_of_users}", f"membre{number_of_users}@example.org",
+                "Membre régulier", "Chercheur", "Organisation 7", skills, rng.randint(0, 25), rng.randint(0, 25), "", "", "Oui", "", ""
+            ])
+            number_of_users += 1
+
+    return number_of_users
+
+
+def get_peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Kilobytes on Linux.
+
+
+def measure(mode: str, csv_file: str, database_directory: str) -> None:
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{database_directory}/users.db"
+    database = Database(app, OfflineLLM(), logging.getLogger(__name__))
+    database.db.init_app(app)
+
+    with app.app_context():
+        database.db.create_all()
+
+        if not database.session.get(DirectoryState, 1):
+            database.session.add(DirectoryState(id=1, version=0))
+            database.session.commit()
+
+    baseline_rss = get_peak_rss_mb()
+    started_at = time.perf_counter()
+
+    if mode == 'materialized':
+        with open(csv_file, 'r') as file:
+            rows = list(csv.reader(file))
+
+        users = {row[3]: database.get_user_attributes_from_csv_row(row) for row in rows[1:]}
+        result = f"{len(users)} user(s) loaded"
+    else:
+        result = "updated" if database.update(csv_file) else "failed"
+
+    print(f"  {mode:<12} {time.perf_counter() - started_at:6.1f} s, peak RSS +{get_peak_rss_mb() - baseline_rss:6.1f} MB ({result})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=50)
+    parser.add_argument('--mode', choices=['materialized', 'import', 'sync'], help=argparse.SUPPRESS)
+    parser.add_argument('--csv', help=argparse.SUPPRESS)
+    parser.add_argument('--database-directory', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        measure(args.mode, args.csv, args.database_directory)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_file = os.path.join(directory, 'users.csv')
+        number_of_users = write_csv(csv_file, args.size_mb)
+        print(f"{csv_file}: {os.path.getsize(csv_file) / 1024 / 1024:.1f} MB, {number_of_users} user(s)")
+
+        for mode in ['materialized', 'import', 'sync']:
+            subprocess.run([sys.executable, __file__, '--mode', mode, '--csv', csv_file, '--database-directory', directory], check=True)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    main()
@@ -0,0 +1,157 @@
+"""
+    Benchmark of the retrieval of the experts of a generic profile: sentence-level vectors only, or expert-level vectors
+    shortlisting the experts whose sentences are then re-scored.
+
+    Builds a synthetic corpus in a temporary Chroma database: experts with one or two topics and a long-tailed number of
+    sentences (a few experts have hundreds of them), each sentence being the vector of one of its expert's topics plus
+    noise. The generic profiles are topic vectors plus noise. For each method, the script reports the latency of a query
+    of one generic profile, as in '/search/stream', on a first pass over the generic profiles (cold: the sentences of the
+    shortlisted experts are not in memory yet) and a second one (warm), and the recall@5 against the exact ranking,
+    computed by brute force over all the sentences:
+        - sentences: `ExpertVectorStore.query_experts`, the closest sentences with an adaptive number of results;
+        - shortlist N: `ExpertVectorStore.query_experts_in_shortlist`, the N closest expert vectors, then their sentences.
+
+    usage: python expert_retrieval_benchmark.py [--experts 1000] [--queries 200] [--aggregation min]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import chromadb
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from settings import SERVER_SETTINGS  # noqa: E402
+from vector_store import ExpertVectorStore  # noqa: E402
+
+DIMENSION = 128
+TOPICS = 60
+
+
+class LookupEmbeddingFunction:
+    """
+        Stand-in for the embedding model: returns the precomputed vector of each synthetic text.
+    """
+
+    def __init__(self):
+        self.vectors: dict[str, list[float]] = {}
+
+    def __call__(self, input: list[str]) -> list[list[float]]:
+        return [self.vectors[text] for text in input]
+
+
+def get_unit_vectors(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def build_corpus(rng: np.random.Generator, number_of_experts: int, embedding_function: LookupEmbeddingFunction) -> tuple[np.ndarray, dict[str, list[str]]]:
+    topics = get_unit_vectors(rng.normal(size=(TOPICS, DIMENSION)))
+    expert_sentences = {}
+
+    for i in range(number_of_experts):
+        expert_topics = rng.choice(TOPICS, size=rng.integers(1, 3), replace=False)
+        number_of_sentences = int(rng.integers(150, 300)) if rng.random() < 0.05 else int(rng.integers(3, 20))
+        sentences = []
+
+        for j in range(number_of_sentences):
+            sentence = f"expert {i} sentence {j}"
+            vector = topics[rng.choice(expert_topics)] + rng.normal(scale=0.09, size=DIMENSION)
+            embedding_function.vectors[sentence] = get_unit_vectors(vector).tolist()
+            sentences.append(sentence)
+
+        expert_sentences[f"expert{i}@example.org"] = sentences
+
+    return topics, expert_sentences
+
+
+def get_exact_experts(query_vector: np.ndarray, sentence_emails: list[str], sentence_vectors: np.ndarray, aggregation: str) -> list[str]:
+    distances = 1.0 - sentence_vectors @ query_vector
+    expert_emails, _ = ExpertVectorStore.rank_experts(sentence_emails, distances, SERVER_SETTINGS["expert_recommendation_max_distance"], aggregation)
+    return expert_emails[:SERVER_SETTINGS["expert_recommendation_experts_per_profile"]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--experts', type=int, default=1000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--aggregation', choices=['min', 'mean'], default=SERVER_SETTINGS["expert_recommendation_aggregation"])
+    parser.add_argument('--shortlist-sizes', type=int, nargs='+', default=[10, 25, 50, 100])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    embedding_function = LookupEmbeddingFunction()
+    topics, expert_sentences = build_corpus(rng, args.experts, embedding_function)
+
+    queries = []
+    for i in range(args.queries):
+        query = f"generic profile {i}"
+        embedding_function.vectors[query] = get_unit_vectors(topics[rng.integers(TOPICS)] + rng.normal(scale=0.07, size=DIMENSION)).tolist()
+        queries.append(query)
+
+    with tempfile.TemporaryDirectory() as directory:
+        client = chromadb.PersistentClient(path=directory)
+        collection = client.get_or_create_collection(name="Experts", embedding_function=embedding_function, metadata={"hnsw:space": "cosine"})
+        expert_collection = client.get_or_create_collection(name="ExpertVectors", embedding_function=embedding_function, metadata={"hnsw:space": "cosine"})
+        vector_store = ExpertVectorStore(
+            collection,
+            embedding_function,
+            SERVER_SETTINGS["chroma_batch_size"],
+            expert_collection,
+            SERVER_SETTINGS["expert_recommendation_sentence_cache_bytes"]
+        )
+
+        started_at = time.perf_counter()
+        vector_store.sync_experts(expert_sentences)
+        print(f"{vector_store.count()} sentence(s) of {vector_store.count_experts()} expert(s) stored in {time.perf_counter() - started_at:.1f} s")
+
+        sentence_emails = [expert_email for expert_email, sentences in expert_sentences.items() for _ in sentences]
+        sentence_vectors = np.asarray([embedding_function.vectors[sentence] for sentences in expert_sentences.values() for sentence in sentences])
+        exact_experts = [get_exact_experts(np.asarray(embedding_function.vectors[query]), sentence_emails, sentence_vectors, args.aggregation) for query in queries]
+
+        methods = {
+            'sentences': lambda query: vector_store.query_experts(
+                [query],
+                SERVER_SETTINGS["expert_recommendation_experts_per_profile"],
+                SERVER_SETTINGS["expert_recommendation_max_distance"],
+                args.aggregation,
+                SERVER_SETTINGS["expert_recommendation_n_results"],
+                SERVER_SETTINGS["expert_recommendation_max_n_results"]
+            )[0]
+        }
+
+        for shortlist_size in args.shortlist_sizes:
+            methods[f'shortlist {shortlist_size}'] = lambda query, shortlist_size=shortlist_size: vector_store.query_experts_in_shortlist(
+                [query],
+                SERVER_SETTINGS["expert_recommendation_experts_per_profile"],
+                SERVER_SETTINGS["expert_recommendation_max_distance"],
+                args.aggregation,
+                shortlist_size
+            )[0]
+
+        print(f"{'method':<14} {'cold mean (ms)':>14} {'warm mean (ms)':>14} {'warm p95 (ms)':>13} {'recall@5':>9}")
+
+        for name, method in methods.items():
+            vector_store.forget_sentence_vectors(list(expert_sentences))
+            latencies = {'cold': [], 'warm': []}  # The first pass fetches the sentences of each shortlisted expert once.
+            recalls = []
+
+            for run in ['cold', 'warm']:
+                for query, expected_experts in zip(queries, exact_experts):
+                    started_at = time.perf_counter()
+                    found_experts = method(query)['expert_emails']
+                    latencies[run].append(time.perf_counter() - started_at)
+
+                    if run == 'warm' and expected_experts:
+                        recalls.append(len(set(found_experts) & set(expected_experts)) / len(expected_experts))
+
+            print(
+                f"{name:<14} {1000 * np.mean(latencies['cold']):14.2f} {1000 * np.mean(latencies['warm']):14.2f} "
+                f"{1000 * np.percentile(latencies['warm'], 95):13.2f} {np.mean(recalls):9.3f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+    Benchmark of the '/filter' route on synthetic members.
+
+    Compares the previous filtering (all the users loaded, then filtered in Python by splitting their comma-separated
+    attributes) against `Database.filter_user_ids` (a single SQL query using the experience indexes and the user_tags table),
+    checks that both return the same users in the same order, and reports the time per request.
+
+    usage: python filter_benchmark.py [--members 10000 100000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from flask import Flask
+from sqlalchemy import insert
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from database import Database, User  # noqa: E402
+
+CATEGORIES = ["Membre régulier", "Membre étudiant", "Membre partenaire", "Membre honoraire"]
+ORGANIZATIONS = [f"Organisation {i}" for i in range(200)]
+TAGS = [f"MOT CLÉ {i}" for i in range(2000)]
+CRITERIA = {
+    "experience": {"years_experience_ia": [5, 10], "years_experience_healthcare": [0, 3]},
+    "tags": {"tags": ["mot clé 12", " MOT CLÉ 1500 "]},
+    "combined": {"membership_category": ["membre étudiant"], "affiliation_organization": ["organisation 7", "organisation 42"], "years_experience_ia": [1, 20]},
+}
+
+
+def filter_users_previous(criteria: dict) -> list[User]:
+    matching_users = User.query.all()
+
+    for attr in criteria.keys():
+        if attr in ['years_experience_ia', 'years_experience_healthcare']:
+            matching_users = list(filter(lambda user: getattr(user, attr) is not None and criteria[attr][0] <= getattr(user, attr) <= criteria[attr][1], matching_users))
+        elif attr in ['membership_category', 'affiliation_organization', 'tags']:
+            if len(criteria[attr]) == 0:
+                continue
+
+            matching_users = [
+                user for user in matching_users
+                if getattr(user, attr) is not None and any(
+                    criteria_value.strip().lower() in [user_value.strip().lower() for user_value in getattr(user, attr).split(',')] for criteria_value in criteria[attr]
+                )
+            ]
+
+    return matching_users
+
+
+def get_members(number_of_members: int) -> list[dict]:
+    rng = random.Random(0)
+    return [
+        {
+            "first_name": f"Prénom {i}",
+            "last_name": f"Nom {i}",
+            "email": f"membre{i}@example.org",
+            "membership_category": rng.choice(CATEGORIES),
+            "affiliation_organization": ', '.join(rng.sample(ORGANIZATIONS, rng.randint(1, 2))),
+            "years_experience_ia": rng.choice([None, rng.randint(0, 25)]),
+            "years_experience_healthcare": rng.choice([None, rng.randint(0, 25)]),
+            "tags": ', '.join(rng.sample(TAGS, rng.randint(3, 12))),
+        }
+        for i in range(number_of_members)
+    ]
+
+
+def filter_user_ids_previous(criteria: dict) -> list[int]:
+    return [user.user_id for user in filter_users_previous(criteria)]
+
+
+def time_filter(function, criteria: dict, repeat: int) -> tuple[float, list[int]]:
+    started_at = time.perf_counter()
+
+    for _ in range(repeat):
+        user_ids = function(criteria)
+        Database.db.session.expunge_all()  # Do not let the identity map serve the next request.
+
+    return (time.perf_counter() - started_at) / repeat, user_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for number_of_members in args.members:
+        with tempfile.TemporaryDirectory() as directory:
+            app = Flask(__name__)
+            app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{directory}/users.db"
+            database = Database(app, None, logging.getLogger(__name__))
+            database.db.init_app(app)
+
+            with app.app_context():
+                database.db.create_all()
+                database.session.execute(insert(User), get_members(number_of_members))
+                database.session.commit()
+                database.rebuild_user_tags()
+
+                print(f"{number_of_members} members")
+
+                for name, criteria in CRITERIA.items():
+                    previous_time, previous_ids = time_filter(filter_user_ids_previous, criteria, args.repeat)
+                    current_time, current_ids = time_filter(database.filter_user_ids, criteria, args.repeat)
+                    assert previous_ids == current_ids, f"The {name} filter returned different users."
+                    print(f"  {name:<10} {len(current_ids):>6} match(es): previous {previous_time * 1000:8.1f} ms, current {current_time * 1000:7.1f} ms ({previous_time / current_time:.0f}x faster)")
+
+                database.db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+    Micro-benchmark of the queries sent to the LLM processor.
+
+    Compares the number of calls per second obtained with a new ZeroMQ context and REQ socket per call (previous
+    behavior of `LLM.query_llm`) against the pooled `LLMClient`, both talking to a local stub responder that replies
+    immediately, so only the client-side overhead is measured.
+
+    usage: python llm_client_benchmark.py [number_of_calls]
+"""
+
+import os
+import sys
+import time
+import zmq
+from threading import Thread
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from llm_client import LLMClient  # noqa: E402
+
+RESPONSE_ADDRESS = "tcp://127.0.0.1:5599"
+REQUEST_ADDRESS = "tcp://127.0.0.1:5599"
+
+
+def start_stub_responder(context: zmq.Context) -> None:
+    """
+        Start a stub LLM processor that answers every query with a successful empty result.
+    """
+
+    socket = context.socket(zmq.REP)
+    socket.bind(RESPONSE_ADDRESS)
+
+    def respond():
+        try:
+            while True:
+                socket.recv_json()
+                socket.send_json({'status': 'success', 'result': []})
+        except zmq.error.ContextTerminated:
+            socket.close(0)
+
+    Thread(target=respond, daemon=True).start()
+
+
+def query_with_new_context(message: dict) -> dict:
+    """
+        Send a query the way `LLM.query_llm` used to: a new context and socket for every call.
+    """
+
+    socket = zmq.Context().socket(zmq.REQ)
+    socket.connect(REQUEST_ADDRESS)
+    socket.send_json(message)
+    response = socket.recv_json()
+    socket.close()
+    return response
+
+
+def measure(name: str, query, number_of_calls: int) -> float:
+    message = {'method': 'get_keywords', 'arguments': ['benchmark']}
+    start = time.perf_counter()
+
+    for _ in range(number_of_calls):
+        query(message)
+
+    elapsed = time.perf_counter() - start
+    calls_per_second = number_of_calls / elapsed
+    print(f"{name:<32} {number_of_calls} calls in {elapsed:.3f} s -> {calls_per_second:,.0f} calls/s")
+    return calls_per_second
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    stub_context = zmq.Context()
+    start_stub_responder(stub_context)
+
+    client = LLMClient(address=REQUEST_ADDRESS, timeout=5000, pool_size=4, retries=2)
+
+    before = measure("new context per call (before)", query_with_new_context, calls)
+    after = measure("pooled LLMClient (after)", client.request, calls)
+    print(f"speedup: x{after / before:.1f}")
+
+    client.close()
+    stub_context.destroy(linger=0)
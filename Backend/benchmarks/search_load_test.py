@@ -0,0 +1,83 @@
+"""
+    Load test of the LLM processor broker.
+
+    Fires N concurrent `get_experts_recommendation` queries (the LLM call made by each `/search` request) at a broker
+    whose handler is a stubbed LLM, while a CSV import floods the broker with slow batch `get_keywords` queries.
+    The p50/p99 latency of the search queries is reported for a single worker (previous single REP loop) and for a
+    pool of workers, along with the counters of the broker lanes.
+
+    usage: python search_load_test.py [number_of_searches] [number_of_workers]
+"""
+
+import logging
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Thread
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from llm_broker import LLMBroker  # noqa: E402
+from llm_client import LLMClient  # noqa: E402
+
+FRONTEND_ADDRESS = "tcp://127.0.0.1:5598"
+STUB_LATENCIES = {  # Simulated Ollama processing time of each method, in seconds.
+    'get_experts_recommendation': 0.2,
+    'get_keywords': 2.0,
+}
+
+
+def stub_llm(data: dict) -> dict:
+    time.sleep(STUB_LATENCIES[data['method']])
+    return {'status': 'success', 'result': {}}
+
+
+def run_load_test(number_of_searches: int, number_of_workers: int, number_of_import_threads: int = 8) -> None:
+    broker = LLMBroker(stub_llm, FRONTEND_ADDRESS, number_of_workers, 1, logging.getLogger(__name__))
+    broker.bind()
+    broker_thread = Thread(target=broker.run, daemon=True)
+    broker_thread.start()
+
+    client = LLMClient(address=FRONTEND_ADDRESS, timeout=600000, pool_size=number_of_searches + number_of_import_threads + 1, retries=0)
+    import_done = Event()
+
+    def import_csv():
+        while not import_done.is_set():
+            client.request({'method': 'get_keywords', 'arguments': ['skills'], 'priority': 'batch'})
+
+    def search(_):
+        start = time.perf_counter()
+        client.request({'method': 'get_experts_recommendation', 'arguments': ['question']})
+        return time.perf_counter() - start
+
+    import_threads = [Thread(target=import_csv, daemon=True) for _ in range(number_of_import_threads)]
+    for import_thread in import_threads:
+        import_thread.start()
+    time.sleep(0.1)  # Let the import job reach the LLM first.
+
+    with ThreadPoolExecutor(max_workers=number_of_searches) as executor:
+        latencies = sorted(executor.map(search, range(number_of_searches)))
+
+    stats = client.request({'method': 'get_llm_processor_stats', 'arguments': []})['result']
+    import_done.set()
+    for import_thread in import_threads:
+        import_thread.join()
+    client.close()
+    broker.stop()
+    broker_thread.join()
+
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(round(0.99 * len(latencies))) - 1)]
+    print(f"{number_of_workers} worker(s), {number_of_searches} concurrent searches: p50 = {p50:.2f} s, p99 = {p99:.2f} s")
+    for lane, counters in stats.items():
+        print(f"    {lane:<12} " + ', '.join(f"{name} = {value:.2f}" if isinstance(value, float) else f"{name} = {value}" for name, value in counters.items()))
+
+
+if __name__ == "__main__":
+    searches = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    run_load_test(searches, 1)
+    run_load_test(searches, workers)
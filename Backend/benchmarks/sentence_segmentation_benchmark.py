@@ -0,0 +1,90 @@
+"""
+    Benchmark of the sentence segmentation of all the members' skills.
+
+    Compares the previous segmentation (the full spaCy pipeline, tagger, parser, NER and lemmatizer included, run on
+    one document at a time) against `SentenceSegmenter.segment` (the sentence recognizer only, in `nlp.pipe` batches),
+    and reports how many documents are split into the same sentences by both.
+
+    usage: python sentence_segmentation_benchmark.py [--csv ../resources/users.csv] [--experts 500] [--language en]
+                                                     [--batch-size 64] [--n-process 1]
+
+    Without --csv (or if the file does not exist), synthetic profiles are generated. The spaCy models of the server
+    settings must be installed.
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+import spacy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from settings import SERVER_SETTINGS  # noqa: E402
+from text_segmentation import SentenceSegmenter  # noqa: E402
+
+SENTENCES = {
+    'en': [
+        "I have {years} years of experience in {topic}.", "My research focuses on {topic} applied to hospitals.",
+        "I lead projects in {topic} with clinicians", "Dr. Smith and I teach {topic} to graduate students.",
+    ],
+    'fr': [
+        "J'ai {years} ans d'expérience en {topic}.", "Mes travaux portent sur {topic} en milieu hospitalier.",
+        "Je dirige des projets de {topic} avec des cliniciens", "J'enseigne {topic} aux étudiants des cycles supérieurs.",
+    ],
+}
+TOPICS = ["machine learning", "medical imaging", "epidemiology", "public health", "radiology", "genomics", "biostatistics"]
+
+
+def load_skills(csv_file: str, number_of_experts: int, language: str) -> list[str]:
+    if csv_file and os.path.exists(csv_file):
+        with open(csv_file, 'r') as file:
+            reader = csv.reader(file)
+            next(reader)  # Skip the header row.
+            return [row[7] for row in reader]
+
+    rng = random.Random(0)
+    return [
+        rng.choice([' ', '\n']).join(rng.choice(SENTENCES[language]).format(years=rng.randint(2, 30), topic=rng.choice(TOPICS)) for _ in range(rng.randint(3, 20)))
+        for _ in range(number_of_experts)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=SERVER_SETTINGS["users_csv_file"])
+    parser.add_argument('--experts', type=int, default=500)
+    parser.add_argument('--language', choices=['en', 'fr'], default='en')
+    parser.add_argument('--batch-size', type=int, default=SERVER_SETTINGS["spacy_batch_size"])
+    parser.add_argument('--n-process', type=int, default=SERVER_SETTINGS["spacy_n_process"])
+    args = parser.parse_args()
+
+    model_name = SERVER_SETTINGS[f"spacy_nlp_{args.language}"]
+
+    if not spacy.util.is_package(model_name):
+        sys.exit(f"{model_name} is not installed: python -m spacy download {model_name}")
+
+    expert_skills = load_skills(args.csv, args.experts, args.language)
+
+    nlp = spacy.load(model_name)
+    started_at = time.perf_counter()
+    previous = [[sentence.text for sentence in nlp(skills).sents] for skills in expert_skills]
+    previous_time = time.perf_counter() - started_at
+
+    segmenter = SentenceSegmenter({args.language: model_name}, args.batch_size, args.n_process)
+    started_at = time.perf_counter()
+    current = segmenter.segment(expert_skills, args.language)
+    current_time = time.perf_counter() - started_at
+
+    same_documents = sum(1 for previous_sentences, current_sentences in zip(previous, current) if previous_sentences == current_sentences)
+
+    print(f"corpus: {len(expert_skills)} profile(s), {sum(len(skills) for skills in expert_skills)} character(s), model {model_name}")
+    print(f"full pipeline, one document at a time: {previous_time:.2f} s ({len(expert_skills) / previous_time:.0f} docs/s), {sum(map(len, previous))} sentence(s)")
+    print(f"sentence segmenter, batches of {args.batch_size}, {args.n_process} process(es): {current_time:.2f} s ({len(expert_skills) / current_time:.0f} docs/s), {sum(map(len, current))} sentence(s)")
+    print(f"speedup: {previous_time / current_time:.1f}x, identical segmentation for {same_documents}/{len(expert_skills)} profile(s)")
+
+
+if __name__ == '__main__':
+    main()
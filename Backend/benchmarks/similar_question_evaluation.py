@@ -0,0 +1,118 @@
+"""
+    Offline evaluation of the reuse of the generic profiles of similar questions by '/search'.
+
+    Every question is sent once to the LLM processor of a running server, which translates it, embeds it and generates
+    its generic profiles without looking up the similar questions. The questions are then replayed in order through an
+    empty `SimilarQuestionCache` for each threshold, and the script reports:
+        - the hit rate: the share of questions that reuse the generic profiles of a previous question;
+        - the hits on a paraphrase: the share of hits whose previous question belongs to the same group;
+        - how often the reused generic profiles differ from the ones freshly generated for the question, and their
+          average overlap (Jaccard index of the lowercased profiles).
+
+    usage: python similar_question_evaluation.py [--questions questions.txt] [--thresholds 0.85 0.9 0.95]
+
+    The questions file holds one question per line, the paraphrases of a question being grouped in consecutive lines
+    and the groups separated by a blank line. Without --questions, a built-in set of questions is used. The server must
+    be running, as its LLM processor answers the queries.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ai import LLM  # noqa: E402
+from settings import SERVER_SETTINGS  # noqa: E402
+from search_cache import SimilarQuestionCache  # noqa: E402
+
+QUESTION_GROUPS = [
+    [
+        "Je cherche un expert en imagerie médicale et apprentissage profond.",
+        "Qui peut m'aider avec l'apprentissage profond appliqué à l'imagerie médicale?",
+        "Besoin d'un spécialiste du deep learning pour des images médicales",
+    ],
+    [
+        "Quels membres ont de l'expérience en traitement du langage naturel pour les dossiers cliniques?",
+        "Je cherche quelqu'un qui fait du TALN sur des notes cliniques.",
+    ],
+    [
+        "Je veux évaluer les biais d'un algorithme de triage aux urgences.",
+        "Qui s'y connaît en équité algorithmique pour le triage à l'urgence?",
+        "Expert en biais des modèles prédictifs en soins d'urgence",
+    ],
+    [
+        "Comment déployer un modèle prédictif dans un hôpital?",
+        "Qui a déjà mis en production un modèle d'IA en milieu hospitalier?",
+    ],
+    [
+        "Je cherche un expert en éthique de l'IA en santé.",
+    ],
+]
+
+
+def load_question_groups(questions_file: str) -> list[list[str]]:
+    if not questions_file:
+        return QUESTION_GROUPS
+
+    with open(questions_file, 'r') as file:
+        blocks = file.read().split('\n\n')
+
+    return [[line.strip() for line in block.splitlines() if line.strip()] for block in blocks if block.strip()]
+
+
+def normalize_profiles(generic_profiles: list[str]) -> set[str]:
+    return {' '.join(generic_profile.lower().split()) for generic_profile in generic_profiles}
+
+
+def evaluate(questions: list[dict], threshold: float) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SimilarQuestionCache(os.path.join(directory, 'similar_questions.db'), threshold, SERVER_SETTINGS["similar_question_cache_size"])
+        group_of_query = {question['query']: question['group'] for question in questions}
+        paraphrase_hits = differing_profiles = 0
+        overlaps = []
+
+        for question in questions:
+            matching_query, _ = cache.find(question['embedding'])
+            reused_profiles = cache.get(question['embedding'])
+
+            if reused_profiles is None:
+                cache.put(question['query'], question['embedding'], question['generic_profiles'])
+                continue
+
+            reused, fresh = normalize_profiles(reused_profiles), normalize_profiles(question['generic_profiles'])
+            paraphrase_hits += group_of_query[matching_query] == question['group']
+            differing_profiles += reused != fresh
+            overlaps.append(len(reused & fresh) / len(reused | fresh) if reused | fresh else 1.0)
+
+        return {
+            'hit_rate': cache.hits / len(questions),
+            'paraphrase_hits': paraphrase_hits / cache.hits if cache.hits else 0.0,
+            'differing_profiles': differing_profiles / cache.hits if cache.hits else 0.0,
+            'overlap': sum(overlaps) / len(overlaps) if overlaps else 0.0,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--questions', default=None)
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.85, SERVER_SETTINGS["similar_question_threshold"], 0.95])
+    args = parser.parse_args()
+
+    question_groups = load_question_groups(args.questions)
+    questions = [
+        {**LLM.query_llm('generate_generic_profiles', [question], priority='batch'), 'group': group}
+        for group, group_questions in enumerate(question_groups) for question in group_questions
+    ]
+
+    print(f"{len(questions)} question(s) in {len(question_groups)} group(s) of paraphrases")
+    print("threshold  hit rate  hits on a paraphrase  reused profiles differing  profiles overlap")
+
+    for threshold in sorted(args.thresholds):
+        result = evaluate(questions, threshold)
+        print(f"{threshold:9.2f}  {result['hit_rate']:8.0%}  {result['paraphrase_hits']:20.0%}  {result['differing_profiles']:25.0%}  {result['overlap']:16.0%}")
+
+
+if __name__ == '__main__':
+    main()
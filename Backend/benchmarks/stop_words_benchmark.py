@@ -0,0 +1,92 @@
+"""
+    Micro-benchmark of the stop-word removal run by `LLM.__get_keywords` on a long profile.
+
+    `__get_keywords` removes the stop words from the candidate keywords returned by the LLM for every paragraph of five
+    sentences of a profile. The previous implementation ran the full spaCy pipeline on each keyword and rebuilt the list
+    of stop words for every token; the current one builds a frozenset once and tokenizes all the keywords of a paragraph
+    in a single `nlp.tokenizer.pipe` batch. The LLM and KeyBERT stages of `__get_keywords` are unchanged and left out.
+
+    usage: python stop_words_benchmark.py [--paragraphs 40] [--keywords 15] [--repeat 5]
+
+    The 'spacy_nlp_fr' model is used if it is installed, otherwise a blank French pipeline (same tokenizer and stop words).
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+import spacy
+from spacy import Language
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from settings import SERVER_SETTINGS  # noqa: E402
+
+WORDS = [
+    "apprentissage", "automatique", "de", "la", "santé", "imagerie", "médicale", "des", "données", "cliniques", "le",
+    "traitement", "du", "langage", "naturel", "en", "épidémiologie", "les", "réseaux", "neuronaux", "pour", "essais",
+    "gestion", "et", "éthique", "l'intelligence", "artificielle", "vision", "par", "ordinateur", "biostatistique",
+]
+
+
+def get_previous_stop_words(nlp: Language) -> list[str]:
+    return list(nlp.Defaults.stop_words) + [p for p in string.punctuation]
+
+
+def remove_stop_words_previous(documents: list[str], nlp: Language) -> list[str]:
+    filtered_documents = []
+    for doc in documents:
+        tokenized_doc = nlp(doc)
+        filtered_tokens = [token.text for token in tokenized_doc if token.text not in get_previous_stop_words(nlp)]
+        filtered_documents.append(' '.join(filtered_tokens))
+    return filtered_documents
+
+
+def remove_stop_words_current(documents: list[str], nlp: Language, stop_words: frozenset[str]) -> list[str]:
+    return [' '.join(token.text for token in tokenized_doc if token.text not in stop_words) for tokenized_doc in nlp.tokenizer.pipe(documents)]
+
+
+def load_nlp(model_name: str) -> Language:
+    if spacy.util.is_package(model_name):
+        return spacy.load(model_name)
+
+    print(f"{model_name} is not installed, using a blank French pipeline.")
+    return spacy.blank('fr')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paragraphs', type=int, default=40)
+    parser.add_argument('--keywords', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    nlp = load_nlp(SERVER_SETTINGS["spacy_nlp_fr"])
+    paragraphs_keywords = [
+        [' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) for _ in range(args.keywords)]
+        for _ in range(args.paragraphs)
+    ]
+
+    started_at = time.perf_counter()
+    for _ in range(args.repeat):
+        previous = [remove_stop_words_previous(keywords, nlp) for keywords in paragraphs_keywords]
+    previous_time = (time.perf_counter() - started_at) / args.repeat
+
+    started_at = time.perf_counter()
+    for _ in range(args.repeat):
+        stop_words = frozenset(nlp.Defaults.stop_words) | frozenset(string.punctuation)  # Built once per profile here, once per server in the LLM.
+        current = [remove_stop_words_current(keywords, nlp, stop_words) for keywords in paragraphs_keywords]
+    current_time = (time.perf_counter() - started_at) / args.repeat
+
+    assert previous == current, "The candidate keywords differ."
+
+    print(f"profile: {args.paragraphs} paragraph(s), {args.paragraphs * args.keywords} candidate keyword(s)")
+    print(f"previous: {previous_time * 1000:.1f} ms per profile")
+    print(f"current:  {current_time * 1000:.1f} ms per profile ({previous_time / current_time:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
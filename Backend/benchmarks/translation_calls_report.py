@@ -0,0 +1,124 @@
+"""
+    Report of the external translation calls made by a full `Database.populate`.
+
+    A full populate translates the skills of every member twice: to English when the LLM processor builds the `Experts`
+    vector store, and to French when `get_keywords` tags the member. The previous translation sent one Google Translator
+    request per text (or per 3000 characters chunk of the texts longer than 5000 characters). The `Translator` sends only
+    the lines missing from its translation memory, packed by text into requests of up to 5000 characters, and nothing at
+    all once the memory is warm (e.g. when the server restarts or the vector store is rebuilt).
+
+    No request is sent: the Google backend is replaced by a subclass counting the requests and returning the lines tagged
+    with the destination language.
+
+    usage: python translation_calls_report.py [--csv ../resources/users.csv] [--experts 500]
+
+    Without --csv (or if the file does not exist), synthetic multi-line profiles are generated.
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from settings import SERVER_SETTINGS  # noqa: E402
+from translation import GoogleTranslatorBackend, Translator  # noqa: E402
+
+SENTENCES = [
+    "J'ai {years} ans d'expérience en {topic}.",
+    "Mes travaux portent sur {topic} appliqué aux soins de santé.",
+    "Je dirige des projets de {topic} en milieu hospitalier.",
+    "J'enseigne {topic} aux étudiants des cycles supérieurs.",
+    "Conseiller scientifique en {topic}.",
+]
+TOPICS = ["apprentissage automatique", "imagerie médicale", "épidémiologie", "santé publique", "radiologie", "génomique", "biostatistique", "éthique"]
+
+
+class CountingGoogleTranslatorBackend(GoogleTranslatorBackend):
+    """
+        Google backend counting the requests it would send, without sending them.
+    """
+
+    def send_request(self, text: str, destination_language: str) -> str:
+        self.external_calls += 1
+        return '\n'.join(f"[{destination_language}] {line}" for line in text.split('\n'))  # A translation differing from the text, as the identical ones are not stored.
+
+
+def count_previous_calls(text: str) -> int:
+    """
+        Count the requests sent by the previous `LLM.__translate_text` to translate a text.
+    """
+
+    if len(text) <= 5000:
+        return 1
+
+    calls = 0
+    chunk_to_translate = ''
+
+    for sentence in text.lstrip().split('\n'):
+        if not sentence:
+            continue
+
+        if len(chunk_to_translate) >= 3000:
+            calls += 1
+            chunk_to_translate = ''
+        else:
+            chunk_to_translate += sentence + '\n'
+
+    return calls + (1 if chunk_to_translate else 0)
+
+
+def load_skills(csv_file: str, number_of_experts: int) -> list[str]:
+    if csv_file and os.path.exists(csv_file):
+        with open(csv_file, 'r') as file:
+            reader = csv.reader(file)
+            next(reader)  # Skip the header row.
+            return [row[7] for row in reader]
+
+    rng = random.Random(0)
+    return [
+        '\n'.join(rng.choice(SENTENCES).format(years=rng.randint(2, 30), topic=rng.choice(TOPICS)) for _ in range(rng.randint(3, 15)))
+        for _ in range(number_of_experts)
+    ]
+
+
+def populate_calls(translator: Translator, expert_skills: list[str]) -> int:
+    """
+        Translate the skills as a full populate does and return the number of requests sent.
+    """
+
+    calls_before = translator.backend.external_calls
+    translator.translate_batch(expert_skills, 'en')  # Vector store build, all the experts at once.
+
+    for skills in expert_skills:  # Keywords tagging, one member at a time.
+        translator.translate(skills, 'fr')
+
+    return translator.backend.external_calls - calls_before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=SERVER_SETTINGS["users_csv_file"])
+    parser.add_argument('--experts', type=int, default=500)
+    args = parser.parse_args()
+
+    expert_skills = load_skills(args.csv, args.experts)
+    previous_calls = sum(2 * count_previous_calls(skills) for skills in expert_skills if skills)
+
+    with tempfile.TemporaryDirectory() as directory:
+        translator = Translator(CountingGoogleTranslatorBackend(), os.path.join(directory, 'translations.db'))
+        cold_calls = populate_calls(translator, expert_skills)
+        warm_calls = populate_calls(translator, expert_skills)
+
+    print(f"members: {len(expert_skills)}")
+    print(f"external translation calls, previous translation:        {previous_calls}")
+    print(f"external translation calls, empty translation memory:    {cold_calls}")
+    print(f"external translation calls, warm translation memory:     {warm_calls}")
+    print(f"translation memory: {translator.get_stats()}")
+
+
+if __name__ == '__main__':
+    main()
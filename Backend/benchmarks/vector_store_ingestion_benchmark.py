@@ -0,0 +1,124 @@
+"""
+    Benchmark of the cold build of the `Experts` vector store on a synthetic corpus.
+
+    Compares the previous ingestion (one `add` call per sentence, embedding a batch of one, and one `get` per expert)
+    against the bulk ingestion of `ExpertVectorStore.sync_experts`. The previous ingestion is measured on a sample of the
+    experts and extrapolated to the whole corpus, as it is too slow to run in full. A weekly sync where a few profiles
+    changed by one sentence is then measured on the built collection.
+
+    usage: python vector_store_ingestion_benchmark.py [--experts 2000] [--sample 100] [--fake-embeddings]
+
+    --fake-embeddings replaces all-mpnet-base-v2 by a hashing embedding, to measure the Chroma overhead only.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+import chromadb
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from settings import SERVER_SETTINGS  # noqa: E402
+from vector_store import ExpertVectorStore  # noqa: E402
+
+TOPICS = [
+    "machine learning", "medical imaging", "natural language processing", "clinical trials", "epidemiology",
+    "data security", "cardiology", "oncology", "health informatics", "deep learning", "public health", "radiology",
+    "rehabilitation", "genomics", "operational research", "software engineering", "biostatistics", "ethics",
+]
+TEMPLATES = [
+    "I have {years} years of experience in {topic}.",
+    "My research focuses on {topic} applied to {other}.",
+    "I lead projects combining {topic} and {other} in hospitals.",
+    "I developed tools for {topic} used by clinicians.",
+    "I teach {topic} and supervise graduate students in {other}.",
+]
+
+
+class HashingEmbeddingFunction:
+    """
+        Deterministic stand-in for the sentence transformer, producing a random unit vector per text.
+    """
+
+    def __init__(self, dimension: int = 768):
+        self.dimension = dimension
+
+    def __call__(self, texts):
+        embeddings = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], 'little')
+            vector = np.random.default_rng(seed).standard_normal(self.dimension)
+            embeddings.append((vector / np.linalg.norm(vector)).tolist())
+        return embeddings
+
+
+def generate_corpus(number_of_experts: int) -> dict[str, list[str]]:
+    rng = random.Random(42)
+    corpus = {}
+
+    for i in range(number_of_experts):
+        sentences = [
+            rng.choice(TEMPLATES).format(years=rng.randint(1, 30), topic=rng.choice(TOPICS), other=rng.choice(TOPICS))
+            for _ in range(rng.randint(3, 15))
+        ]
+        corpus[f"expert{i}@example.com"] = sentences
+
+    return corpus
+
+
+def get_collection(client, name: str, embedding_function):
+    return client.get_or_create_collection(name=name, embedding_function=embedding_function, metadata={"hnsw:space": "cosine"})
+
+
+def ingest_one_sentence_at_a_time(collection, corpus: dict[str, list[str]]) -> None:
+    for expert_email, sentences in corpus.items():
+        collection.get(where={"expert_email": expert_email})
+        for i, sentence in enumerate(sentences):
+            collection.add(documents=[sentence], metadatas=[{"expert_email": expert_email}], ids=[f"{expert_email}:{i}"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--experts', type=int, default=2000)
+    parser.add_argument('--sample', type=int, default=100)
+    parser.add_argument('--fake-embeddings', action='store_true')
+    args = parser.parse_args()
+
+    if args.fake_embeddings:
+        embedding_function = HashingEmbeddingFunction()
+    else:
+        from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+        embedding_function = SentenceTransformerEmbeddingFunction(model_name=SERVER_SETTINGS['expert_recommendation_embeddings'])
+
+    corpus = generate_corpus(args.experts)
+    number_of_sentences = sum(len(sentences) for sentences in corpus.values())
+    sample = dict(list(corpus.items())[:args.sample])
+    sample_sentences = sum(len(sentences) for sentences in sample.values())
+    print(f"Synthetic corpus: {args.experts} experts, {number_of_sentences} sentences")
+
+    with tempfile.TemporaryDirectory() as directory:
+        client = chromadb.PersistentClient(path=directory)
+
+        start = time.perf_counter()
+        ingest_one_sentence_at_a_time(get_collection(client, "ExpertsBefore", embedding_function), sample)
+        before = time.perf_counter() - start
+        before_per_sentence = before / sample_sentences
+        print(f"before: {sample_sentences} sentences in {before:.2f} s ({before_per_sentence * 1000:.2f} ms/sentence), "
+              f"extrapolated to the corpus: {before_per_sentence * number_of_sentences:.1f} s")
+
+        vector_store = ExpertVectorStore(get_collection(client, "ExpertsAfter", embedding_function), embedding_function, SERVER_SETTINGS["chroma_batch_size"])
+        start = time.perf_counter()
+        vector_store.sync_experts(corpus)
+        after = time.perf_counter() - start
+        print(f"after:  {number_of_sentences} sentences in {after:.2f} s ({after / number_of_sentences * 1000:.2f} ms/sentence)")
+        print(f"speedup: x{before_per_sentence * number_of_sentences / after:.1f}")
+
+        edited_profiles = {expert_email: sentences[1:] + ["I recently joined a new research group."] for expert_email, sentences in list(corpus.items())[:10]}
+        start = time.perf_counter()
+        added, deleted = vector_store.sync_experts(edited_profiles)
+        print(f"sync of {len(edited_profiles)} edited profiles: {added} sentences embedded, {deleted} deleted in {time.perf_counter() - start:.2f} s")
@@ -3,37 +3,49 @@ import json
 import string
 import time
 import chromadb
-import spacy
-import zmq
 from logging import Logger
-from typing import Optional, Literal, List, Any
+from typing import Optional, Literal, List, Any, Iterator
 from chromadb import ClientAPI
-from chromadb.api.models import Collection
 from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
-from deep_translator import GoogleTranslator
 from flair.embeddings import TransformerDocumentEmbeddings
 from keybert import KeyBERT
 from langchain.chains import LLMChain
-from langchain.embeddings import OllamaEmbeddings
 from langchain.llms import Ollama
 from langchain.output_parsers import CommaSeparatedListOutputParser, PydanticOutputParser
 from langchain.prompts import FewShotPromptTemplate
 from langchain.prompts.prompt import PromptTemplate
 from langchain.schema import Document, OutputParserException
 from spacy import Language
-from zmq import Socket, Context
 from settings import SERVER_SETTINGS
 from ai_models import Experts
+from llm_client import LLMClient
+from llm_broker import LLMBroker
+from vector_store import ExpertVectorStore
+from embedding_cache import CachedEmbeddingFunction
+from translation import Translator
+from text_segmentation import SentenceSegmenter
+from search_cache import SearchResultCache, SimilarQuestionCache
+from profile_stream_parser import GenericProfileStreamParser
 
 
 class LLM:
+    client: LLMClient = LLMClient(
+        address=SERVER_SETTINGS["zeromq_request_address"],
+        timeout=SERVER_SETTINGS["zeromq_request_timeout"],
+        pool_size=SERVER_SETTINGS["zeromq_client_pool_size"],
+        retries=SERVER_SETTINGS["zeromq_request_retries"]
+    )
+
     def __init__(self, app_logger: Logger):
         self.app_logger = app_logger
+        self.translator: Optional[Translator] = None
+        self.search_cache: Optional[SearchResultCache] = None
+        self.similar_question_cache: Optional[SimilarQuestionCache] = None
         self.expert_recommendation_llm: Optional[Ollama] = None
         self.expert_information: Optional[tuple[list[str], list[str]]] = None
-        self.expert_recommendation_embeddings: Optional[OllamaEmbeddings] = None
+        self.expert_recommendation_embeddings: Optional[CachedEmbeddingFunction] = None
         self.expert_recommendation_chroma_db_client: Optional[ClientAPI] = None
-        self.expert_recommendation_vector_store: Optional[Collection] = None
+        self.expert_recommendation_vector_store: Optional[ExpertVectorStore] = None
         self.expert_recommendation_parser: Optional[PydanticOutputParser] = None
         self.expert_recommendation_prompt: Optional[FewShotPromptTemplate] = None
         self.keywords_embeddings: Optional[TransformerDocumentEmbeddings] = None
@@ -41,12 +53,11 @@ class LLM:
         self.keywords_parser: Optional[CommaSeparatedListOutputParser] = None
         self.keywords_prompt: Optional[PromptTemplate] = None
         self.keywords_chain: Optional[LLMChain] = None
+        self.sentence_segmenter: Optional[SentenceSegmenter] = None
         self.nlp_fr: Optional[Language] = None
-        self.nlp_en: Optional[Language] = None
-        self.stop_words_fr: Optional[list[str]] = None
+        self.stop_words_fr: Optional[frozenset[str]] = None
         self.is_available: bool = False
-        self.context: Optional[Context] = None
-        self.socket: Optional[Socket] = None
+        self.broker: Optional[LLMBroker] = None
 
     ###################################################################################################################
     #                                                 PRIVATE METHODS                                                 #
@@ -147,18 +158,23 @@ class LLM:
         return expert_skills_csv, expert_emails_csv
 
     @staticmethod
-    def __get_expert_recommendation_embeddings(expert_recommendation_embeddings: str) -> SentenceTransformerEmbeddingFunction:
+    def __get_expert_recommendation_embeddings(expert_recommendation_embeddings: str) -> CachedEmbeddingFunction:
         """
-            Get Sentence Transformer Embedding Function for expert recommendation.
+            Get Sentence Transformer Embedding Function for expert recommendation, wrapped in a persistent embedding cache.
 
             Parameters:
                 expert_recommendation_embeddings (str): The model name for Sentence Transformer embeddings.
 
             Returns:
-                SentenceTransformerEmbeddingFunction: An instance of Sentence Transformer Embedding Function.
+                CachedEmbeddingFunction: An instance of Sentence Transformer Embedding Function with a memory and disk cache.
         """
 
-        return SentenceTransformerEmbeddingFunction(model_name=expert_recommendation_embeddings)
+        return CachedEmbeddingFunction(
+            SentenceTransformerEmbeddingFunction(model_name=expert_recommendation_embeddings),
+            expert_recommendation_embeddings,
+            SERVER_SETTINGS["embedding_cache_file"],
+            SERVER_SETTINGS["embedding_cache_memory_size"]
+        )
 
     @staticmethod
     def __get_expert_recommendation_chroma_db_client(persist_directory: str = SERVER_SETTINGS["vector_directory"]):
@@ -178,52 +194,71 @@ class LLM:
             self,
             collection_name: str,
             expert_recommendation_chroma_db_client: ClientAPI,
-            expert_recommendation_embeddings: SentenceTransformerEmbeddingFunction,
-            nlp_en: Language,
+            expert_recommendation_embeddings: CachedEmbeddingFunction,
             expert_skills: list[str],
             expert_emails: list[str]
-    ) -> Collection:
+    ) -> ExpertVectorStore:
         """
-            Get or create a vector store for expert recommendation.
+            Get or create a vector store for expert recommendation, with the collection of the expert vectors.
 
             Parameters:
                 collection_name (str): The name of the collection.
                 expert_recommendation_chroma_db_client (ClientAPI): ChromaDB client for vector store.
-                expert_recommendation_embeddings (SentenceTransformerEmbeddingFunction): Embedding function for expert recommendation.
-                nlp_en (Language): spaCy Language object for English.
+                expert_recommendation_embeddings (CachedEmbeddingFunction): Embedding function for expert recommendation.
                 expert_skills (list[str]): List of expert skills.
                 expert_emails (list[str]): List of expert emails.
 
             Returns:
-                Collection: The expert recommendation vector store collection.
+                ExpertVectorStore: The expert recommendation vector store.
         """
 
-        vector_store = expert_recommendation_chroma_db_client.get_or_create_collection(name=collection_name, embedding_function=expert_recommendation_embeddings, metadata={"hnsw:space": "cosine"})
+        collection = expert_recommendation_chroma_db_client.get_or_create_collection(name=collection_name, embedding_function=expert_recommendation_embeddings, metadata={"hnsw:space": "cosine"})
+        expert_collection = expert_recommendation_chroma_db_client.get_or_create_collection(
+            name=SERVER_SETTINGS["chroma_expert_collection_name"],
+            embedding_function=expert_recommendation_embeddings,
+            metadata={"hnsw:space": "cosine"}
+        )
+        vector_store = ExpertVectorStore(
+            collection,
+            expert_recommendation_embeddings,
+            SERVER_SETTINGS["chroma_batch_size"],
+            expert_collection,
+            SERVER_SETTINGS["expert_recommendation_sentence_cache_bytes"]
+        )
 
         if not vector_store.count():
-            self.__populate_or_update_expert_recommendation_vector_store(vector_store, nlp_en, expert_skills, expert_emails)
+            self.__populate_or_update_expert_recommendation_vector_store(vector_store, expert_skills, expert_emails)
+        else:  # The vector store may have been created before the expert vectors were stored, or their build interrupted.
+            missing_expert_emails = sorted(vector_store.get_expert_emails() - vector_store.get_expert_vector_emails())
+
+            if missing_expert_emails:
+                vector_store.update_expert_vectors(missing_expert_emails)
+                self.app_logger.info(msg=f"Expert vectors computed for {len(missing_expert_emails)} expert(s).")
 
         return vector_store
 
-    def __populate_or_update_expert_recommendation_vector_store(self, expert_recommendation_vector_store: Collection, nlp_en: Language, expert_skills: list[str], expert_emails: list[str]) -> None:
+    def __populate_or_update_expert_recommendation_vector_store(self, expert_recommendation_vector_store: ExpertVectorStore, expert_skills: list[str], expert_emails: list[str]) -> None:
         """
             Populate or update the expert recommendation vector store.
 
+            The skills of all the experts are translated and split into sentences in batches first, then the vector store is synchronized in bulk:
+            only the sentences that are not stored yet are embedded, and the stored sentences that vanished from the skills are removed.
+            The cached search results are invalidated if the vector store changed.
+
             Parameters:
-                expert_recommendation_vector_store (Collection): The vector store for expert recommendation.
-                nlp_en (Language): spaCy Language object for English.
+                expert_recommendation_vector_store (ExpertVectorStore): The vector store for expert recommendation.
                 expert_skills (list[str]): List of expert skills.
                 expert_emails (list[str]): List of expert emails.
         """
 
-        for i, expert_email in enumerate(expert_emails):
-            translated_expert_skills = self.__translate_text(expert_skills[i], 'en')
-            translated_expert_skills_tokenized = [sentence.text for sentence in nlp_en(translated_expert_skills).sents]  # tokenize text into sentences
-            stored_expert_skills = expert_recommendation_vector_store.get(where={"expert_email": expert_email})['documents']
+        translated_expert_skills = self.translator.translate_batch(expert_skills, 'en')
+        expert_sentences = dict(zip(expert_emails, self.sentence_segmenter.segment(translated_expert_skills, 'en')))  # tokenize texts into sentences
+
+        added_sentences, deleted_sentences = expert_recommendation_vector_store.sync_experts(expert_sentences)
+        self.app_logger.info(msg=f"Vector store synchronized for {len(expert_sentences)} expert(s): {added_sentences} sentence(s) added, {deleted_sentences} sentence(s) deleted.")
 
-            if not stored_expert_skills or stored_expert_skills != translated_expert_skills_tokenized:
-                for skill in translated_expert_skills_tokenized:
-                    expert_recommendation_vector_store.add(documents=[skill], metadatas=[{"expert_email": expert_email}], ids=[str(time.time())])
+        if added_sentences or deleted_sentences:
+            self.search_cache.invalidate()
 
     def __delete_expert_from_vector_store(self, expert_email: str) -> None:
         """
@@ -233,41 +268,66 @@ class LLM:
                 expert_email (str): Email of the expert to be deleted.
         """
 
-        self.expert_recommendation_vector_store.delete(where={"expert_email": expert_email})
+        self.expert_recommendation_vector_store.delete_experts([expert_email])
+        self.search_cache.invalidate()
 
-    def __add_expert_to_vector_store(self, expert_skills: str, expert_email: str) -> None:
+    def __sync_expert_in_vector_store(self, expert_skills: str, expert_email: str) -> None:
         """
-            Add an expert to the expert recommendation vector store.
+            Add an expert to the expert recommendation vector store, or update its skills.
+
+            Only the sentences that changed are embedded again, and the sentences that vanished are removed.
 
             Parameters:
-                expert_skills (str): Skills of the expert to be added.
-                expert_email (str): Email of the expert to be added.
+                expert_skills (str): Skills of the expert.
+                expert_email (str): Email of the expert.
         """
 
         self.__populate_or_update_expert_recommendation_vector_store(
             self.expert_recommendation_vector_store,
-            self.nlp_en,
             [expert_skills],
             [expert_email]
         )
 
-    def __update_expert_in_vector_store(self, expert_skills: str, expert_email: str):
+    # Names under which the clients query the synchronization of a single expert.
+    __add_expert_to_vector_store = __sync_expert_in_vector_store
+    __update_expert_in_vector_store = __sync_expert_in_vector_store
+
+    def __sync_experts_in_vector_store(self, expert_skills: list[str], expert_emails: list[str]) -> None:
         """
-            Update the skills of an expert in the expert recommendation vector store.
+            Add or update several experts in the expert recommendation vector store, in bulk.
 
             Parameters:
-                expert_skills (str): Updated skills of the expert.
-                expert_email (str): Email of the expert to be updated.
+                expert_skills (list[str]): Skills of the experts.
+                expert_emails (list[str]): Emails of the experts.
         """
 
-        self.__delete_expert_from_vector_store(expert_email)
         self.__populate_or_update_expert_recommendation_vector_store(
             self.expert_recommendation_vector_store,
-            self.nlp_en,
-            [expert_skills],
-            [expert_email]
+            expert_skills,
+            expert_emails
         )
 
+    def __delete_experts_from_vector_store(self, expert_emails: list[str]) -> None:
+        """
+            Delete several experts from the expert recommendation vector store.
+
+            Parameters:
+                expert_emails (list[str]): Emails of the experts to be deleted.
+        """
+
+        self.expert_recommendation_vector_store.delete_experts(expert_emails)
+        self.search_cache.invalidate()
+
+    def __get_vector_store_expert_emails(self) -> list[str]:
+        """
+            Get the emails of all the experts of the expert recommendation vector store.
+
+            Returns:
+                list[str]: The sorted emails of the experts.
+        """
+
+        return sorted(self.expert_recommendation_vector_store.get_expert_emails())
+
     @staticmethod
     def __get_expert_recommendation_parser() -> PydanticOutputParser:
         """
@@ -568,53 +628,52 @@ class LLM:
         return LLMChain(llm=qa_llm, prompt=keywords_prompt)
 
     @staticmethod
-    def __get_nlp(model_name: str) -> Language:
+    def __get_sentence_segmenter() -> SentenceSegmenter:
         """
-            Get a spaCy Language object for a given model name. Downloads the model if not already installed.
-
-            Args:
-                model_name (str): Name of the spaCy model.
+            Get the sentence segmenter shared by the expert recommendation and keywords chains.
 
             Returns:
-                Language: spaCy Language object.
+                SentenceSegmenter: The sentence segmenter for English and French.
         """
 
-        if not spacy.util.is_package(model_name):
-            spacy.cli.download(model_name)
-        return spacy.load(model_name)
+        return SentenceSegmenter(
+            {'en': SERVER_SETTINGS["spacy_nlp_en"], 'fr': SERVER_SETTINGS["spacy_nlp_fr"]},
+            SERVER_SETTINGS["spacy_batch_size"],
+            SERVER_SETTINGS["spacy_n_process"]
+        )
 
     @staticmethod
-    def __get_stop_words(nlp: Language) -> list[str]:
+    def __get_stop_words(nlp: Language) -> frozenset[str]:
         """
-            Get a list of stop words from a given spaCy Language object.
+            Get the set of stop words from a given spaCy Language object.
 
             Args:
                 nlp (Language): spaCy Language object.
 
             Returns:
-                List[str]: List of stop words.
+                frozenset[str]: Set of stop words and punctuation characters.
         """
 
-        return list(nlp.Defaults.stop_words) + [p for p in string.punctuation]
+        return frozenset(nlp.Defaults.stop_words) | frozenset(string.punctuation)
 
-    def __remove_stop_words(self, documents: list[str], nlp: Language) -> list[str]:
+    @staticmethod
+    def __remove_stop_words(documents: list[str], nlp: Language, stop_words: frozenset[str]) -> list[str]:
         """
             Remove stop words from a list of documents using a spaCy Language object.
 
+            All the documents are tokenized in a single batch by the tokenizer only, as the other pipeline components
+            do not change the tokens.
+
             Args:
                 documents (List[str]): List of documents to process.
                 nlp (Language): spaCy Language object.
+                stop_words (frozenset[str]): Set of stop words to remove.
 
             Returns:
                 List[str]: List of documents with stop words removed.
         """
 
-        filtered_documents = []
-        for doc in documents:
-            tokenized_doc = nlp(doc)
-            filtered_tokens = [token.text for token in tokenized_doc if token.text not in self.__get_stop_words(nlp)]
-            filtered_documents.append(' '.join(filtered_tokens))
-        return filtered_documents
+        return [' '.join(token.text for token in tokenized_doc if token.text not in stop_words) for tokenized_doc in nlp.tokenizer.pipe(documents)]
 
     @staticmethod
     def __get_user_emails_from_llm_response(source_documents: list[Document]) -> list[str]:
@@ -645,38 +704,44 @@ class LLM:
         return user_emails
 
     @staticmethod
-    def __translate_text(text: str, destination_language: Literal['en', 'fr']) -> str:
+    def __get_translator(translator_backend: str) -> Translator:
         """
-            Translate text to the specified destination language.
+            Get the translator used for the skills of the experts, the questions and the generic profiles.
 
-            Args:
-                text (str): Text to be translated.
-                destination_language (Literal['en', 'fr']): Destination language code ('en' for English, 'fr' for French).
+            Parameters:
+                translator_backend (str): The name of the translator backend ('google', or 'identity' to run without network).
 
             Returns:
-                str: Translated text.
+                Translator: The translator, with a persistent translation memory.
         """
 
-        if len(text) <= 5000:  # Maximum text length accepted by the Google Translator API
-            return GoogleTranslator(source='auto', target=destination_language).translate(text)
-        else:
-            chunk_to_translate = ''
-            translated_text = ''
+        return Translator.from_backend_name(translator_backend, SERVER_SETTINGS["translation_memory_file"])
 
-            for sentence in text.lstrip().split('\n'):
-                if not sentence:
-                    continue
+    @staticmethod
+    def __get_search_cache() -> SearchResultCache:
+        """
+            Get the cache of the search results, invalidated whenever the vector store changes.
+
+            Returns:
+                SearchResultCache: The cache, shared with the processes answering the searches.
+        """
 
-                if len(chunk_to_translate) >= 3000:
-                    translated_text += GoogleTranslator(source='auto', target=destination_language).translate(chunk_to_translate)
-                    chunk_to_translate = ''
-                else:
-                    chunk_to_translate += sentence + '\n'
+        return SearchResultCache(SERVER_SETTINGS["search_cache_file"], SERVER_SETTINGS["search_cache_ttl"], SERVER_SETTINGS["search_cache_max_entries"])
 
-            if chunk_to_translate:  # Translate the remaining text if any
-                translated_text += GoogleTranslator(source='auto', target=destination_language).translate(chunk_to_translate)
+    @staticmethod
+    def __get_similar_question_cache() -> SimilarQuestionCache:
+        """
+            Get the cache of the generic profiles generated for the previous questions, looked up by similarity.
+
+            Returns:
+                SimilarQuestionCache: The cache, with the questions of the previous runs of the server.
+        """
 
-            return translated_text
+        return SimilarQuestionCache(
+            SERVER_SETTINGS["similar_question_cache_file"],
+            SERVER_SETTINGS["similar_question_threshold"],
+            SERVER_SETTINGS["similar_question_cache_size"]
+        )
 
     def __init_expert_recommendation_chain(self) -> None:
         """
@@ -689,16 +754,18 @@ class LLM:
                 None
         """
 
+        self.translator = self.__get_translator(SERVER_SETTINGS['translator_backend'])
+        self.search_cache = self.__get_search_cache()
+        self.similar_question_cache = self.__get_similar_question_cache()
+        self.sentence_segmenter = self.__get_sentence_segmenter()
         self.expert_recommendation_llm = self.__get_expert_recommendation_llm(SERVER_SETTINGS['expert_recommendation_llm_model'])
         self.expert_recommendation_embeddings = self.__get_expert_recommendation_embeddings(SERVER_SETTINGS['expert_recommendation_embeddings'])
         self.expert_recommendation_chroma_db_client = self.__get_expert_recommendation_chroma_db_client()
         self.expert_information = self.__get_expert_skills_from_csv(SERVER_SETTINGS['users_csv_file'])
-        self.nlp_en = self.__get_nlp(SERVER_SETTINGS["spacy_nlp_en"])
         self.expert_recommendation_vector_store = self.__get_expert_recommendation_vector_store(
             SERVER_SETTINGS['chroma_collection_name'],
             self.expert_recommendation_chroma_db_client,
             self.expert_recommendation_embeddings,
-            self.nlp_en,
             self.expert_information[0],
             self.expert_information[1]
         )
@@ -721,25 +788,31 @@ class LLM:
         self.keywords_parser = self.__get_keywords_parser()
         self.keywords_prompt = self.__get_keywords_prompt()
         self.keywords_chain = self.__get_keywords_chain(self.expert_recommendation_llm, self.keywords_prompt)
-        self.nlp_fr = self.__get_nlp(SERVER_SETTINGS["spacy_nlp_fr"])
+        self.nlp_fr = self.sentence_segmenter.get_nlp('fr')
         self.stop_words_fr = self.__get_stop_words(self.nlp_fr)
 
     def __init_zmq(self, addr: str) -> None:
         """
             Initialize ZeroMQ (ZMQ) communication components.
 
-            This method sets up a ZeroMQ context and creates a REP (Reply) socket, binding it to the specified address.
+            This method sets up the broker that receives queries on the specified address and dispatches them to a pool of worker threads.
+            The number of workers is defined by the 'llm_workers' server setting, and 'llm_reserved_interactive_workers' of them never process batch queries.
 
             Args:
-                addr (str): The address to bind the ZeroMQ socket.
+                addr (str): The address to bind the ZeroMQ frontend socket.
 
             Returns:
                 None
         """
 
-        self.context = zmq.Context()
-        self.socket = self.context.socket(zmq.REP)
-        self.socket.bind(addr)
+        self.broker = LLMBroker(
+            self.__process_query,
+            addr,
+            SERVER_SETTINGS["llm_workers"],
+            SERVER_SETTINGS["llm_reserved_interactive_workers"],
+            self.app_logger
+        )
+        self.broker.bind()
 
     def __try_get_llm_expert_recommendation(self, llm_input: str, max_attempts: int = 4, retry_delay: int = 1) -> List[str]:
         """
@@ -770,12 +843,70 @@ class LLM:
 
         raise Exception(f"Error occurred when parsing LLM output for generic profiles.")
 
+    def __generate_generic_profiles(self, question: str) -> dict[str, Any]:
+        """
+            Generate the generic profiles of a question with the LLM, without looking up the similar questions.
+
+            Parameters:
+                question (str): The user's question.
+
+            Returns:
+                dict[str, Any]: The translated question ('query'), its embedding ('embedding') and the generic profiles
+                    generated by the LLM ('generic_profiles').
+        """
+
+        query = self.translator.translate(question, 'en')
+        llm_input = self.expert_recommendation_prompt.format(input=query)
+
+        return {
+            'query': query,
+            'embedding': list(self.expert_recommendation_embeddings([query])[0]),
+            'generic_profiles': self.__try_get_llm_expert_recommendation(llm_input)  # max attempts = 4 , wait 1 second between each try.
+        }
+
+    def __query_experts(self, generic_profiles: list[str]) -> list[dict[str, list]]:
+        """
+            Query the expert recommendation vector store for the experts of several generic profiles at once.
+
+            With the 'shortlist' retriever, the closest expert vectors shortlist the experts of each generic profile, whose
+            sentences are then re-scored. With the 'sentences' retriever, the closest sentences are queried directly.
+
+            Args:
+                generic_profiles (list[str]): The generic profiles.
+
+            Returns:
+                list[dict]: For each generic profile, the 'expert_emails' of the recommended experts and their 'scores'.
+
+            Notes:
+                - Only considers experts with cosine similarity scores less than or equal to 'expert_recommendation_max_distance' (0.5).
+                - Returns only the top 'expert_recommendation_experts_per_profile' (5) experts for each generic profile.
+        """
+
+        if SERVER_SETTINGS["expert_recommendation_retriever"] == 'shortlist':
+            return self.expert_recommendation_vector_store.query_experts_in_shortlist(
+                generic_profiles,
+                SERVER_SETTINGS["expert_recommendation_experts_per_profile"],
+                SERVER_SETTINGS["expert_recommendation_max_distance"],
+                SERVER_SETTINGS["expert_recommendation_aggregation"],
+                SERVER_SETTINGS["expert_recommendation_shortlist_size"]
+            )
+
+        return self.expert_recommendation_vector_store.query_experts(
+            generic_profiles,
+            SERVER_SETTINGS["expert_recommendation_experts_per_profile"],
+            SERVER_SETTINGS["expert_recommendation_max_distance"],
+            SERVER_SETTINGS["expert_recommendation_aggregation"],
+            SERVER_SETTINGS["expert_recommendation_n_results"],
+            SERVER_SETTINGS["expert_recommendation_max_n_results"]
+        )
+
     def __get_experts_recommendation(self, question: str):
         """
             Get expert recommendations based on a user's question.
 
-            This method translates the user's question, generates generic profiles using the LLM,
-            queries the expert recommendation vector store, and returns a dictionary of expert recommendations.
+            This method translates the user's question, reuses the generic profiles of a previous similar question or
+            generates them using the LLM, queries the expert recommendation vector store, and returns a dictionary of
+            expert recommendations.
 
             Args:
                 question (str): The user's question.
@@ -786,32 +917,114 @@ class LLM:
 
             Notes:
                 - Only considers experts with cosine similarity scores less than or equal to 0.5.
-                - Returns only the top 5 experts for each generic profile.
+                - Returns only the top 5 experts for each generic profile, scored by their closest sentence.
+        """
+
+        query = self.translator.translate(question, 'en')
+        query_embedding = self.expert_recommendation_embeddings([query])[0]
+        generic_profiles = self.similar_question_cache.get(query_embedding)
+
+        if generic_profiles is None:
+            llm_input = self.expert_recommendation_prompt.format(input=query)
+            generic_profiles = self.__try_get_llm_expert_recommendation(llm_input)  # max attempts = 4 , wait 1 second between each try.
+            self.similar_question_cache.put(query, query_embedding, generic_profiles)
+
+        found_experts = self.__query_experts(generic_profiles)
+        translated_generic_profiles = self.translator.translate_batch(generic_profiles, 'fr')
+
+        return dict(zip(translated_generic_profiles, found_experts))
+
+    def __try_stream_llm_expert_recommendation(self, query: str, query_embedding: list[float], max_attempts: int = 4, retry_delay: int = 1) -> Iterator[str]:
+        """
+            Attempt to stream the generic profiles generated by the language model (LLM) for a query.
+
+            This method:
+                1. Streams the output of the LLM through a `GenericProfileStreamParser`, yielding each profile as soon as it is complete.
+                2. Parses the complete output, and yields the profiles that the incremental parsing missed.
+                3. Caches the profiles among the similar questions, once the output was completely parsed.
+
+            If the output cannot be parsed and no profile was yielded yet, the LLM is queried again. If some profiles
+            were already yielded, a new generation would not continue them, so the method stops with these profiles.
+
+            Args:
+                query (str): The user's question, translated in English.
+                query_embedding (list[float]): The embedding of the query.
+                max_attempts (int): The maximum number of attempts to get recommendations (default: 4).
+                retry_delay (int): The delay (in seconds) between retry attempts (default: 1).
+
+            Yields:
+                str: The generic profiles, in the order of the LLM output.
+
+            Raises:
+                Exception: If an error occurs during parsing LLM output after the maximum attempts.
         """
 
-        query = GoogleTranslator(source='auto', target='en').translate(question)
         llm_input = self.expert_recommendation_prompt.format(input=query)
-        generic_profiles = self.__try_get_llm_expert_recommendation(llm_input)  # max attempts = 4 , wait 1 second between each try.
-        found_experts = self.expert_recommendation_vector_store.query(query_texts=generic_profiles, n_results=20)
-        response = {}
-
-        for i, generic_profile in enumerate(generic_profiles):
-            translated_generic_profile = GoogleTranslator(source='auto', target='fr').translate(generic_profile)
-            response[translated_generic_profile] = {
-                'expert_emails': [],
-                'scores': []
-            }
 
-            for j, metadata in enumerate(found_experts['metadatas'][i]):
-                # Considering only experts whose cosine similarity score is less than or equal to 0.5
-                if metadata['expert_email'] not in response[translated_generic_profile]['expert_emails'] and found_experts['distances'][i][j] <= 0.5:
-                    response[translated_generic_profile]['expert_emails'].append(metadata['expert_email'])
-                    response[translated_generic_profile]['scores'].append(found_experts['distances'][i][j])
+        for attempt in range(1, max_attempts):
+            stream_parser = GenericProfileStreamParser()
+
+            for chunk in self.expert_recommendation_llm.stream(llm_input):
+                yield from stream_parser.feed(chunk)
+
+            try:
+                generic_profiles = self.expert_recommendation_parser.parse(stream_parser.output).profiles
+            except OutputParserException as e:
+                self.app_logger.error(msg=str(e), exc_info=True)
+
+                if not stream_parser.profiles:
+                    time.sleep(retry_delay)
+                    continue
+
+                if not stream_parser.is_complete:
+                    return
+
+                generic_profiles = stream_parser.profiles
 
-                if len(response[translated_generic_profile]['expert_emails']) == 5:  # Return only the top 5 experts for each generic profile
-                    break
+            yield from (generic_profile for generic_profile in generic_profiles if generic_profile not in stream_parser.profiles)
+            self.similar_question_cache.put(query, query_embedding, generic_profiles)
+            return
 
-        return response
+        raise Exception("Error occurred when parsing LLM output for generic profiles.")
+
+    def __stream_experts_recommendation(self, question: str) -> Iterator[dict[str, Any]]:
+        """
+            Stream the expert recommendations of a user's question, one generic profile at a time.
+
+            This method translates the user's question, then reuses the generic profiles of a previous similar question
+            or streams their generation by the LLM. As soon as a generic profile is known, it queries the expert
+            recommendation vector store for this profile alone, translates it, and yields its experts, so that the first
+            experts are available after the first profile is generated instead of after the whole pipeline.
+
+            Args:
+                question (str): The user's question.
+
+            Yields:
+                dict: The translated generic profile ('generic_profile') and its recommended experts ('expert_emails'
+                    and 'scores' lists), as in the values returned by `__get_experts_recommendation`. Profiles with the
+                    same translation are only yielded once.
+        """
+
+        query = self.translator.translate(question, 'en')
+        query_embedding = self.expert_recommendation_embeddings([query])[0]
+        generic_profiles = self.similar_question_cache.get(query_embedding)
+
+        if generic_profiles is None:
+            generic_profiles = self.__try_stream_llm_expert_recommendation(query, query_embedding)  # max attempts = 4 , wait 1 second between each try.
+
+        translated_generic_profiles = set()
+
+        for generic_profile in generic_profiles:
+            translated_generic_profile = self.translator.translate(generic_profile, 'fr')
+
+            if translated_generic_profile in translated_generic_profiles:
+                continue
+
+            translated_generic_profiles.add(translated_generic_profile)
+            yield {
+                'generic_profile': translated_generic_profile,
+                **self.__query_experts([generic_profile])[0]
+            }
 
     def __try_get_llm_keywords(self, llm_input: str, max_attempts: int = 4, retry_delay: int = 1) -> List[str]:
         """
@@ -864,8 +1077,8 @@ class LLM:
         if not text:
             return []
 
-        translated_text = self.__translate_text(text, 'fr')
-        translated_text_tokenized = [sentence.text for sentence in self.nlp_fr(translated_text).sents]  # tokenize text into sentences
+        translated_text = self.translator.translate(text, 'fr')
+        translated_text_tokenized = self.sentence_segmenter.segment([translated_text], 'fr')[0]  # tokenize text into sentences
         keywords = set()
         sentences = []
 
@@ -876,11 +1089,11 @@ class LLM:
                 sentences.clear()
                 llm_keywords = self.__try_get_llm_keywords(paragraph)  # max attempts = 4 , wait 1 second between each try.
                 llm_keywords = [k.lower() for k in llm_keywords]
-                candidate_keywords = self.__remove_stop_words(llm_keywords, self.nlp_fr)
+                candidate_keywords = self.__remove_stop_words(llm_keywords, self.nlp_fr, self.stop_words_fr)
                 keybert_keywords = self.keywords_model.extract_keywords(
                     docs=paragraph,
                     candidates=candidate_keywords,
-                    stop_words=self.stop_words_fr,
+                    stop_words=list(self.stop_words_fr),
                     keyphrase_ngram_range=(1, 4),
                     top_n=3,
                 )
@@ -892,6 +1105,20 @@ class LLM:
 
         return list(keywords)
 
+    def __get_cache_stats(self) -> dict[str, dict[str, float]]:
+        """
+            Get the hit and miss counters of the caches used by the LLM processor.
+
+            Returns:
+                dict: The counters of each cache, keyed by cache name.
+        """
+
+        return {
+            'embeddings': self.expert_recommendation_embeddings.get_stats(),
+            'translations': self.translator.get_stats(),
+            'similar_questions': self.similar_question_cache.get_stats(),
+        }
+
     def __call_method(self, method_name: str, arguments: list) -> Any:
         """
             Dynamically call a private method within the class.
@@ -919,6 +1146,30 @@ class LLM:
         else:
             return {'status': 'error', 'error_message': f'Method not found: {method_name}'}
 
+    def __process_query(self, data: dict) -> dict:
+        """
+            Process a query received by the LLM processor.
+
+            This method extracts the method name and arguments from the query and dynamically calls the specified method.
+            It is called concurrently by the broker workers.
+
+            Args:
+                data (dict): The query, containing the 'method' name and its 'arguments'.
+
+            Returns:
+                dict: A dictionary containing the status of the call and the result or error message.
+        """
+
+        # Extract method name and arguments from the query
+        method_name = data.get('method', '')
+        arguments = data.get('arguments', [])
+
+        # Call the method dynamically
+        if method_name:
+            return self.__call_method(method_name, arguments)
+        else:
+            return {'status': 'error', 'error_message': 'No method specified'}
+
     ###################################################################################################################
     #                                                 PUBLIC METHODS                                                 #
     ###################################################################################################################
@@ -947,45 +1198,21 @@ class LLM:
         """
             Continuously process queries received from the server.
 
-            This method runs in a loop, receiving queries from the server, extracting the method name and arguments,
-            dynamically calling the specified method, and sending the result or error back to the server.
+            This method starts the broker workers and forwards the queries received from the server to them, so that
+            several queries are processed in parallel. Each worker dynamically calls the specified method and sends
+            the result or error back to the server.
 
-            The loop continues until the LLM context is terminated or an error occurs.
-
-            Raises:
-                zmq.error.ContextTerminated: If the ZeroMQ context is terminated.
-                Exception: For any other unexpected errors during processing.
+            The method blocks until the LLM context is terminated.
         """
 
-        while self.is_available:
-            try:
-                # Receive data from the server
-                data = self.socket.recv_json()
-
-                # Extract method name and arguments from the query
-                method_name = data.get('method', '')
-                arguments = data.get('arguments', [])
-
-                # Call the method dynamically
-                if method_name:
-                    response = self.__call_method(method_name, arguments)
-                else:
-                    response = {'status': 'error', 'error_message': 'No method specified'}
-
-                # Send the result or error back to the server
-                self.socket.send_json(response)
-            except zmq.error.ContextTerminated:
-                self.is_available = False
-                self.app_logger.warning("Context terminated during processing. Exiting...")
-            except Exception as e:
-                self.socket.send_json({'status': 'error', 'error_message': str(e)})
-                self.app_logger.error(msg=str(e), exc_info=True)
+        self.broker.run()
+        self.is_available = False
 
     def stop_llm_processing(self):
         """
             Gracefully shuts down the LLM processor.
 
-            This method sets the `is_available` flag to False, closes the ZeroMQ socket, and terminates the ZeroMQ context.
+            This method sets the `is_available` flag to False and stops the broker, which terminates the ZeroMQ context.
 
             The method is intended to be called when you want to stop the continuous processing of queries.
 
@@ -994,40 +1221,84 @@ class LLM:
 
         self.app_logger.info("Shutting down the LLM processor gracefully...")
         self.is_available = False
-        self.socket.close(0)
-        self.context.term()
 
-    @staticmethod
+        if self.broker is not None:
+            self.broker.stop()
+
+    @classmethod
     def query_llm(
+            cls,
             method: Literal[
                 'get_keywords',
                 'get_experts_recommendation',
                 'add_expert_to_vector_store',
                 'update_expert_in_vector_store',
-                'delete_expert_from_vector_store'
+                'delete_expert_from_vector_store',
+                'sync_experts_in_vector_store',
+                'delete_experts_from_vector_store',
+                'get_vector_store_expert_emails',
+                'generate_generic_profiles',
+                'get_llm_processor_stats',
+                'get_cache_stats'
             ],
-            arguments: list) -> Any:
+            arguments: list,
+            priority: Literal['interactive', 'batch'] = 'interactive') -> Any:
         """
             Sends a query to the LLM processor for specified processing methods.
 
+            The query goes through the per-process pooled client, so consecutive calls reuse the same ZeroMQ context and connected sockets.
+            Interactive queries (user-facing requests) are always processed before batch queries (CSV imports, re-tagging).
+
             Args:
                 method (Literal): The LLM processing method to invoke.
                 arguments (list): The list of arguments required for the specified method.
+                priority (Literal['interactive', 'batch']): The lane in which the query is queued by the LLM processor (default: 'interactive').
 
             Returns:
                 Any: The result of the LLM processing method.
 
             Raises:
                 Exception: If there is an error in the LLM processing.
+                TimeoutError: If the LLM processor did not respond in time.
+                ConnectionError: If the LLM processor could not be reached.
         """
 
-        socket = zmq.Context().socket(zmq.REQ)
-        socket.connect(SERVER_SETTINGS["zeromq_request_address"])
-        socket.send_json({'method': method, 'arguments': arguments})
-        response = socket.recv_json()
-        socket.close()
+        response = cls.client.request({'method': method, 'arguments': arguments, 'priority': priority})
 
         if response['status'] == 'success':
             return response['result']
         elif response['status'] == 'error':
             raise Exception(response['error_message'])
+
+    @classmethod
+    def stream_llm(
+            cls,
+            method: Literal[
+                'stream_experts_recommendation'
+            ],
+            arguments: list,
+            priority: Literal['interactive', 'batch'] = 'interactive') -> Iterator[Any]:
+        """
+            Sends a query to the LLM processor for a processing method streaming its result, and yields the items of the result as they are produced.
+
+            Unlike `query_llm`, the query goes through a dedicated DEALER socket, which receives a response per item.
+
+            Args:
+                method (Literal): The LLM processing method to invoke.
+                arguments (list): The list of arguments required for the specified method.
+                priority (Literal['interactive', 'batch']): The lane in which the query is queued by the LLM processor (default: 'interactive').
+
+            Yields:
+                Any: The items of the result of the LLM processing method.
+
+            Raises:
+                Exception: If there is an error in the LLM processing, possibly after some items were yielded.
+                TimeoutError: If the LLM processor did not send an item in time.
+                ConnectionError: If the LLM processor could not be reached.
+        """
+
+        for response in cls.client.stream({'method': method, 'arguments': arguments, 'priority': priority}):
+            if response['status'] == 'partial':
+                yield response['result']
+            elif response['status'] == 'error':
+                raise Exception(response['error_message'])
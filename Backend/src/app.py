@@ -1,4 +1,5 @@
 import atexit
+import json
 import os
 import smtplib
 import logging
@@ -11,13 +12,16 @@ from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from threading import Thread
+from typing import Any, Iterator
 from ai import LLM
 from decorators import require_api_key
-from flask import Flask, jsonify, render_template, request, send_file
+from flask import Flask, Response, g, jsonify, render_template, request, send_file, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from settings import SERVER_SETTINGS
 from database import Database, User
+from member_directory import MEMBER_FIELDS, Member, project_member
+from search_cache import SearchResultCache
 from schedule import every, repeat, run_pending
 
 ###################################################################################################################
@@ -28,6 +32,7 @@ app_logger = logging.getLogger('gunicorn.error')
 app = Flask(__name__, template_folder=SERVER_SETTINGS['template_directory'])
 llm = LLM(app_logger)
 db = Database(app, llm, app_logger)
+search_cache = SearchResultCache(SERVER_SETTINGS["search_cache_file"], SERVER_SETTINGS["search_cache_ttl"], SERVER_SETTINGS["search_cache_max_entries"])
 
 
 ###################################################################################################################
@@ -47,9 +52,10 @@ def init_server() -> None:
            Raises an exception if the file does not exist.
         5. Initializes the Language Model (LLM) by calling the 'llm.init()' method.
            Raises an exception if the LLM is not available.
-        6. Initializes the database by calling the 'db.init()' method.
+        6. Starts the LLM processor in a separate thread using the 'llm.start_llm_processing()' method.
+        7. Initializes the database by calling the 'db.init()' method. The users of an empty database are populated
+           in the background, as their tags are queried to the LLM processor.
            Raises an exception if the database is not available.
-        7. Starts the LLM processor in a separate thread using the 'llm.start_llm_processing()' method.
 
     Exceptions:
         - Any encountered exceptions during the initialization process are caught, and an error message is logged.
@@ -75,36 +81,43 @@ def init_server() -> None:
         if not llm.is_available:
             raise Exception("Server initialization failed. LLM is not available.")
 
-        db.init()
-        if not db.is_available:
-            raise Exception("Server initialization failed. Database is not available.")
-
         # Start the LLM processor in a separate thread
         llm_processor_thread = Thread(target=llm.start_llm_processing)
         llm_processor_thread.start()
 
+        db.init()
+        if not db.is_available:
+            raise Exception("Server initialization failed. Database is not available.")
+
     except Exception as e:
         app_logger.error(msg=str(e), exc_info=True)
     else:
         app_logger.info(msg="The server has been successfully initialized.")
 
 
-def download_users_csv_file_from_google_drive() -> None:
+def download_users_csv_file_from_google_drive() -> str:
     """
         Download a CSV file from Google Drive and save it to the specified directory.
 
         This method:
             1. Checks if the target directory exists; creates it if not.
-            2. Downloads a CSV file from Google Drive using the provided file ID.
+            2. Downloads a CSV file from Google Drive using the provided file ID, next to the users CSV file, which is
+               regenerated from the database once the downloaded file is imported.
 
         Note:
             - This method assumes the file is public on Google Drive.
+
+        Returns:
+            str: The path of the downloaded CSV file.
     """
 
     if not os.path.exists(SERVER_SETTINGS["resources_directory"]):
         os.makedirs(SERVER_SETTINGS["resources_directory"])
 
-    gdown.download(id=SERVER_SETTINGS["google_drive_csv_file_id"], output=SERVER_SETTINGS["users_csv_file"], quiet=True)
+    csv_file_path = os.path.join(os.path.abspath(SERVER_SETTINGS['resources_directory']), f"google_drive_{uuid.uuid4().hex}.csv")
+    gdown.download(id=SERVER_SETTINGS["google_drive_csv_file_id"], output=csv_file_path, quiet=True)
+
+    return csv_file_path
 
 
 @repeat(every().sunday.at("01:00", "Canada/Eastern"))
@@ -115,7 +128,7 @@ def check_for_database_updates() -> None:
         This method:
             1. Verifies the availability of the database and Language Model (LLM).
             2. Downloads the latest users CSV file from Google Drive.
-            3. Updates the database with the new CSV data.
+            3. Queues the import job updating the database with the new CSV data.
 
         Warnings are logged if the database or LLM is unavailable. Any exceptions during the process are logged as errors.
     """
@@ -129,8 +142,14 @@ def check_for_database_updates() -> None:
             app_logger.warning("Unable to run database updates. LLM is not available.")
             return
 
-        download_users_csv_file_from_google_drive()
-        db.update(SERVER_SETTINGS["users_csv_file"])
+        if db.is_populating():
+            app_logger.warning("Unable to run database updates. Database population is in progress.")
+            return
+
+        csv_file_path = download_users_csv_file_from_google_drive()
+
+        with app.app_context():
+            db.enqueue_import_job(csv_file_path)
 
     except Exception as e:
         app_logger.error(msg=str(e), exc_info=True)
@@ -169,6 +188,47 @@ def start_scheduled_tasks_thread() -> None:
     t.start()
 
 
+def get_experts_category(generic_profile: str, recommendation: dict[str, list], experts: dict[str, Member]) -> dict[str, Any]:
+    """
+        Build the category of the search results of a generic profile, with the recommended experts.
+
+        Parameters:
+            generic_profile (str): The translated generic profile.
+            recommendation (dict[str, list]): The 'expert_emails' of the recommended experts and their 'scores'.
+            experts (dict[str, Member]): The members of the directory, keyed by email.
+
+        Returns:
+            dict[str, Any]: The generic profile ('category') and the recommended experts with their score ('recommendation').
+    """
+
+    return {
+        "category": generic_profile,
+        "recommendation": [
+            {
+                "expert": experts.get(expert_email),
+                "score": recommendation['scores'][i]
+            } for i, expert_email in enumerate(recommendation['expert_emails'])
+        ]
+    }
+
+
+@app.after_request
+def add_query_count_header(response):
+    """
+        Add the number of SQL statements executed while handling the request to the 'X-Query-Count' response header,
+        so that a route issuing one query per returned item is visible.
+
+        Parameters:
+            response: The response of the request.
+
+        Returns:
+            The response, with the 'X-Query-Count' header.
+    """
+
+    response.headers['X-Query-Count'] = str(g.get('query_count', 0))
+    return response
+
+
 ###################################################################################################################
 #                                                 ROUTES                                                          #
 ###################################################################################################################
@@ -196,20 +256,64 @@ def get_users():
 
         This method:
             1. Checks if the database is available; returns a 503 status if not.
-            2. Retrieves all users from the database.
+            2. Retrieves all users from the in-memory snapshot of the member directory.
             3. Returns the list of users with a 200 status if available, or a 404 status for an empty database.
+
+        Without query parameters, the JSON body is serialized (and compressed) once per version of the directory. It is
+        sent with a strong ETag, and a request whose If-None-Match header matches it gets a 304 status without body.
+
+        With any of the following query parameters, a page of users is returned as {"users": [...], "next_cursor": ...}:
+            - limit: The maximum number of users of the page ('users_page_size' by default, at most 'users_max_page_size').
+            - cursor: The 'next_cursor' of the previous page.
+            - fields: The comma-separated attributes of the users to return (user_id is always returned).
+            - sort: The attribute to sort the users by, prefixed by '-' for the descending order ('user_id' by default).
     """
 
     if not db.is_available:
         return jsonify({"message": "Database not available"}), 503
 
-    users = User.query.all()
+    snapshot = db.directory.get_snapshot()
 
-    if users:
-        return users, 200
-    else:
+    if not snapshot.members:
         return jsonify({"message": "Empty database"}), 404
 
+    if any(parameter in request.args for parameter in ('limit', 'cursor', 'fields', 'sort')):
+        try:
+            limit = int(request.args.get('limit', SERVER_SETTINGS["users_page_size"]))
+
+            if not 1 <= limit <= SERVER_SETTINGS["users_max_page_size"]:
+                raise ValueError(f"The limit must be between 1 and {SERVER_SETTINGS['users_max_page_size']}.")
+
+            field_names = MEMBER_FIELDS
+            if 'fields' in request.args:
+                field_names = ['user_id'] + [field_name.strip() for field_name in request.args['fields'].split(',') if field_name.strip() not in ('', 'user_id')]
+
+            unsupported_fields = [field_name for field_name in field_names if field_name not in MEMBER_FIELDS]
+            if unsupported_fields:
+                raise ValueError(f"Unsupported fields: {', '.join(unsupported_fields)}")
+
+            users, next_cursor = snapshot.get_page(request.args.get('sort', 'user_id'), limit, request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
+
+        return jsonify({"users": [project_member(user, field_names) for user in users], "next_cursor": next_cursor}), 200
+
+    serialized_users = db.directory.get_serialized_members(snapshot, lambda users: app.json.response(users).get_data())
+
+    if request.accept_encodings['gzip']:
+        response = app.response_class(serialized_users.gzip_body, mimetype=app.json.mimetype)
+        response.content_encoding = 'gzip'
+        response.set_etag(f"{serialized_users.etag}-gzip")
+    else:
+        response = app.response_class(serialized_users.body, mimetype=app.json.mimetype)
+        response.set_etag(serialized_users.etag)
+
+    response.vary.add('Accept-Encoding')
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+    return response.make_conditional(request)
+
 
 @app.route('/users/<int:user_id>', methods=['GET'], endpoint='get_user')
 @require_api_key
@@ -219,7 +323,7 @@ def get_user(user_id):
 
         This method:
             1. Checks if the database is available; returns a 503 status if not.
-            2. Retrieves the user with the specified ID from the database.
+            2. Retrieves the user with the specified ID from the in-memory snapshot of the member directory.
             3. Returns the user details with a 200 status if found, or a 404 status if the user is not found.
 
         Parameters:
@@ -229,7 +333,7 @@ def get_user(user_id):
     if not db.is_available:
         return jsonify({"message": "Database not available"}), 503
 
-    user = db.session.get(User, user_id)
+    user = db.directory.get_snapshot().members_by_id.get(user_id)
 
     if user:
         return jsonify(user), 200
@@ -246,8 +350,11 @@ def search_experts():
         This method:
             1. Checks if Language Model (LLM) and the database are available; returns a 503 status if not.
             2. Retrieves the question from the request.
-            3. Queries the LLM for expert recommendations based on the question.
-            4. Constructs and returns a response with expert recommendations categorized by generic profile.
+            3. Gets the expert recommendations of the question from the search cache, computed from the current version of
+               the vector store, or queries the LLM for them and caches them.
+            4. Retrieves the recommended experts from the in-memory snapshot of the member directory.
+            5. Constructs and returns a response with expert recommendations categorized by generic profile, with an
+               'X-Cache' header telling whether the recommendations were cached ('HIT') or not ('MISS').
 
         Returns:
             A JSON response containing expert recommendations or an appropriate error message.
@@ -263,24 +370,24 @@ def search_experts():
         question = request.get_data(as_text=True)
 
         if question:
-            experts_recommendation = llm.query_llm('get_experts_recommendation', [question])
+            started_at = time.perf_counter()
+            experts_recommendation, vector_store_version = search_cache.get(question)
+            is_cache_hit = experts_recommendation is not None
+
+            if not is_cache_hit:
+                experts_recommendation = llm.query_llm('get_experts_recommendation', [question])
+                search_cache.put(question, vector_store_version, experts_recommendation)
+
+            experts = db.directory.get_snapshot().members_by_email
             response = {"experts": []}
 
             for generic_profile in experts_recommendation:
-                response["experts"].append(
-                    {
-                        "category": generic_profile,
-                        "recommendation": [
-                            {
-                                "expert": User.query.filter(User.email == expert_email).first(),
-                                "score": experts_recommendation[generic_profile]['scores'][i]
-                            } for i, expert_email in enumerate(experts_recommendation[generic_profile]['expert_emails'])
-                        ]
-                    }
-                )
+                response["experts"].append(get_experts_category(generic_profile, experts_recommendation[generic_profile], experts))
+
+            search_cache.record_search(is_cache_hit, time.perf_counter() - started_at)
 
             if response:
-                return response, 200
+                return response, 200, {"X-Cache": "HIT" if is_cache_hit else "MISS"}
             else:
                 return jsonify({"message": "No experts were found matching your query"}), 404
         else:
@@ -291,6 +398,76 @@ def search_experts():
         return jsonify({"message": "An error occurred while searching for experts related to your request."}), 500
 
 
+@app.route('/search/stream', methods=['POST'], endpoint='stream_search_experts')
+@require_api_key
+def stream_search_experts():
+    """
+        Handle the 'POST' request for the '/search/stream' route, streaming the experts recommended for a provided question.
+
+        This method:
+            1. Checks if Language Model (LLM) and the database are available; returns a 503 status if not.
+            2. Retrieves the question from the request.
+            3. Gets the expert recommendations of the question from the search cache, or streams them from the LLM
+               processor, which generates the generic profiles with a streaming LLM generation and searches the experts
+               of each profile as soon as it is generated. Streamed recommendations are cached once complete.
+            4. Streams a newline-delimited JSON (NDJSON) response: one line per generic profile, in the format of the
+               categories of '/search', sent as soon as the experts of the profile are found. If an error occurs, the
+               last line is an error message ({"message": ...}). The 'X-Cache' header tells whether the recommendations
+               were cached ('HIT') or not ('MISS').
+
+        Returns:
+            A streamed NDJSON response containing expert recommendations or an appropriate error message.
+    """
+
+    try:
+        if not llm.is_available:
+            return jsonify({"message": "LLM not available"}), 503
+
+        if not db.is_available:
+            return jsonify({"message": "Database not available"}), 503
+
+        question = request.get_data(as_text=True)
+
+        if not question:
+            return jsonify({"message": "No question provided"}), 400
+
+        started_at = time.perf_counter()
+        cached_experts_recommendation, vector_store_version = search_cache.get(question)
+        is_cache_hit = cached_experts_recommendation is not None
+
+    except Exception as e:
+        app_logger.error(msg=str(e), exc_info=True)
+        return jsonify({"message": "An error occurred while searching for experts related to your request."}), 500
+
+    def generate_experts_categories() -> Iterator[str]:
+        try:
+            if is_cache_hit:
+                recommendations = ({'generic_profile': generic_profile, **recommendation} for generic_profile, recommendation in cached_experts_recommendation.items())
+            else:
+                recommendations = llm.stream_llm('stream_experts_recommendation', [question])
+
+            experts_recommendation = {}
+
+            for recommendation in recommendations:
+                generic_profile = recommendation.pop('generic_profile')
+                experts_recommendation[generic_profile] = recommendation
+                experts = db.directory.get_snapshot().members_by_email
+                yield app.json.dumps(get_experts_category(generic_profile, recommendation, experts)) + "\n"
+
+            if not is_cache_hit:
+                search_cache.put(question, vector_store_version, experts_recommendation)
+
+            search_cache.record_search(is_cache_hit, time.perf_counter() - started_at)
+
+        except Exception as e:
+            app_logger.error(msg=str(e), exc_info=True)
+            yield app.json.dumps({"message": "An error occurred while searching for experts related to your request."}) + "\n"
+
+    # Nginx must not buffer the response, so that each line reaches the client as soon as it is sent.
+    headers = {"X-Cache": "HIT" if is_cache_hit else "MISS", "X-Accel-Buffering": "no"}
+    return Response(stream_with_context(generate_experts_categories()), mimetype='application/x-ndjson', headers=headers)
+
+
 @app.route('/request_profile_correction', methods=['POST'], endpoint='request_profile_correction')
 @require_api_key
 def request_profile_correction():
@@ -417,7 +594,8 @@ def filter_users():
         This method:
             1. Checks if the database is available; returns a 503 status if not.
             2. Retrieves filtering criteria from the request JSON.
-            3. Filters users based on the provided criteria.
+            3. Filters users based on the provided criteria, with a single indexed SQL query returning their ids.
+            4. Retrieves the matching users from the in-memory snapshot of the member directory.
 
         Returns:
             A list of users matching the criteria with a 200 status.
@@ -428,23 +606,14 @@ def filter_users():
             return jsonify({"message": "Database not available"}), 503
 
         criteria = request.json
-        matching_users = User.query.all()
-
-        for attr in criteria.keys():
-            if attr in ['years_experience_ia', 'years_experience_healthcare']:
-                matching_users = list(filter(lambda user: getattr(user, attr) is not None and criteria[attr][0] <= getattr(user, attr) <= criteria[attr][1], matching_users))
-            elif attr in ['membership_category', 'affiliation_organization', 'tags']:
-                if len(criteria[attr]) == 0:
-                    continue
-
-                matching_users = [
-                    user for user in matching_users
-                    if getattr(user, attr) is not None and any(
-                        criteria_value.strip().lower() in [user_value.strip().lower() for user_value in getattr(user, attr).split(',')] for criteria_value in criteria[attr]
-                    )
-                ]
-            else:
-                return jsonify({"message": f"Unsupported criteria: {attr}"}), 400
+
+        try:
+            matching_user_ids = db.filter_user_ids(criteria)
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
+
+        members_by_id = db.directory.get_snapshot().members_by_id
+        matching_users = [members_by_id[user_id] for user_id in matching_user_ids if user_id in members_by_id]
 
         return matching_users, 200
 
@@ -485,6 +654,37 @@ def get_keywords_from_user_expertise():
         return jsonify({"message": "An error occurred while extracting keywords from user expertise."}), 500
 
 
+@app.route('/llm_stats', methods=['GET'], endpoint='get_llm_stats')
+@require_api_key
+def get_llm_stats():
+    """
+        Handle the 'GET' request for the '/llm_stats' route, returning the load of the LLM processor and the efficiency of its caches.
+
+        This method:
+            1. Checks if Language Model (LLM) is available; returns a 503 status if not.
+            2. Queries the LLM processor for the counters of its interactive and batch lanes.
+            3. Queries the LLM processor for the hit and miss counters of its caches.
+            4. Gets the hit ratio of the search cache and the average time taken to answer the searches, for all the processes.
+
+        Returns:
+            The counters of each lane ('lanes'), of each cache ('caches') and of the searches ('search') with a 200 status.
+    """
+
+    try:
+        if not llm.is_available:
+            return jsonify({"message": "LLM not available"}), 503
+
+        return jsonify({
+            "lanes": llm.query_llm('get_llm_processor_stats', []),
+            "caches": llm.query_llm('get_cache_stats', []),
+            "search": search_cache.get_stats()
+        }), 200
+
+    except Exception as e:
+        app_logger.error(msg=str(e), exc_info=True)
+        return jsonify({"message": "An error occurred while retrieving the LLM processor statistics."}), 500
+
+
 @app.route('/delete_user/<int:user_id>', methods=['DELETE'], endpoint='delete_user')
 @require_api_key
 def delete_user(user_id):
@@ -494,7 +694,7 @@ def delete_user(user_id):
         This method:
             1. Checks if Language Model (LLM) and the database are available; returns a 503 status if not.
             2. Retrieves the user with the specified ID from the database.
-            3. Deletes the user from the database, CSV file, and LLM vector store.
+            3. Deletes the user from the database and LLM vector store.
             4. Removes the user's profile photo if it exists.
 
         Parameters:
@@ -515,7 +715,6 @@ def delete_user(user_id):
 
         if user:
             user_photo_path = os.path.join(SERVER_SETTINGS['user_photos_directory'], user.profile_photo)
-            db.delete_user_from_csv(user.email)
             db.session.delete(user)
             db.session.commit()
             llm.query_llm('delete_expert_from_vector_store', [user.email])
@@ -542,7 +741,7 @@ def update_user(user_id):
         This method:
             1. Checks if Language Model (LLM) and the database are available; returns a 503 status if not.
             2. Retrieves the user with the specified ID from the database.
-            3. Updates user information in the CSV file and database.
+            3. Updates user information in the database.
             4. Updates user tags based on the updated skills using LLM.
             5. Updates user information in the LLM vector store.
 
@@ -565,8 +764,6 @@ def update_user(user_id):
         if user:
             request_data = request.get_json()
 
-            db.update_user_in_csv(user.email, request_data)
-
             for key, value in request_data.items():
                 setattr(user, key, value)
                 if key == "skills":
@@ -592,20 +789,20 @@ def download_csv():
         Handle the 'GET' request for the '/download_csv' route, allowing users to download the CSV file.
 
         This method:
-            1. Checks if the CSV file exists on the server; returns a 404 status if not.
-            2. Sends the CSV file as an attachment for the user to download.
+            1. Checks if the database is available; returns a 503 status if not.
+            2. Gets the CSV export of the users, generated from the database only if it changed since the last export.
+            3. Sends the CSV file as an attachment for the user to download.
 
         Returns:
             The CSV file as an attachment with a 200 status.
     """
 
     try:
-        csv_file_path = SERVER_SETTINGS['users_csv_file']
-
-        if not os.path.exists(csv_file_path):
-            return jsonify({'message': 'CSV file not found on the server.'}), 404
+        if not db.is_available:
+            return jsonify({"message": "Database not available"}), 503
 
-        download_filename = Path(csv_file_path).name
+        csv_file_path = db.get_csv_export()
+        download_filename = Path(SERVER_SETTINGS['users_csv_file']).name
 
         return send_file(
             csv_file_path,
@@ -628,13 +825,15 @@ def upload_csv():
         This method:
             1. Checks if Language Model (LLM) and the database are available; returns a 503 status if not.
             2. Retrieves the uploaded CSV file from the request.
-            3. Validates the format and content of the CSV file.
-            4. Temporarily saves the file for validation.
-            5. Updates the database and LLM vector store based on the validated CSV file.
-            6. Permanently replaces the existing CSV file with the validated one.
+            3. Saves the file under a unique name and validates its header.
+            4. Queues the import job updating the database and LLM vector store based on the validated CSV file. The
+               users CSV file of the server is then regenerated from the database.
+
+        The members are replaced all at once when the job commits the database, and the searches follow once the job
+        has synchronized the vector store.
 
         Returns:
-            A JSON response indicating the success or failure of the CSV file upload and database update process.
+            A JSON response with the ID of the import job and a 202 status, the progress of the job being available at '/jobs/<job_id>'.
     """
 
     try:
@@ -644,6 +843,9 @@ def upload_csv():
         if not db.is_available:
             return jsonify({"message": "Database not available"}), 503
 
+        if db.is_populating():
+            return jsonify({"message": "Database population in progress"}), 503
+
         if 'csv_file' not in request.files:
             return jsonify({"message": "No file part"}), 400
 
@@ -663,30 +865,64 @@ def upload_csv():
             if not os.path.exists(resources_path):
                 os.makedirs(resources_path)
 
-            # Temporarily save the file to be validated before saving it permanently
-            temp_file_path = os.path.join(resources_path, 'temp.csv')
-            file.save(temp_file_path)
+            # Save the file under a unique name, so that several uploads can be queued
+            upload_file_path = os.path.join(resources_path, f"upload_{uuid.uuid4().hex}.csv")
+            file.save(upload_file_path)
 
             # Validate the CSV file
-            is_valid, message = db.validate_csv(temp_file_path)
-
-            if is_valid:
-                db.update(temp_file_path)  # This method also updates tags and victor store if a new user is added or user skills has been changed.
-
-                if db.is_available:
-                    os.remove(SERVER_SETTINGS["users_csv_file"])
-                    os.rename(temp_file_path, SERVER_SETTINGS["users_csv_file"])
-                    return jsonify({"message": "CSV file uploaded, database and vector store updated successfully"}), 200
-                else:
-                    os.remove(temp_file_path)
-                    raise Exception("Database or vector store update from the uploaded csv file failed.")
-            else:
-                os.remove(temp_file_path)
+            is_valid, message = db.validate_csv(upload_file_path)
+
+            if not is_valid:
+                os.remove(upload_file_path)
                 return jsonify({"message": message}), 400
 
+            job_id = db.enqueue_import_job(upload_file_path)
+
+            return jsonify({"message": "CSV file uploaded, database and vector store update queued", "job_id": job_id}), 202, {"Location": f"/jobs/{job_id}"}
+
+    except Exception as e:
+        app_logger.error(msg=str(e), exc_info=True)
+        return jsonify({"message": "File upload failed. An error occurred while uploading the csv file."}), 500
+
+
+@app.route('/jobs/<int:job_id>', methods=['GET'], endpoint='get_job')
+@require_api_key
+def get_job(job_id):
+    """
+        Handle the 'GET' request for the '/jobs/<job_id>' route, retrieving the status of an import job.
+
+        This method:
+            1. Checks if the database is available; returns a 503 status if not.
+            2. Retrieves the import job; returns a 404 status if not found.
+            3. Returns the status, dates, progress (users processed, inserted, updated, deleted and unchanged, and the
+               time taken by each step in seconds) and error message of the job.
+
+        Returns:
+            A JSON response with the import job and a 200 status.
+    """
+
+    try:
+        if not db.is_available:
+            return jsonify({"message": "Database not available"}), 503
+
+        job = db.get_import_job(job_id)
+
+        if not job:
+            return jsonify({"message": "Job not found."}), 404
+
+        return jsonify({
+            "job_id": job.job_id,
+            "status": job.status,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            "progress": json.loads(job.progress) if job.progress else None,
+            "error": job.error
+        }), 200
+
     except Exception as e:
         app_logger.error(msg=str(e), exc_info=True)
-        return jsonify({"message": "File upload failed. An error occurred while uploading the csv file, updating the database or updating the vector store."}), 500
+        return jsonify({"message": "An error occurred while retrieving the job."}), 500
 
 
 @app.route('/download_user_photo/<int:user_id>', methods=['GET'], endpoint='download_user_photo')
@@ -697,7 +933,7 @@ def download_user_photo(user_id):
 
         This method:
             1. Checks if the database is available; returns a 503 status if not.
-            2. Retrieves the user with the specified ID from the database.
+            2. Retrieves the user with the specified ID from the in-memory snapshot of the member directory.
             3. Checks if the user has a profile photo; returns a 204 status if not.
             4. Retrieves the path to the user's profile photo on the server.
             5. Sends the user's profile photo as an attachment for the user to download.
@@ -713,7 +949,7 @@ def download_user_photo(user_id):
         if not db.is_available:
             return jsonify({"message": "Database not available"}), 503
 
-        user = db.session.get(User, user_id)
+        user = db.directory.get_snapshot().members_by_id.get(user_id)
 
         if not user:
             return jsonify({"message": "User not found"}), 404
@@ -798,7 +1034,6 @@ def upload_user_photo(user_id):
             photo_path = os.path.join(user_photos_directory, photo_name)
             file.save(photo_path)
 
-            db.update_user_in_csv(user.email, {"profile_photo": photo_name})
             user.profile_photo = photo_name
             db.session.commit()
 
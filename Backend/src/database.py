@@ -1,16 +1,25 @@
 import csv
+import hashlib
 import json
 import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from dataclasses import dataclass
 from datetime import datetime, date
 from logging import Logger
-from flask import Flask
+from threading import Thread
+from flask import Flask, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Column, Integer, Text, Date, Float
-from sqlalchemy.orm import scoped_session
-from typing import TypeVar, Type, Optional
+from sqlalchemy import Boolean, Column, Integer, Text, DateTime, Float, ForeignKey, Index, Connection, delete, event, func, inspect, insert, select, update
+from sqlalchemy.orm import Mapper, scoped_session
+from typing import Any, Callable, Iterable, Iterator, TypeVar, Type, Optional
 from settings import SERVER_SETTINGS
 from ai import LLM
+from member_directory import Member, MemberDirectory
 
 
 class Database:
@@ -52,6 +61,10 @@ class Database:
         "LinkedIn"
     ]
 
+    populate_checkpoint_file_name: str = "populate.checkpoint"
+    experience_filters: list[str] = ['years_experience_ia', 'years_experience_healthcare']
+    tag_filters: list[str] = ['membership_category', 'affiliation_organization', 'tags']
+
     def __init__(self, app: Flask, llm: LLM, app_logger: Logger):
         self.__database_directory: str = os.path.abspath(SERVER_SETTINGS['database_directory'])
         self.app: Flask = app
@@ -59,6 +72,10 @@ class Database:
         self.app_logger: Logger = app_logger
         self.session: scoped_session = self.db.session
         self.is_available: bool = False
+        self.populate_thread: Optional[Thread] = None
+        self.import_jobs_thread: Optional[Thread] = None
+        self.__users_csv_file_version: Optional[int] = None  # The version of the directory written to the users CSV file by this process.
+        self.directory: MemberDirectory = MemberDirectory(self.get_directory_version, self.get_members)
 
     def init(self) -> None:
         """
@@ -68,8 +85,13 @@ class Database:
                 1. Creates the database directory if it doesn't exist.
                 2. Configures the SQLAlchemy database URI for SQLite.
                 3. Initializes and binds the SQLAlchemy database to the Flask app.
-                4. Creates all tables defined in the database model.
-                5. Populates the database with data from the specified CSV file if it is empty.
+                4. Creates all tables defined in the database model, and the indexes added to existing tables since.
+                   The user_tags table is rebuilt if it is empty while the users table is not.
+                5. Populates the database with data from the specified CSV file in a background thread, if it is empty or if
+                   a previous population was interrupted. The database is available for reads while the users are tagged.
+                6. Otherwise, restores the registration times stored without their time by a previous version, and
+                   checks that the database, the CSV file and the vector store hold the same users.
+                7. Starts the background thread running the import jobs, which also keeps the CSV file up to date with the database.
 
             Returns:
                 None
@@ -82,10 +104,24 @@ class Database:
 
                 self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{self.__database_directory}/{SERVER_SETTINGS['sqlite_db']}"
                 self.db.init_app(self.app)
+                event.listen(self.db.engine, 'before_cursor_execute', self.count_query)
                 self.db.create_all()
+                self.create_missing_indexes()
+
+                if not self.session.get(DirectoryState, 1):
+                    self.session.add(DirectoryState(id=1, version=0))
+                    self.session.commit()
+
+                if not self.session.scalar(select(select(UserTag.user_id).exists())) and not self.is_empty():
+                    self.rebuild_user_tags()
+
+                if self.is_empty() or self.is_populating():
+                    self.start_populate_thread(SERVER_SETTINGS["users_csv_file"])
+                else:
+                    self.restore_registration_times(SERVER_SETTINGS["users_csv_file"])
+                    self.check_consistency(SERVER_SETTINGS["users_csv_file"])
 
-                if self.is_empty():
-                    self.populate(SERVER_SETTINGS["users_csv_file"])
+                self.start_import_jobs_thread()
 
             except Exception as e:
                 self.session.rollback()
@@ -94,23 +130,112 @@ class Database:
                 self.is_available = True
                 self.app_logger.info(msg="The database has been successfully initialized.")
 
-    def get_date(self, date_string: str) -> Optional[date]:
+    @staticmethod
+    def count_query(*args) -> None:
+        """
+            Count the SQL statements executed while handling the current request, in `g.query_count`.
+
+            This method is registered as a 'before_cursor_execute' listener of the engine. Statements executed outside
+            of a request (population, scheduled updates) are not counted.
+
+            Parameters:
+                *args: The arguments of the 'before_cursor_execute' event, unused.
+        """
+
+        if has_request_context():
+            g.query_count = g.get('query_count', 0) + 1
+
+    def create_missing_indexes(self) -> None:
+        """
+            Create the indexes of the database model that are missing from tables created by a previous version.
+
+            `create_all` only creates the missing tables, not the indexes added to the existing ones.
+
+            Returns:
+                None
+        """
+
+        for table in self.db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.db.engine, checkfirst=True)
+
+    def rebuild_user_tags(self) -> None:
+        """
+            Rebuild the user_tags table from the comma-separated values of all the users.
+
+            Returns:
+                None
+        """
+
+        with self.app.app_context():
+            self.session.execute(delete(UserTag))
+            users = self.session.execute(select(User.user_id, *[getattr(User, attribute) for attribute in self.tag_filters]))
+            user_tags = [user_tag for user in users for user_tag in UserTag.get_rows(user.user_id, user._mapping)]
+
+            if user_tags:
+                self.session.execute(insert(UserTag), user_tags)
+
+            self.session.commit()
+
+    def restore_registration_times(self, users_csv_file: str) -> None:
         """
-            Convert a date string to a date object.
+            Restore the time of the registration dates stored without it by a previous version, from a CSV file.
+
+            Only the users whose stored registration date has no time and matches the date of the CSV file are updated,
+            in a single transaction incrementing the version of the directory, as bulk statements do not trigger the
+            mapper events of the User class.
+
+            Parameters:
+                users_csv_file (str): The path to the CSV file containing user data.
+
+            Returns:
+                None
+        """
+
+        with self.app.app_context():
+            stored_users = {
+                user.email: user for user in self.session.execute(
+                    select(User.user_id, User.email, User.registration_date).where(func.length(User.registration_date) == len('YYYY-MM-DD'))
+                )
+            }
+
+            if not stored_users:
+                return
+
+            updated_users = [
+                {'user_id': stored_users[user["email"]].user_id, 'registration_date': user["registration_date"]}
+                for user in self.iter_csv_users(users_csv_file)
+                if user["email"] in stored_users and user["registration_date"] is not None
+                and user["registration_date"].date() == stored_users[user["email"]].registration_date.date()
+            ]
+
+            if not updated_users:
+                return
+
+            for users in self.get_chunks(updated_users, SERVER_SETTINGS["csv_chunk_size"]):
+                self.session.execute(update(User), users)
+
+            increment_directory_version(self.session.connection())
+            self.session.commit()
+            self.app_logger.info(msg=f"Registration time restored from {users_csv_file} for {len(updated_users)} of {len(stored_users)} user(s).")
+
+    def get_date(self, date_string: str) -> Optional[datetime]:
+        """
+            Convert a date string to a datetime object, keeping its time.
 
             This method:
                 1. Parses the input date string using the format "%m/%d/%Y %H:%M:%S".
-                2. Returns the parsed date object if successful, otherwise logs an error and returns None.
+                2. Returns the parsed datetime object if successful, otherwise logs an error and returns None.
 
             Parameters:
                 date_string (str): The date string to convert.
 
             Returns:
-                Optional[date]: The parsed date object or None if parsing fails.
+                Optional[datetime]: The parsed datetime object or None if parsing fails.
         """
 
         try:
-            formatted_date = datetime.strptime(date_string, "%m/%d/%Y %H:%M:%S").date()
+            formatted_date = datetime.strptime(date_string, "%m/%d/%Y %H:%M:%S")
         except ValueError as e:
             self.app_logger.error(msg=str(e), exc_info=True)
             return None
@@ -141,48 +266,118 @@ class Database:
         else:
             return number
 
-    def create_user_from_csv_row(self, row: list[str]):
+    def get_directory_version(self) -> int:
+        """
+            Get the version of the directory, incremented by every write to the users table.
+
+            Returns:
+                int: The version of the directory.
+        """
+
+        return self.session.scalar(select(DirectoryState.version).where(DirectoryState.id == 1)) or 0
+
+    def get_members(self) -> list[Member]:
         """
-            Create a User instance from a CSV row.
+            Get all the members from the users table, ordered by id, without hydrating ORM objects.
+
+            Returns:
+                list[Member]: The members.
+        """
+
+        return [Member(**row._mapping) for row in self.session.execute(select(User.__table__).order_by(User.user_id))]
+
+    def filter_user_ids(self, criteria: dict[str, list]) -> list[int]:
+        """
+            Get the ids of the users matching all the given criteria. Must be called within the application context of a request.
 
             This method:
-                1. Extracts values from the provided CSV row using attribute-to-column mappings.
-                2. Converts date and number strings to appropriate types.
-                3. Queries LLM to get keywords based on user skills.
-                4. Constructs and returns a User instance with the extracted values.
+                1. Checks that all the criteria are supported.
+                2. Adds a range condition, served by an index, for each experience criterion.
+                3. Adds an indexed lookup in the user_tags table for each membership category, organization or tags criterion,
+                   matching the users having at least one of the given values (compared lowercased and trimmed).
+                4. Returns the ids of the matching users, ordered by id.
+
+            Parameters:
+                criteria (dict[str, list]): The range [min, max] of each experience criterion, and the accepted values of the other criteria.
+
+            Returns:
+                list[int]: The ids of the matching users.
+
+            Raises:
+                ValueError: If a criterion is not supported.
+        """
+
+        unsupported_criteria = [attribute for attribute in criteria if attribute not in self.experience_filters + self.tag_filters]
+
+        if unsupported_criteria:
+            raise ValueError(f"Unsupported criteria: {unsupported_criteria[0]}")
+
+        query = select(User.user_id).order_by(User.user_id)
+
+        for attribute, values in criteria.items():
+            if attribute in self.experience_filters:
+                query = query.where(getattr(User, attribute).between(values[0], values[1]))
+            elif values:
+                query = query.where(User.user_id.in_(
+                    select(UserTag.user_id).where(UserTag.attribute == attribute, UserTag.value.in_({UserTag.normalize_value(value) for value in values}))
+                ))
+
+        return list(self.session.scalars(query))
+
+    def get_tags(self, skills: str) -> str:
+        """
+            Get the tags of a user by querying the LLM for the keywords of the user's skills.
+
+            The query is sent to the batch lane of the LLM processor, so that it never delays a search.
+
+            Parameters:
+                skills (str): The skills of the user.
+
+            Returns:
+                str: The comma-separated keywords.
+        """
+
+        return ', '.join(self.llm.query_llm('get_keywords', [skills], priority='batch'))
+
+    def get_user_attributes_from_csv_row(self, row: list[str]) -> dict[str, Any]:
+        """
+            Get the attributes of a user from a CSV row, converting the date and number strings to the appropriate types.
 
             Parameters:
                 row (list[str]): The CSV row containing user data.
 
             Returns:
-                User: The created User instance.
-        """
-
-        return User(
-            registration_date=self.get_date(row[self.user_attributes_to_csv_columns_map["registration_date"]]),
-            first_name=row[self.user_attributes_to_csv_columns_map["first_name"]],
-            last_name=row[self.user_attributes_to_csv_columns_map["last_name"]],
-            email=row[self.user_attributes_to_csv_columns_map["email"]],
-            membership_category=row[self.user_attributes_to_csv_columns_map["membership_category"]],
-            job_position=row[self.user_attributes_to_csv_columns_map["job_position"]],
-            affiliation_organization=row[self.user_attributes_to_csv_columns_map["affiliation_organization"]],
-            skills=row[self.user_attributes_to_csv_columns_map["skills"]],
-            years_experience_ia=self.get_number(row[self.user_attributes_to_csv_columns_map["years_experience_ia"]], float),
-            years_experience_healthcare=self.get_number(row[self.user_attributes_to_csv_columns_map["years_experience_healthcare"]], float),
-            community_involvement=row[self.user_attributes_to_csv_columns_map["community_involvement"]],
-            suggestions=row[self.user_attributes_to_csv_columns_map["suggestions"]],
-            tags=', '.join(self.llm.query_llm('get_keywords', [row[self.user_attributes_to_csv_columns_map["skills"]]])),
-            consent=row[self.user_attributes_to_csv_columns_map["consent"]],
-            profile_photo=row[self.user_attributes_to_csv_columns_map["profile_photo"]],
-            linkedin=row[self.user_attributes_to_csv_columns_map["linkedin"]]
-        )
+                dict[str, Any]: The attributes of the user read from the CSV file, keyed by name (all except the tags).
+        """
+
+        attributes = {attribute: row[index] for attribute, index in self.user_attributes_to_csv_columns_map.items()}
+        attributes["registration_date"] = self.get_date(attributes["registration_date"])
+        attributes["years_experience_ia"] = self.get_number(attributes["years_experience_ia"], float)
+        attributes["years_experience_healthcare"] = self.get_number(attributes["years_experience_healthcare"], float)
+
+        return attributes
+
+    @staticmethod
+    def get_content_hash(attributes: dict[str, Any], attribute_names: list[str]) -> str:
+        """
+            Get the hash of some of the attributes of a user, to detect the users whose attributes changed.
+
+            Parameters:
+                attributes (dict[str, Any]): The attributes of the user, keyed by name.
+                attribute_names (list[str]): The names of the hashed attributes.
+
+            Returns:
+                str: The SHA-256 hash of the attributes.
+        """
+
+        return hashlib.sha256(json.dumps([attributes[name] for name in attribute_names], default=str).encode()).hexdigest()
 
     def is_empty(self) -> bool:
         """
             Check if the User table in the database is empty.
 
             This method:
-                1. Queries the User table to retrieve all records.
+                1. Queries whether a row exists in the User table, without loading any row.
                 2. Returns True if the table is empty, False otherwise.
 
             Returns:
@@ -190,16 +385,150 @@ class Database:
         """
 
         with self.app.app_context():
-            return len(self.session.query(User).all()) == 0
+            return not self.session.scalar(select(select(User.user_id).exists()))
+
+    def get_users_digest(self, users: Iterable[Any]) -> tuple[int, str]:
+        """
+            Get the number of users and a digest of their attributes read from the CSV file, independent of their order.
+
+            The digest is the sum of the content hashes of the users, so it is computed while streaming the users.
+
+            Parameters:
+                users (Iterable[Any]): The attributes of the users, as dicts or rows mappings.
+
+            Returns:
+                tuple[int, str]: The number of users and the hexadecimal digest.
+        """
+
+        csv_attributes = list(self.user_attributes_to_csv_columns_map)
+        number_of_users = digest = 0
+
+        for user in users:
+            number_of_users += 1
+            digest = (digest + int(self.get_content_hash(user, csv_attributes), 16)) % 2 ** 256
+
+        return number_of_users, f"{digest:064x}"
+
+    def check_consistency(self, users_csv_file: str) -> None:
+        """
+            Check that the database, the users CSV file and the vector store hold the same users, and log the outcome
+            and the duration of each check. Must be called within the application context.
+
+            This method:
+                1. Streams the users of the database and of the CSV file, without hydrating ORM objects, and compares
+                   their numbers and the digests of their attributes.
+                2. Compares the emails of the users having skills with the emails of the experts of the vector store.
+
+            A failed check is logged as a warning: the next import of the CSV file synchronizes the database and the
+            vector store.
+
+            Parameters:
+                users_csv_file (str): The path to the users CSV file.
+        """
+
+        csv_attributes = list(self.user_attributes_to_csv_columns_map)
+
+        try:
+            started_at = time.monotonic()
+            database_users = self.session.execute(select(*[getattr(User, attribute) for attribute in csv_attributes]).execution_options(yield_per=1000))
+            number_of_database_users, database_digest = self.get_users_digest(user._mapping for user in database_users)
+            database_time = time.monotonic() - started_at
+            started_at = time.monotonic()
+            number_of_csv_users, csv_digest = self.get_users_digest(self.iter_csv_users(users_csv_file))
+            csv_time = time.monotonic() - started_at
+
+            if (number_of_database_users, database_digest) == (number_of_csv_users, csv_digest):
+                self.app_logger.info(msg=f"Consistency check: the database ({database_time * 1000:.0f} ms) and {users_csv_file} ({csv_time * 1000:.0f} ms) hold the same {number_of_database_users} user(s).")
+            elif number_of_database_users == number_of_csv_users:
+                self.app_logger.warning(msg=f"Consistency check: the database ({database_time * 1000:.0f} ms) and {users_csv_file} ({csv_time * 1000:.0f} ms) hold {number_of_database_users} user(s) with different attributes.")
+            else:
+                self.app_logger.warning(
+                    msg=f"Consistency check: the database ({database_time * 1000:.0f} ms) and {users_csv_file} ({csv_time * 1000:.0f} ms) differ: "
+                        f"{number_of_database_users} user(s) in the database, {number_of_csv_users} in the CSV file."
+                )
+        except Exception as e:
+            self.app_logger.warning(msg=f"Consistency check of the database and {users_csv_file} failed: {e}", exc_info=True)
+
+        try:
+            started_at = time.monotonic()
+            expert_emails = set(self.session.scalars(select(User.email).where(func.trim(User.skills) != '')))
+            vector_store_emails = set(self.llm.query_llm('get_vector_store_expert_emails', [], priority='batch'))
+            missing_experts = len(expert_emails - vector_store_emails)
+            unknown_experts = len(vector_store_emails - expert_emails)
+            vector_store_time = time.monotonic() - started_at
+
+            if missing_experts or unknown_experts:
+                self.app_logger.warning(
+                    msg=f"Consistency check: the vector store ({vector_store_time * 1000:.0f} ms) differs from the database: "
+                        f"{missing_experts} user(s) with skills missing from the vector store, {unknown_experts} expert(s) not in the database."
+                )
+            else:
+                self.app_logger.info(msg=f"Consistency check: the vector store ({vector_store_time * 1000:.0f} ms) holds the {len(expert_emails)} user(s) with skills.")
+        except Exception as e:
+            self.app_logger.warning(msg=f"Consistency check of the vector store failed: {e}", exc_info=True)
+
+    def __get_populate_checkpoint_file(self) -> str:
+        """
+            Get the path of the file marking a population in progress.
+
+            Returns:
+                str: The path of the checkpoint file, in the database directory.
+        """
+
+        return os.path.join(self.__database_directory, self.populate_checkpoint_file_name)
+
+    def is_populating(self) -> bool:
+        """
+            Check if a population of the User table is in progress, or was interrupted before its end.
+
+            The checkpoint file is shared by all the processes of the server, unlike an attribute of this class.
+
+            Returns:
+                bool: True if the population is not finished, False otherwise.
+        """
+
+        return os.path.exists(self.__get_populate_checkpoint_file())
+
+    def __get_tagged_users(self, users: Iterable[dict[str, Any]]) -> Iterator[tuple[dict[str, Any], str]]:
+        """
+            Get the tags of several users, querying the LLM for several users in parallel.
+
+            At most 'keywords_tagging_workers' queries are in flight, and the users are yielded in their original order
+            as soon as their tags are available, so that the caller can commit them while the next ones are tagged.
+
+            Parameters:
+                users (Iterable[dict[str, Any]]): The attributes of the users, consumed lazily.
+
+            Yields:
+                tuple[dict[str, Any], str]: The attributes of each user with its tags.
+        """
+
+        number_of_workers = SERVER_SETTINGS["keywords_tagging_workers"]
+        pending_users: deque[tuple[dict[str, Any], Future]] = deque()
+
+        with ThreadPoolExecutor(max_workers=number_of_workers, thread_name_prefix="keywords-tagging") as executor:
+            for user in users:
+                pending_users.append((user, executor.submit(self.get_tags, user["skills"])))
+
+                if len(pending_users) == 2 * number_of_workers:  # Keep the workers busy without submitting all the users at once.
+                    pending_user, tags = pending_users.popleft()
+                    yield pending_user, tags.result()
+
+            while pending_users:
+                pending_user, tags = pending_users.popleft()
+                yield pending_user, tags.result()
 
     def populate(self, users_csv_file: str) -> None:
         """
             Populate the User table in the database with data from a CSV file.
 
             This method:
-                1. Reads data from the specified CSV file, skipping the header row.
-                2. Creates a User instance for each row and adds it to the database session.
-                3. Commits the changes to persist the data in the User table.
+                1. Creates the checkpoint file marking the population in progress.
+                2. Streams the users of the specified CSV file, skipping the users already in the database, so that an
+                   interrupted population resumes where it stopped.
+                3. Queries the keywords of the users in parallel, with at most 'keywords_tagging_workers' queries in flight.
+                4. Creates the User instances in the CSV order and commits them every 'populate_commit_batch_size' users.
+                5. Removes the checkpoint file once all the users are committed.
 
             Parameters:
                 users_csv_file (str): The path to the CSV file containing user data.
@@ -208,26 +537,54 @@ class Database:
                 None
         """
 
+        with open(self.__get_populate_checkpoint_file(), 'w') as checkpoint_file:
+            checkpoint_file.write(users_csv_file)
+
         with self.app.app_context():
-            data = self.read_csv(users_csv_file)
+            existing_emails = set(self.session.scalars(self.db.select(User.email)))
+            users = (user for user in self.iter_csv_users(users_csv_file) if user["email"] not in existing_emails)
+            batch_size = SERVER_SETTINGS["populate_commit_batch_size"]
+            populated_users = 0
+            started_at = time.monotonic()
 
-            for row in data[1:]:  # Skip the header row.
-                user = self.create_user_from_csv_row(row)
-                self.session.add(user)
+            self.app_logger.info(msg=f"Populating the database from {users_csv_file}, {len(existing_emails)} user(s) already populated.")
+
+            for populated_users, (user, tags) in enumerate(self.__get_tagged_users(users), start=1):
+                self.session.add(User(**user, tags=tags))
+
+                if populated_users % batch_size == 0:
+                    self.session.commit()
+                    elapsed_time = time.monotonic() - started_at
+                    self.app_logger.info(msg=f"Populated {populated_users} user(s) in {elapsed_time:.1f} s ({populated_users / elapsed_time:.2f} rows/s).")
 
             self.session.commit()
+            self.app_logger.info(msg=f"Populated {populated_users} user(s) in {time.monotonic() - started_at:.1f} s.")
 
-    def update(self, users_csv_file: str) -> None:
+        os.remove(self.__get_populate_checkpoint_file())
+
+    def __populate_in_background(self, users_csv_file: str) -> None:
         """
-            Update the User table in the database based on data from a CSV file.
+            Populate the User table and log the outcome, as no caller is waiting for it.
 
-            This method:
-                1. Reads data from the specified CSV file, skipping the header row.
-                2. For each row:
-                    - Retrieves the corresponding User instance from the database.
-                    - Updates User attributes if values differ, including date and number conversions.
-                    - Adds a new User if not found in the database.
-                3. Commits the changes to persist the updated data in the User table.
+            Parameters:
+                users_csv_file (str): The path to the CSV file containing user data.
+        """
+
+        try:
+            self.populate(users_csv_file)
+        except Exception as e:
+            with self.app.app_context():
+                self.session.rollback()
+            self.app_logger.error(msg=str(e), exc_info=True)
+        else:
+            self.app_logger.info(msg="The database has been successfully populated.")
+
+    def start_populate_thread(self, users_csv_file: str) -> None:
+        """
+            Populate the User table in a background thread.
+
+            If the population fails, the error is logged and the checkpoint file is kept, so that the population resumes
+            at the next start of the server.
 
             Parameters:
                 users_csv_file (str): The path to the CSV file containing user data.
@@ -236,156 +593,715 @@ class Database:
                 None
         """
 
+        self.populate_thread = Thread(target=self.__populate_in_background, args=(users_csv_file,), name="database-populate", daemon=True)
+        self.populate_thread.start()
+
+    def update(self, users_csv_file: str) -> bool:
+        """
+            Update the User table in the database based on data from a CSV file, and log the outcome.
+
+            See `sync_users` for the steps of the update.
+
+            Parameters:
+                users_csv_file (str): The path to the CSV file containing user data.
+
+            Returns:
+                bool: True if the database has been updated, False otherwise.
+        """
+
         with self.app.app_context():
             try:
-                self.is_available = False
-                data = self.read_csv(users_csv_file)
-
-                for row in data[1:]:  # Skip the header row.
-                    user = User.query.filter(User.email == row[3]).first()
-
-                    if user:
-                        for attr, index in self.user_attributes_to_csv_columns_map.items():
-                            if attr == "registration_date":
-                                new_value = self.get_date(row[index])
-                            elif attr in ["years_experience_ia", "years_experience_healthcare"]:
-                                new_value = self.get_number(row[index], float)
-                            else:
-                                new_value = row[index]
-
-                            if getattr(user, attr) != new_value:
-                                setattr(user, attr, new_value)
-                                if attr == "skills":
-                                    setattr(user, "tags", ', '.join(self.llm.query_llm('get_keywords', [new_value])))
-                                    self.llm.query_llm('update_expert_in_vector_store', [new_value, user.email])
-                    else:
-                        new_user = self.create_user_from_csv_row(row)
-                        self.session.add(new_user)
-                        self.llm.query_llm('add_expert_to_vector_store', [new_user.skills, new_user.email])
-
-                self.session.commit()
+                progress = self.sync_users(users_csv_file)
             except Exception as e:
-                self.session.rollback()
                 self.app_logger.error(msg=str(e), exc_info=True)
+                return False
             else:
-                self.is_available = True
-                self.app_logger.info(msg="The database has been successfully updated.")
+                self.app_logger.info(msg=f"The database has been successfully updated: {self.format_sync_progress(progress)}")
+                return True
 
-    @staticmethod
-    def read_csv(file_path: str) -> list[list[str]]:
+    def sync_users(self, users_csv_file: str, on_progress: Optional[Callable[[dict[str, Any]], None]] = None) -> dict[str, Any]:
         """
-            Read data from a CSV file.
+            Synchronize the User table in the database with the users of a CSV file. Must be called within the application context.
 
-            This static method:
-                1. Opens the specified CSV file in read mode.
-                2. Uses the CSV reader to iterate over rows and appends them to a list.
-                3. Returns the list containing CSV data.
+            This method:
+                1. Validates every row of the specified CSV file in a first streaming pass, before any write.
+                2. Streams the users of the CSV file in chunks of 'csv_chunk_size' users. For each chunk:
+                    - Loads the users of the database with the same emails in a single query.
+                    - Compares the content hash of each CSV row with the one of the stored user, to find the users to
+                      insert, the users to update, and among them the users whose skills changed.
+                    - Queries the LLM for the tags of the inserted users and of the users whose skills changed only.
+                    - Stages the changes in the staged_users table, leaving the users table untouched.
+                    - Reports the progress of the synchronization.
+                3. Applies all the staged changes and deletes the users that are not in the CSV file with bulk
+                   statements, and increments the version of the directory, in a single transaction.
+                4. Once the transaction is committed, synchronizes the vector store with the inserted users and the users
+                   whose skills changed, deletes the removed users from it, and removes their profile photos.
+
+            The experts to synchronize are recorded in the pending_expert_syncs table by the same transaction, and only
+            forgotten once the vector store is synchronized, so that a failed synchronization is retried by the next
+            import or at the next start of the server (see `sync_pending_experts`).
+
+            The users table is changed all at once or not at all: an invalid row, a failed tagging query or a failed write
+            leaves the database as it was, and the read routes serve the previous members until the commit. The vector
+            store is only synchronized after the commit, so until it is, the searches may still recommend the previous
+            experts of the changed and deleted users. Only the current chunk and the emails of the CSV file are kept in
+            memory, whatever the size of the file. The database is left unchanged if the CSV file has no users, so that
+            an empty download never purges all the users.
 
             Parameters:
-                file_path (str): The path to the CSV file.
+                users_csv_file (str): The path to the CSV file containing user data.
+                on_progress (Optional[Callable[[dict[str, Any]], None]]): The function called with the progress after each chunk.
 
             Returns:
-                list[list[str]]: A list of lists, where each inner list represents a row of the CSV file.
+                dict[str, Any]: The number of users processed, inserted, updated (and among them, whose skills changed),
+                    deleted and unchanged, and the time taken by each step in seconds.
+
+            Raises:
+                ValueError: If the CSV file is invalid or has no users.
+                RuntimeError: If the users were committed but the vector store could not be synchronized.
         """
 
-        data = []
+        csv_attributes = list(self.user_attributes_to_csv_columns_map)
+        csv_emails: set[str] = set()
+        duplicate_emails: set[str] = set()
+        progress = {
+            "processed_users": 0, "inserted_users": 0, "updated_users": 0, "skills_changed_users": 0, "deleted_users": 0, "unchanged_users": 0,
+            "timings": {"read_and_diff": 0.0, "tagging": 0.0, "write": 0.0, "vector_store": 0.0}
+        }
+        timings = progress["timings"]
+        started_at = time.monotonic()
 
-        with open(file_path, 'r') as file:
-            reader = csv.reader(file)
-            for row in reader:
-                data.append(row)
+        for user in self.iter_csv_users(users_csv_file):
+            if user["email"] in csv_emails:
+                duplicate_emails.add(user["email"])
+
+            csv_emails.add(user["email"])
 
-        return data
+        if not csv_emails:
+            raise ValueError(f"{users_csv_file} has no users, the database has not been updated.")
+
+        try:
+            self.session.execute(delete(StagedUser))
+            self.session.commit()
+            processed_emails: set[str] = set()
+
+            for chunk in self.get_chunks(self.iter_csv_users(users_csv_file), SERVER_SETTINGS["csv_chunk_size"]):
+                csv_users = {user["email"]: user for user in chunk}
+                processed_emails.update(csv_users)
+                existing_users = {
+                    user.email: user._asdict()
+                    for user in self.session.execute(
+                        select(User.user_id, *[getattr(User, attribute) for attribute in csv_attributes]).where(User.email.in_(list(csv_users)))
+                    )
+                }
+                inserted_users, updated_users, skills_changed_users, unchanged_emails = [], [], [], []
+
+                for email, user in csv_users.items():
+                    existing_user = existing_users.get(email)
+
+                    if existing_user is None:
+                        inserted_users.append(user)
+                        skills_changed_users.append(user)
+                    elif self.get_content_hash(user, csv_attributes) != self.get_content_hash(existing_user, csv_attributes):
+                        user["user_id"] = existing_user["user_id"]
+                        updated_users.append(user)
+
+                        if self.get_content_hash(user, ["skills"]) != self.get_content_hash(existing_user, ["skills"]):
+                            skills_changed_users.append(user)
+                    elif email in duplicate_emails:  # The last row of a duplicated email wins, even if an earlier row was staged.
+                        unchanged_emails.append(email)
+
+                read_at = time.monotonic()
+
+                for user, tags in self.__get_tagged_users(skills_changed_users):
+                    user["tags"] = tags
+
+                tagged_at = time.monotonic()
+                self.__stage_users(inserted_users + updated_users, {user["email"] for user in skills_changed_users}, unchanged_emails)
+
+                progress["processed_users"] = len(processed_emails)
+                progress["inserted_users"] += len(inserted_users)
+                progress["updated_users"] += len(updated_users)
+                progress["skills_changed_users"] += len(skills_changed_users) - len(inserted_users)
+                progress["unchanged_users"] = progress["processed_users"] - progress["inserted_users"] - progress["updated_users"]
+                timings["read_and_diff"] += read_at - started_at
+                timings["tagging"] += tagged_at - read_at
+                timings["write"] += time.monotonic() - tagged_at
+                started_at = time.monotonic()  # The next chunk is read from here.
+
+                if on_progress:
+                    on_progress(progress)
+
+            removed_users = [
+                user._asdict() for user in self.session.execute(select(User.user_id, User.email, User.profile_photo)) if user.email not in csv_emails
+            ]
+            read_at = time.monotonic()
+            self.__apply_staged_users(removed_users)
+            written_at = time.monotonic()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        if duplicate_emails:  # The counts of the chunks include every row of a duplicated email.
+            progress.update(self.__count_staged_users(len(csv_emails)))
+
+        progress["deleted_users"] = len(removed_users)
+        timings["read_and_diff"] += read_at - started_at
+        timings["write"] += written_at - read_at
+
+        self.session.execute(delete(StagedUser))
+        self.session.commit()
+
+        try:
+            self.sync_pending_experts()
+        except Exception as e:
+            raise RuntimeError(
+                f"The users of {users_csv_file} have been imported, but the vector store could not be synchronized, which will be retried: {e}"
+            ) from e
+        finally:
+            self.remove_profile_photos([user["profile_photo"] for user in removed_users])
+
+        timings["vector_store"] += time.monotonic() - written_at
+
+        if on_progress:
+            on_progress(progress)
+
+        return progress
+
+    def __stage_users(self, changed_users: list[dict[str, Any]], skills_changed_emails: set[str], unchanged_emails: list[str]) -> None:
+        """
+            Stage the changes of a chunk of users in the staged_users table, and commit them.
+
+            Parameters:
+                changed_users (list[dict[str, Any]]): The attributes of the users to insert, and of the users to update with their ID.
+                skills_changed_emails (set[str]): The emails of the changed users whose skills changed.
+                unchanged_emails (list[str]): The emails of the users whose change staged by an earlier row must be discarded.
+        """
+
+        if unchanged_emails:
+            self.session.execute(delete(StagedUser).where(StagedUser.email.in_(unchanged_emails)))
+
+        if changed_users:
+            self.session.execute(
+                insert(StagedUser).prefix_with('OR REPLACE'),
+                [
+                    {
+                        'email': user["email"],
+                        'user_id': user.get("user_id"),
+                        'skills_changed': user["email"] in skills_changed_emails,
+                        'attributes': json.dumps({attribute: value for attribute, value in user.items() if attribute != "user_id"}, default=str)
+                    }
+                    for user in changed_users
+                ]
+            )
+
+        self.session.commit()
+
+    def __iter_staged_users(self) -> Iterator[list['StagedUser']]:
+        """
+            Read the staged users in chunks of 'csv_chunk_size' users, in the order of the CSV file.
+
+            Yields:
+                list[StagedUser]: A chunk of staged users.
+        """
+
+        last_position = 0
+
+        while True:
+            staged_users = self.session.scalars(
+                select(StagedUser).where(StagedUser.position > last_position).order_by(StagedUser.position).limit(SERVER_SETTINGS["csv_chunk_size"])
+            ).all()
+
+            if not staged_users:
+                return
+
+            last_position = staged_users[-1].position
+            yield staged_users
+
+    def __count_staged_users(self, number_of_csv_users: int) -> dict[str, int]:
+        """
+            Count the staged changes, for the progress of a synchronization.
+
+            Parameters:
+                number_of_csv_users (int): The number of distinct users of the CSV file.
+
+            Returns:
+                dict[str, int]: The number of users processed, inserted, updated (and among them, whose skills changed) and unchanged.
+        """
+
+        inserted_users, updated_users, skills_changed_users = self.session.execute(
+            select(
+                func.count().filter(StagedUser.user_id.is_(None)),
+                func.count().filter(StagedUser.user_id.is_not(None)),
+                func.count().filter(StagedUser.user_id.is_not(None), StagedUser.skills_changed)
+            )
+        ).one()
+
+        return {
+            "processed_users": number_of_csv_users, "inserted_users": inserted_users, "updated_users": updated_users,
+            "skills_changed_users": skills_changed_users, "unchanged_users": number_of_csv_users - inserted_users - updated_users
+        }
+
+    def remove_profile_photos(self, profile_photos: list[Optional[str]]) -> None:
+        """
+            Remove the profile photo files of deleted users from the 'user_photos_directory' directory.
+
+            Must be called once the deletion of the users is committed, so that a failed deletion never loses a photo.
+            A missing file is ignored, and a file that cannot be removed is only logged.
+
+            Parameters:
+                profile_photos (list[Optional[str]]): The profile photo file names of the deleted users, or None for the users without one.
+        """
+
+        for profile_photo in profile_photos:
+            if not profile_photo:
+                continue
+
+            try:
+                os.remove(os.path.join(SERVER_SETTINGS['user_photos_directory'], profile_photo))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.app_logger.warning(msg=f"The profile photo {profile_photo} of a deleted user could not be removed: {e}")
 
     @staticmethod
-    def write_csv(file_path: str, data: list[list[str]]) -> None:
+    def format_sync_progress(progress: dict[str, Any]) -> str:
         """
-            Write data to a CSV file.
+            Format the progress of a synchronization for the logs.
 
-            This static method:
-                1. Opens the specified CSV file in write mode.
-                2. Uses the CSV writer to write rows of data to the file.
+            Parameters:
+                progress (dict[str, Any]): The progress returned by `sync_users`.
+
+            Returns:
+                str: The summary of the changes with the time taken by each step.
+        """
+
+        timings = progress["timings"]
+
+        return (
+            f"{progress['inserted_users']} user(s) inserted, {progress['updated_users']} updated ({progress['skills_changed_users']} with new skills), "
+            f"{progress['deleted_users']} deleted, {progress['unchanged_users']} unchanged in {sum(timings.values()):.1f} s "
+            f"(read and diff {timings['read_and_diff']:.2f} s, tagging {timings['tagging']:.1f} s, write {timings['write']:.2f} s, "
+            f"vector store {timings['vector_store']:.1f} s)."
+        )
+
+    def __apply_staged_users(self, removed_users: list[dict[str, Any]]) -> None:
+        """
+            Apply the changes staged by `sync_users` and delete the removed users in a single transaction.
+
+            Bulk statements do not trigger the mapper events of the User class, so the user_tags rows of the changed
+            users are rewritten and the version of the directory is incremented here. The inserted users, the users whose
+            skills changed and the deleted users are recorded as pending synchronization of the vector store. Nothing is
+            visible to the other connections before the commit, so the read routes keep serving the previous members until then.
 
             Parameters:
-                file_path (str): The path to the CSV file.
-                data (list[list[str]]): A list of lists, where each inner list represents a row of data.
+                removed_users (list[dict[str, Any]]): The attributes of the users to delete, with their ID.
+        """
+
+        for staged_users in self.__iter_staged_users():
+            users = [staged_user.get_user_attributes() for staged_user in staged_users]
+            inserted_users = [user for user in users if user.get("user_id") is None]
+            updated_users = [user for user in users if user.get("user_id") is not None]
+
+            if inserted_users:
+                self.session.execute(insert(User), inserted_users)
+
+            if updated_users:
+                self.session.execute(update(User), updated_users)
+                self.session.execute(delete(UserTag).where(UserTag.user_id.in_([user["user_id"] for user in updated_users])))
+
+            changed_users = self.session.execute(
+                select(User.user_id, *[getattr(User, attribute) for attribute in self.tag_filters])
+                .where(User.email.in_([user["email"] for user in users]))
+            )
+            user_tags = [user_tag for user in changed_users for user_tag in UserTag.get_rows(user.user_id, user._mapping)]
+
+            if user_tags:
+                self.session.execute(insert(UserTag), user_tags)
+
+            self.__add_pending_experts([staged_user.email for staged_user in staged_users if staged_user.skills_changed])
+
+        for deleted_users in self.get_chunks(removed_users, SERVER_SETTINGS["csv_chunk_size"]):
+            deleted_user_ids = [user["user_id"] for user in deleted_users]
+            self.session.execute(delete(UserTag).where(UserTag.user_id.in_(deleted_user_ids)))
+            self.session.execute(delete(User).where(User.user_id.in_(deleted_user_ids)))
+            self.__add_pending_experts([user["email"] for user in deleted_users])
+
+        increment_directory_version(self.session.connection())
+        self.session.commit()
+
+    def __add_pending_experts(self, expert_emails: list[str]) -> None:
+        """
+            Record experts whose vectors must be synchronized with the database, in the current transaction.
+
+            Parameters:
+                expert_emails (list[str]): The emails of the experts.
+        """
+
+        if expert_emails:
+            self.session.execute(insert(PendingExpertSync).prefix_with('OR IGNORE'), [{'email': email} for email in expert_emails])
+
+    def sync_pending_experts(self) -> int:
+        """
+            Synchronize the vector store with the experts recorded as pending by the imports. Must be called within the application context.
+
+            This method, for each chunk of 'csv_chunk_size' pending experts:
+                1. Reads the current skills of the pending experts still in the database.
+                2. Synchronizes their sentences in the vector store, and deletes the experts no longer in the database from it.
+                3. Forgets the pending experts, once the vector store is synchronized.
+
+            The skills are read from the database rather than recorded with the pending experts, so that a later edit
+            of an expert is never overwritten by an older synchronization.
 
             Returns:
-                None
+                int: The number of experts synchronized.
         """
 
-        with open(file_path, 'w') as file:
-            writer = csv.writer(file)
-            writer.writerows(data)
+        synchronized_experts = 0
+
+        while True:
+            pending_experts = self.session.execute(
+                select(PendingExpertSync.email, User.user_id, User.skills)
+                .outerjoin(User, User.email == PendingExpertSync.email)
+                .order_by(PendingExpertSync.email)
+                .limit(SERVER_SETTINGS["csv_chunk_size"])
+            ).all()
+
+            if not pending_experts:
+                return synchronized_experts
 
-    def delete_user_from_csv(self, user_email: str) -> None:
+            synced_experts = [expert for expert in pending_experts if expert.user_id is not None]
+            deleted_emails = [expert.email for expert in pending_experts if expert.user_id is None]
+
+            if synced_experts:
+                self.llm.query_llm(
+                    'sync_experts_in_vector_store',
+                    [[expert.skills or '' for expert in synced_experts], [expert.email for expert in synced_experts]],
+                    priority='batch'
+                )
+
+            if deleted_emails:
+                self.llm.query_llm('delete_experts_from_vector_store', [deleted_emails], priority='batch')
+
+            self.session.execute(delete(PendingExpertSync).where(PendingExpertSync.email.in_([expert.email for expert in pending_experts])))
+            self.session.commit()
+            synchronized_experts += len(pending_experts)
+
+    def enqueue_import_job(self, users_csv_file: str) -> int:
         """
-            Delete a user's data from the CSV file.
+            Queue the import of a users CSV file. Must be called within the application context.
 
-            This method:
-                1. Reads data from the users CSV file.
-                2. Creates a new list excluding the row with the specified user_email.
-                3. Writes the updated data back to the CSV file.
+            Parameters:
+                users_csv_file (str): The path to the CSV file to import. If it is not the users CSV file of the server,
+                    it is removed once the job is over.
+
+            Returns:
+                int: The ID of the import job.
+        """
+
+        job = ImportJob(csv_file=users_csv_file, status='queued', created_at=datetime.now())
+        self.session.add(job)
+        self.session.commit()
+        self.app_logger.info(msg=f"Import job {job.job_id} queued for {users_csv_file}.")
+
+        return job.job_id
+
+    def get_import_job(self, job_id: int) -> Optional['ImportJob']:
+        """
+            Get an import job. Must be called within the application context.
 
             Parameters:
-                user_email (str): The email of the user to be deleted.
+                job_id (int): The ID of the import job.
 
             Returns:
-                None
+                Optional[ImportJob]: The import job, or None if it does not exist.
+        """
 
-            Raises:
-                Exception: If the user is not found in the CSV file, indicating a potential inconsistency.
+        return self.session.get(ImportJob, job_id)
+
+    def __claim_import_job(self) -> Optional[int]:
         """
+            Mark the oldest queued import job as running, unless an import job is already running.
 
-        data = self.read_csv(SERVER_SETTINGS["users_csv_file"])
-        updated_data = []
+            The job is claimed by a single statement, so that two processes can never run import jobs at the same time.
 
-        for row in data:
-            if row[self.user_attributes_to_csv_columns_map["email"]] == user_email:
-                continue
-            updated_data.append(row)
+            Returns:
+                Optional[int]: The ID of the claimed import job, or None if there is no job to run.
+        """
+
+        with self.app.app_context():
+            job_id = self.session.scalar(select(ImportJob.job_id).where(ImportJob.status == 'queued').order_by(ImportJob.job_id).limit(1))
 
-        if len(data) == len(updated_data):
-            raise Exception("User not found in the csv file. There is probably an inconsistency between the sqlite database and the csv file.")
+            if job_id is None:
+                return None
 
-        self.write_csv(SERVER_SETTINGS["users_csv_file"], updated_data)
+            is_claimed = self.session.execute(
+                update(ImportJob)
+                .where(ImportJob.job_id == job_id, ImportJob.status == 'queued', ~select(ImportJob.job_id).where(ImportJob.status == 'running').exists())
+                .values(status='running', started_at=datetime.now())
+            ).rowcount == 1
+            self.session.commit()
+
+            return job_id if is_claimed else None
 
-    def update_user_in_csv(self, user_email: str, user_information_to_be_updated: dict) -> None:
+    def run_import_job(self, job_id: int) -> None:
         """
-            Update user information in the CSV file.
+            Run a claimed import job, and record its progress and outcome.
+
+            The members change all at once when the synchronization commits, then the vector store catches up: the job
+            stays running until both are done.
 
             This method:
-                1. Reads data from the users CSV file.
-                2. Finds the user's row based on the specified user_email.
-                3. Updates the user's information with the provided dictionary.
-                4. Writes the updated data back to the CSV file.
+                1. Synchronizes the users with the CSV file of the job, saving the progress after each chunk.
+                2. Removes the imported file, unless it is the users CSV file of the server, which is regenerated from the
+                   database by `refresh_users_csv_file` instead.
+                3. Marks the job as succeeded or failed, with the error message.
 
             Parameters:
-                user_email (str): The email of the user to be updated.
-                user_information_to_be_updated (dict): A dictionary containing key-value pairs of information to be updated.
+                job_id (int): The ID of the import job.
+        """
+
+        def save_progress(progress: dict[str, Any]) -> None:
+            self.session.execute(update(ImportJob).where(ImportJob.job_id == job_id).values(progress=json.dumps(progress)))
+            self.session.commit()
+
+        with self.app.app_context():
+            csv_file = self.session.scalar(select(ImportJob.csv_file).where(ImportJob.job_id == job_id))
+            is_users_csv_file = os.path.abspath(csv_file) == os.path.abspath(SERVER_SETTINGS["users_csv_file"])
+            self.app_logger.info(msg=f"Import job {job_id} started for {csv_file}.")
+
+            try:
+                progress = self.sync_users(csv_file, save_progress)
+            except Exception as e:
+                self.app_logger.error(msg=f"Import job {job_id} failed: {e}", exc_info=True)
+                self.session.execute(update(ImportJob).where(ImportJob.job_id == job_id).values(status='failed', finished_at=datetime.now(), error=str(e)))
+            else:
+                self.app_logger.info(msg=f"Import job {job_id} succeeded: {self.format_sync_progress(progress)}")
+                self.session.execute(update(ImportJob).where(ImportJob.job_id == job_id).values(status='succeeded', finished_at=datetime.now()))
+
+            self.session.commit()
+
+            if not is_users_csv_file and os.path.exists(csv_file):
+                os.remove(csv_file)
+
+    def __run_import_jobs(self) -> None:
+        """
+            Run the queued import jobs one at a time, polling the queue every 'import_jobs_poll_interval' seconds.
+
+            The jobs that were running when the server stopped are queued again first: the synchronization of the users
+            only applies the changes that are not in the database yet, so an interrupted job can be run again from the start.
+            No job is run while the database is populated. The experts whose synchronization of the vector store failed
+            are synchronized first. Between the jobs, the users CSV file is regenerated from the
+            database whenever the users changed.
+        """
+
+        with self.app.app_context():
+            self.session.execute(update(ImportJob).where(ImportJob.status == 'running').values(status='queued', started_at=None))
+            self.session.commit()
+
+            try:
+                synchronized_experts = self.sync_pending_experts()
+            except Exception as e:
+                self.session.rollback()
+                self.app_logger.error(msg=f"The pending synchronization of the vector store failed, it will be retried by the next import: {e}", exc_info=True)
+            else:
+                if synchronized_experts:
+                    self.app_logger.info(msg=f"Vector store synchronized for {synchronized_experts} pending expert(s).")
+
+        while True:
+            try:
+                job_id = None if self.is_populating() else self.__claim_import_job()
+
+                if job_id is None:
+                    self.refresh_users_csv_file()
+                    time.sleep(SERVER_SETTINGS["import_jobs_poll_interval"])
+                else:
+                    self.run_import_job(job_id)
+            except Exception as e:
+                with self.app.app_context():
+                    self.session.rollback()
+                self.app_logger.error(msg=str(e), exc_info=True)
+                time.sleep(SERVER_SETTINGS["import_jobs_poll_interval"])
+
+    def refresh_users_csv_file(self) -> None:
+        """
+            Replace the users CSV file of the server by the CSV export of the database, if the users changed since the
+            last refresh.
+
+            The database is the source of truth of the users, edited by the routes and the import jobs, while the users
+            CSV file seeds the population of an empty database, the rebuild of an empty vector store and the consistency
+            check at startup. Regenerating it here, in the background, keeps it up to date without writing it in the
+            routes. The file is replaced atomically, and never while the database is empty or populated from it.
 
             Returns:
                 None
+        """
+
+        if self.is_populating() or self.is_empty():
+            return
+
+        with self.app.app_context():
+            version = self.get_directory_version()
+
+            if version == self.__users_csv_file_version:
+                return
+
+            users_csv_file = os.path.abspath(SERVER_SETTINGS["users_csv_file"])
+            export_file_path = self.get_csv_export()
+
+        with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(users_csv_file), suffix='.tmp', delete=False) as temp_file:
+            with open(export_file_path, 'rb') as export_file:
+                shutil.copyfileobj(export_file, temp_file)
+
+        os.replace(temp_file.name, users_csv_file)
+        self.__users_csv_file_version = version
+        self.app_logger.info(msg=f"{SERVER_SETTINGS['users_csv_file']} has been regenerated from version {version} of the database.")
+
+    def start_import_jobs_thread(self) -> None:
+        """
+            Run the import jobs in a background thread, in the process initializing the database (the gunicorn master
+            process, as the application is preloaded), so that a single thread runs them for all the workers.
+
+            Returns:
+                None
+        """
+
+        self.import_jobs_thread = Thread(target=self.__run_import_jobs, name="database-import-jobs", daemon=True)
+        self.import_jobs_thread.start()
+
+    @staticmethod
+    def read_csv_header(file_path: str) -> list[str]:
+        """
+            Read the header row of a CSV file, without reading the rest of the file.
+
+            Parameters:
+                file_path (str): The path to the CSV file.
+
+            Returns:
+                list[str]: The names of the columns, or an empty list if the file is empty.
+        """
+
+        with open(file_path, 'r', newline='') as file:
+            return next(csv.reader(file), [])
+
+    def iter_csv_users(self, file_path: str) -> Iterator[dict[str, Any]]:
+        """
+            Stream the users of a CSV file, one row at a time.
+
+            This method:
+                1. Validates the header row of the file.
+                2. Reads the next rows lazily, skipping the blank lines, and checks their number of columns.
+                3. Yields the attributes of the user of each row, with the date and number strings converted to the appropriate types.
+
+            Parameters:
+                file_path (str): The path to the CSV file.
+
+            Yields:
+                dict[str, Any]: The attributes of the user of each row, keyed by name (all except the tags).
 
             Raises:
-                Exception: If the user is not found in the CSV file, indicating a potential inconsistency.
+                ValueError: If the header row or the number of columns of a row is incorrect.
+        """
+
+        with open(file_path, 'r', newline='') as file:
+            reader = csv.reader(file)
+            is_valid, message = self.validate_csv_header(next(reader, []))
+
+            if not is_valid:
+                raise ValueError(f"{file_path}: {message}")
+
+            for row in reader:
+                if not row:
+                    continue
+
+                if len(row) != len(self.required_columns):
+                    raise ValueError(f"{file_path}, line {reader.line_num}: expected {len(self.required_columns)} columns, got {len(row)}.")
+
+                yield self.get_user_attributes_from_csv_row(row)
+
+    @staticmethod
+    def get_chunks(items: Iterable[Any], chunk_size: int) -> Iterator[list[Any]]:
+        """
+            Split an iterable into lists of at most `chunk_size` items, consuming it lazily.
+
+            Parameters:
+                items (Iterable[Any]): The items.
+                chunk_size (int): The maximum number of items of a chunk.
+
+            Yields:
+                list[Any]: The next chunk of items.
+        """
+
+        iterator = iter(items)
+
+        while chunk := list(islice(iterator, chunk_size)):
+            yield chunk
+
+    @staticmethod
+    def __format_csv_value(value: Any) -> str:
+        """
+            Format a value of a user as it is written in the CSV file.
+
+            Parameters:
+                value (Any): The value.
+
+            Returns:
+                str: The formatted value: dates in the format "%m/%d/%Y %H:%M:%S", numbers without trailing zeros, and an empty string for missing values.
+        """
+
+        if value is None:
+            return ''
+
+        if isinstance(value, date):
+            return value.strftime("%m/%d/%Y %H:%M:%S")
+
+        if isinstance(value, float):
+            return str(int(value)) if value.is_integer() else repr(value)
+
+        return str(value)
+
+    def get_csv_export(self) -> str:
+        """
+            Get the CSV export of the users, generating it if the users changed since the last export.
+
+            This method:
+                1. Gets the version of the directory, incremented by every write to the users table.
+                2. Returns the export of this version if it was already generated, by any process of the server.
+                3. Otherwise, writes the users to a temporary file in the required column order, atomically renames it
+                   to the export of this version, and removes the exports of the previous versions.
+
+            The export is never modified in place, so concurrent exports and downloads from several processes cannot
+            read or write a partial file.
+
+            Returns:
+                str: The path of the CSV export.
         """
 
-        data = self.read_csv(SERVER_SETTINGS["users_csv_file"])
-        user = []
+        export_directory = os.path.abspath(SERVER_SETTINGS["users_csv_export_directory"])
+        os.makedirs(export_directory, exist_ok=True)
+        export_file_path = os.path.join(export_directory, f"users_{self.get_directory_version()}.csv")
 
-        for row in data[1:]:  # Skip the header row.
-            if row[self.user_attributes_to_csv_columns_map["email"]] == user_email:
-                user = row
-                break
+        if os.path.exists(export_file_path):
+            return export_file_path
 
-        if not user:
-            raise Exception("User not found in the csv file. There is probably an inconsistency between the sqlite database and the csv file.")
+        columns = sorted(self.user_attributes_to_csv_columns_map, key=self.user_attributes_to_csv_columns_map.get)
+        users = self.session.execute(select(*[getattr(User, column) for column in columns]).order_by(User.user_id))
 
-        for key, value in user_information_to_be_updated.items():
-            user[self.user_attributes_to_csv_columns_map[key]] = value
+        with tempfile.NamedTemporaryFile('w', dir=export_directory, suffix='.tmp', delete=False, newline='') as temp_file:
+            writer = csv.writer(temp_file)
+            writer.writerow(self.required_columns)
+            writer.writerows([self.__format_csv_value(value) for value in user] for user in users)
 
-        self.write_csv(SERVER_SETTINGS["users_csv_file"], data)
+        os.replace(temp_file.name, export_file_path)
+
+        for file_name in os.listdir(export_directory):
+            if file_name.startswith('users_') and file_name.endswith('.csv') and os.path.join(export_directory, file_name) != export_file_path:
+                try:
+                    os.remove(os.path.join(export_directory, file_name))
+                except FileNotFoundError:  # Already removed by another process.
+                    pass
+
+        return export_file_path
 
     @staticmethod
     def __get_expert_skills_from_json(json_file_path: str, expert_email: str) -> str:
@@ -424,10 +1340,12 @@ class Database:
             Validate the format of a CSV file.
 
             This method:
-                1. Reads the headers from the specified CSV file.
+                1. Reads the headers from the specified CSV file, without reading the rest of the file.
                 2. Checks if all required columns are present.
                 3. Verifies the correct order of columns.
 
+            The number of columns of the other rows is checked while they are streamed by `iter_csv_users`.
+
             Parameters:
                 users_csv_file (str): The path to the CSV file to be validated.
 
@@ -435,7 +1353,18 @@ class Database:
                 Tuple[bool, str]: A tuple indicating whether the CSV file is valid (True/False) and a message.
         """
 
-        headers = self.read_csv(users_csv_file)[0]
+        return self.validate_csv_header(self.read_csv_header(users_csv_file))
+
+    def validate_csv_header(self, headers: list[str]) -> tuple[bool, str]:
+        """
+            Validate the header row of a CSV file.
+
+            Parameters:
+                headers (list[str]): The names of the columns of the CSV file.
+
+            Returns:
+                Tuple[bool, str]: A tuple indicating whether the header row is valid (True/False) and a message.
+        """
 
         # Check if all required columns are present
         missing_columns = [col for col in self.required_columns if col not in headers]
@@ -459,7 +1388,7 @@ class User(Database.db.Model):
             user_id (int): The unique identifier for the user (primary key).
             first_name (str): The user's first name.
             last_name (str): The user's last name.
-            registration_date (datetime.date): The date when the user registered (nullable).
+            registration_date (datetime): The date and time when the user registered (nullable).
             email (str): The unique email address of the user (unique, not nullable).
             membership_category (str): The category of membership for the user (nullable).
             job_position (str): The user's job position (nullable).
@@ -480,17 +1409,224 @@ class User(Database.db.Model):
     user_id: int = Column(Integer, primary_key=True)
     first_name: str = Column(Text, nullable=False)
     last_name: str = Column(Text, nullable=False)
-    registration_date: datetime.date = Column(Date, nullable=True)
+    registration_date: datetime = Column(DateTime, nullable=True)
     email: str = Column(Text, unique=True, nullable=False)
     membership_category: str = Column(Text, nullable=True)
     job_position: str = Column(Text, nullable=True)
     affiliation_organization: str = Column(Text, nullable=True)
     skills: str = Column(Text, nullable=True)
-    years_experience_ia: float = Column(Float, nullable=True)
-    years_experience_healthcare: float = Column(Float, nullable=True)
+    years_experience_ia: float = Column(Float, nullable=True, index=True)
+    years_experience_healthcare: float = Column(Float, nullable=True, index=True)
     community_involvement: str = Column(Text, nullable=True)
     suggestions: str = Column(Text, nullable=True)
     tags: str = Column(Text, nullable=True)
     consent: str = Column(Text, nullable=True)
     profile_photo: str = Column(Text, nullable=True)
     linkedin: str = Column(Text, nullable=True)
+
+
+class DirectoryState(Database.db.Model):
+    """
+        Represents the state of the member directory, in a single row.
+
+        Attributes:
+            id (int): The ID of the row, always 1.
+            version (int): The version of the directory, incremented in the transaction of every write to the users table.
+    """
+
+    __tablename__ = 'directory_state'
+
+    id: int = Column(Integer, primary_key=True)
+    version: int = Column(Integer, nullable=False, default=0)
+
+
+@dataclass
+class ImportJob(Database.db.Model):
+    """
+        Represents the import of a users CSV file, run in the background.
+
+        Attributes:
+            job_id (int): The ID of the import job.
+            csv_file (str): The path of the CSV file to import.
+            status (str): 'queued', 'running', 'succeeded' or 'failed'.
+            created_at (datetime): The date and time the job was queued.
+            started_at (datetime): The date and time the job started (nullable).
+            finished_at (datetime): The date and time the job finished (nullable).
+            progress (str): The progress of the job as returned by `Database.sync_users`, in JSON (nullable).
+            error (str): The error message of a failed job (nullable).
+    """
+
+    __tablename__ = 'import_jobs'
+
+    job_id: int = Column(Integer, primary_key=True)
+    csv_file: str = Column(Text, nullable=False)
+    status: str = Column(Text, nullable=False, index=True)
+    created_at: datetime = Column(DateTime, nullable=False)
+    started_at: datetime = Column(DateTime, nullable=True)
+    finished_at: datetime = Column(DateTime, nullable=True)
+    progress: str = Column(Text, nullable=True)
+    error: str = Column(Text, nullable=True)
+
+
+class StagedUser(Database.db.Model):
+    """
+        Represents a change of the users table staged by `Database.sync_users`, until all the changes of an import are
+        applied in a single transaction.
+
+        Attributes:
+            position (int): The position of the change in the CSV file (primary key).
+            email (str): The unique email of the user.
+            user_id (int): The ID of the user to update, or None for a user to insert (nullable).
+            skills_changed (bool): Whether the user is inserted or its skills changed, so that the vector store must be synchronized.
+            attributes (str): The attributes of the user with its tags, in JSON.
+    """
+
+    __tablename__ = 'staged_users'
+
+    position: int = Column(Integer, primary_key=True)
+    email: str = Column(Text, unique=True, nullable=False)
+    user_id: int = Column(Integer, nullable=True)
+    skills_changed: bool = Column(Boolean, nullable=False)
+    attributes: str = Column(Text, nullable=False)
+
+    def get_user_attributes(self) -> dict[str, Any]:
+        """
+            Get the attributes of the staged user, as expected by the bulk statements of the User class.
+
+            Returns:
+                dict[str, Any]: The attributes of the user, with its ID if it is updated.
+        """
+
+        attributes = json.loads(self.attributes)
+
+        if attributes.get("registration_date"):
+            attributes["registration_date"] = datetime.fromisoformat(attributes["registration_date"])
+
+        if self.user_id is not None:
+            attributes["user_id"] = self.user_id
+
+        return attributes
+
+
+class PendingExpertSync(Database.db.Model):
+    """
+        Represents an expert whose vectors must be synchronized with the database, recorded by an import in the same
+        transaction as its changes, and deleted once the vector store is synchronized.
+
+        Attributes:
+            email (str): The email of the expert (primary key).
+    """
+
+    __tablename__ = 'pending_expert_syncs'
+
+    email: str = Column(Text, primary_key=True)
+
+
+class UserTag(Database.db.Model):
+    """
+        Represents one value of a comma-separated attribute of a user (membership category, affiliation organization or tags).
+
+        Values are lowercased and trimmed, so that filtering users on these attributes is an indexed lookup instead of
+        splitting the attributes of every user. The rows of a user are kept in sync with the users table by the mapper events below.
+
+        Attributes:
+            user_id (int): The ID of the user.
+            attribute (str): The name of the attribute of the user.
+            value (str): One of the normalized values of the attribute.
+    """
+
+    __tablename__ = 'user_tags'
+    __table_args__ = (Index('ix_user_tags_attribute_value', 'attribute', 'value'),)
+
+    user_id: int = Column(Integer, ForeignKey('users.user_id', ondelete='CASCADE'), primary_key=True)
+    attribute: str = Column(Text, primary_key=True)
+    value: str = Column(Text, primary_key=True)
+
+    @staticmethod
+    def normalize_value(value: str) -> str:
+        """
+            Normalize a value of a comma-separated attribute, or a filter criterion.
+
+            Parameters:
+                value (str): The value.
+
+            Returns:
+                str: The lowercased and trimmed value.
+        """
+
+        return value.strip().lower()
+
+    @classmethod
+    def get_rows(cls, user_id: int, attributes: dict) -> list[dict]:
+        """
+            Get the user_tags rows of a user.
+
+            Parameters:
+                user_id (int): The ID of the user.
+                attributes (dict): The values of the comma-separated attributes of the user, keyed by attribute name.
+
+            Returns:
+                list[dict]: One row per distinct normalized value of each attribute.
+        """
+
+        return [
+            {'user_id': user_id, 'attribute': attribute, 'value': value}
+            for attribute in Database.tag_filters if attributes.get(attribute) is not None
+            for value in {cls.normalize_value(value) for value in attributes[attribute].split(',')}
+        ]
+
+
+def increment_directory_version(connection: Connection) -> None:
+    """
+        Increment the version of the directory, so that every process rebuilds its snapshot of the members.
+    """
+
+    connection.execute(update(DirectoryState).where(DirectoryState.id == 1).values(version=DirectoryState.version + 1))
+
+
+def write_user_tags(connection: Connection, user: User) -> None:
+    """
+        Replace the user_tags rows of a user by the values of its current attributes.
+    """
+
+    connection.execute(delete(UserTag).where(UserTag.user_id == user.user_id))
+    user_tags = UserTag.get_rows(user.user_id, {attribute: getattr(user, attribute) for attribute in Database.tag_filters})
+
+    if user_tags:
+        connection.execute(insert(UserTag), user_tags)
+
+
+@event.listens_for(User, 'after_insert')
+def after_user_insert(mapper: Mapper, connection: Connection, user: User) -> None:
+    """
+        Write the user_tags rows of an inserted user, and increment the version of the directory.
+    """
+
+    write_user_tags(connection, user)
+    increment_directory_version(connection)
+
+
+@event.listens_for(User, 'after_update')
+def after_user_update(mapper: Mapper, connection: Connection, user: User) -> None:
+    """
+        Rewrite the user_tags rows of an updated user whose membership category, organization or tags changed, and
+        increment the version of the directory.
+    """
+
+    user_state = inspect(user)
+
+    if any(user_state.attrs[attribute].history.has_changes() for attribute in Database.tag_filters):
+        write_user_tags(connection, user)
+
+    increment_directory_version(connection)
+
+
+@event.listens_for(User, 'after_delete')
+def after_user_delete(mapper: Mapper, connection: Connection, user: User) -> None:
+    """
+        Delete the user_tags rows of a deleted user, as SQLite does not enforce foreign keys by default, and increment
+        the version of the directory.
+    """
+
+    connection.execute(delete(UserTag).where(UserTag.user_id == user.user_id))
+    increment_directory_version(connection)
@@ -0,0 +1,210 @@
+import hashlib
+import os
+import sqlite3
+import numpy as np
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+from chromadb.api.types import Documents, Embeddings, EmbeddingFunction
+
+
+class CachedEmbeddingFunction:
+    """
+        Embedding function caching the embeddings computed by another embedding function.
+
+        Embeddings are keyed by the model name and the hash of the normalized text (surrounding and repeated whitespaces
+        removed). They are kept in an in-memory LRU tier and persisted in a SQLite file, so that re-adding experts,
+        rebuilding the vector store after a restart or after the vector store directory was wiped, or querying the same
+        generic profiles again does not run the model again.
+
+        Attributes:
+            embedding_function (EmbeddingFunction): The embedding function computing the embeddings missing from the cache.
+            model_name (str): The name of the model used by the embedding function.
+            cache_file (str): The path of the SQLite file persisting the embeddings.
+            memory_size (int): The maximum number of embeddings kept in memory.
+            memory_hits (int): The number of embeddings found in memory.
+            disk_hits (int): The number of embeddings found in the SQLite file.
+            misses (int): The number of embeddings computed by the embedding function.
+    """
+
+    def __init__(self, embedding_function: EmbeddingFunction, model_name: str, cache_file: str, memory_size: int):
+        self.embedding_function: EmbeddingFunction = embedding_function
+        self.model_name: str = model_name
+        self.cache_file: str = cache_file
+        self.memory_size: int = memory_size
+        self.memory_hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self.__memory: OrderedDict[str, list[float]] = OrderedDict()
+        self.__lock: Lock = Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+        self.__connection: sqlite3.Connection = sqlite3.connect(cache_file, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, embedding BLOB NOT NULL)")
+        self.__connection.commit()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+            Normalize a text before it is embedded, so that texts differing only by their whitespaces share the same embedding.
+
+            Parameters:
+                text (str): The text to normalize.
+
+            Returns:
+                str: The normalized text.
+        """
+
+        return ' '.join(text.split())
+
+    def __get_key(self, normalized_text: str) -> str:
+        """
+            Get the cache key of a normalized text.
+
+            Parameters:
+                normalized_text (str): The normalized text.
+
+            Returns:
+                str: The hash of the model name and the text.
+        """
+
+        return hashlib.sha256(f"{self.model_name}\0{normalized_text}".encode()).hexdigest()
+
+    def __get_from_memory(self, key: str) -> Optional[list[float]]:
+        """
+            Get an embedding from the in-memory tier and mark it as the most recently used.
+
+            Parameters:
+                key (str): The cache key.
+
+            Returns:
+                Optional[list[float]]: The embedding, or None if it is not in memory.
+        """
+
+        embedding = self.__memory.get(key)
+
+        if embedding is not None:
+            self.__memory.move_to_end(key)
+
+        return embedding
+
+    def __put_in_memory(self, key: str, embedding: list[float]) -> None:
+        """
+            Put an embedding in the in-memory tier, evicting the least recently used ones beyond `memory_size`.
+
+            Parameters:
+                key (str): The cache key.
+                embedding (list[float]): The embedding.
+        """
+
+        self.__memory[key] = embedding
+        self.__memory.move_to_end(key)
+
+        while len(self.__memory) > self.memory_size:
+            self.__memory.popitem(last=False)
+
+    def __get_from_disk(self, keys: list[str]) -> dict[str, list[float]]:
+        """
+            Get the persisted embeddings of several keys, 500 keys per query.
+
+            Parameters:
+                keys (list[str]): The cache keys.
+
+            Returns:
+                dict[str, list[float]]: The embeddings found, keyed by cache key.
+        """
+
+        embeddings = {}
+
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.__connection.execute(f"SELECT key, embedding FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+
+            for key, embedding in rows:
+                embeddings[key] = np.frombuffer(embedding, dtype=np.float32).tolist()
+
+        return embeddings
+
+    def __put_on_disk(self, embeddings: dict[str, list[float]]) -> None:
+        """
+            Persist embeddings in the SQLite file, as float32 blobs.
+
+            Parameters:
+                embeddings (dict[str, list[float]]): The embeddings, keyed by cache key.
+        """
+
+        self.__connection.executemany(
+            "INSERT OR IGNORE INTO embeddings (key, embedding) VALUES (?, ?)",
+            [(key, np.asarray(embedding, dtype=np.float32).tobytes()) for key, embedding in embeddings.items()]
+        )
+        self.__connection.commit()
+
+    def __call__(self, texts: Documents) -> Embeddings:
+        """
+            Get the embeddings of several texts.
+
+            This method:
+                1. Looks up each normalized text in the in-memory tier, then the missing ones in the SQLite file.
+                2. Embeds the texts still missing with the wrapped embedding function, in a single call.
+                3. Stores the new embeddings in both tiers.
+
+            Parameters:
+                texts (Documents): The texts to embed.
+
+            Returns:
+                Embeddings: The embedding of each text, in the same order.
+        """
+
+        normalized_texts = [self.normalize_text(text) for text in texts]
+        keys = [self.__get_key(normalized_text) for normalized_text in normalized_texts]
+        embeddings: dict[str, list[float]] = {}
+
+        with self.__lock:
+            for key in keys:
+                embedding = self.__get_from_memory(key)
+                if embedding is not None:
+                    embeddings[key] = embedding
+                    self.memory_hits += 1
+
+            disk_embeddings = self.__get_from_disk([key for key in dict.fromkeys(keys) if key not in embeddings])
+            self.disk_hits += sum(1 for key in keys if key in disk_embeddings)
+
+            for key, embedding in disk_embeddings.items():
+                self.__put_in_memory(key, embedding)
+
+            embeddings.update(disk_embeddings)
+
+        missing_texts = {key: normalized_text for key, normalized_text in zip(keys, normalized_texts) if key not in embeddings}
+
+        if missing_texts:
+            computed_embeddings = dict(zip(missing_texts.keys(), self.embedding_function(list(missing_texts.values()))))
+
+            with self.__lock:
+                self.misses += sum(1 for key in keys if key in computed_embeddings)
+                self.__put_on_disk(computed_embeddings)
+
+                for key, embedding in computed_embeddings.items():
+                    self.__put_in_memory(key, embedding)
+
+            embeddings.update(computed_embeddings)
+
+        return [embeddings[key] for key in keys]
+
+    def get_stats(self) -> dict[str, float]:
+        """
+            Get the hit and miss counters of the cache.
+
+            Returns:
+                dict[str, float]: The number of memory hits, disk hits and misses, the hit ratio and the number of embeddings kept in memory.
+        """
+
+        lookups = self.memory_hits + self.disk_hits + self.misses
+
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_ratio': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            'memory_size': len(self.__memory),
+        }
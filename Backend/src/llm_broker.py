@@ -0,0 +1,300 @@
+import json
+import time
+import zmq
+from collections import deque
+from logging import Logger
+from threading import Thread
+from typing import Callable, Iterator, Optional
+from zmq import Context, Socket
+
+
+class LLMBroker:
+    """
+        ZeroMQ broker dispatching the queries sent to the LLM processor to a pool of worker threads.
+
+        Clients (REQ sockets) connect to a ROUTER socket bound on the frontend address. Every query is queued in the lane
+        given by its 'priority' field ('interactive' by default, or 'batch'), and the scheduler hands queued queries to
+        idle workers, always draining the interactive lane first. Batch queries never occupy more than
+        `number_of_workers - reserved_interactive_workers` workers, so a flood of bulk queries (CSV import, re-tagging)
+        cannot delay a search. All the workers share the models loaded by the LLM processor.
+
+        A handler may return an iterator as the result of a query, which is then streamed: every item is sent back as a
+        partial response as soon as it is produced, and the worker stays busy until the final response. Only the clients
+        using `LLMClient.stream` (DEALER sockets) can receive several responses to a query.
+
+        Attributes:
+            handler (Callable[[dict], dict]): The function processing a query and returning the response to send back.
+            frontend_address (str): The address on which the clients send their queries.
+            number_of_workers (int): The number of worker threads processing queries in parallel.
+            reserved_interactive_workers (int): The number of workers that only process interactive queries.
+            app_logger (Logger): The application logger.
+    """
+
+    backend_address: str = "inproc://llm_workers"
+    lanes: tuple[str, ...] = ('interactive', 'batch')  # By decreasing priority.
+    ready_message: bytes = b'READY'
+    partial_message: bytes = b'PARTIAL'  # Prefix of the responses followed by other responses to the same query.
+
+    def __init__(self, handler: Callable[[dict], dict], frontend_address: str, number_of_workers: int, reserved_interactive_workers: int, app_logger: Logger):
+        self.handler: Callable[[dict], dict] = handler
+        self.frontend_address: str = frontend_address
+        self.number_of_workers: int = number_of_workers
+        self.reserved_interactive_workers: int = max(0, min(reserved_interactive_workers, number_of_workers - 1))
+        self.app_logger: Logger = app_logger
+        self.is_running: bool = False
+        self.context: Optional[Context] = None
+        self.frontend: Optional[Socket] = None
+        self.backend: Optional[Socket] = None
+        self.workers: list[Thread] = []
+        self.__idle_workers: deque[bytes] = deque()
+        self.__busy_workers: dict[bytes, str] = {}  # worker identity -> lane of the query it is processing
+        self.__queues: dict[str, deque[tuple[float, list[bytes], bytes]]] = {lane: deque() for lane in self.lanes}
+        self.__counters: dict[str, dict[str, float]] = {
+            lane: {'received': 0, 'dispatched': 0, 'total_wait_time': 0.0, 'max_wait_time': 0.0} for lane in self.lanes
+        }
+
+    def __process_queries(self) -> None:
+        """
+            Worker loop: receive a query from the broker, process it with the handler and send the response back.
+
+            The worker announces itself to the broker, then receives the client envelope followed by the query, and
+            replies with the same envelope followed by the response. If the result is an iterator, each of its items is
+            first sent as a partial response. A result that cannot be serialized to JSON is replied with an error, and a
+            failed send is only logged, so that a single query never stops the worker. The loop ends when the ZeroMQ
+            context is terminated.
+        """
+
+        socket = self.context.socket(zmq.DEALER)
+        socket.connect(self.backend_address)
+
+        try:
+            socket.send(self.ready_message)
+
+            while True:
+                frames = socket.recv_multipart()
+                envelope, query = frames[:-1], frames[-1]
+
+                try:
+                    response = self.handler(json.loads(query))
+
+                    if isinstance(response.get('result'), Iterator):
+                        for item in response['result']:
+                            partial_response = {'status': 'partial', 'result': item}
+                            socket.send_multipart([self.partial_message] + envelope + [json.dumps(partial_response).encode()])
+
+                        response = {'status': 'success', 'result': None}
+
+                    message = json.dumps(response).encode()
+                except zmq.error.ContextTerminated:
+                    raise
+                except Exception as e:
+                    self.app_logger.error(msg=str(e), exc_info=True)
+                    message = json.dumps({'status': 'error', 'error_message': str(e)}).encode()
+
+                try:
+                    socket.send_multipart(envelope + [message])
+                except zmq.error.ContextTerminated:
+                    raise
+                except zmq.ZMQError as e:  # The client may never get a response, but the worker keeps serving the next queries.
+                    self.app_logger.error(msg=f"The response to a query could not be sent: {e}", exc_info=True)
+        except zmq.error.ContextTerminated:
+            pass
+        finally:
+            socket.close(0)
+
+    def __get_lane(self, query: bytes) -> Optional[str]:
+        """
+            Get the lane of a query from its 'priority' field.
+
+            Parameters:
+                query (bytes): The JSON encoded query.
+
+            Returns:
+                Optional[str]: The lane of the query, or None if the query is a request for the broker statistics.
+
+            Raises:
+                ValueError: If the query is not a JSON object.
+        """
+
+        data = json.loads(query)
+
+        if not isinstance(data, dict):
+            raise ValueError("the query must be a JSON object.")
+
+        if data.get('method') == 'get_llm_processor_stats':
+            return None
+
+        priority = data.get('priority', 'interactive')
+        return priority if priority in self.lanes else 'interactive'
+
+    def __receive_query(self) -> None:
+        """
+            Receive a query from a client and queue it in its lane.
+
+            Requests for the broker statistics are answered immediately, without going through a worker.
+        """
+
+        frames = self.frontend.recv_multipart()
+        envelope, query = frames[:-1], frames[-1]
+
+        try:
+            lane = self.__get_lane(query)
+        except ValueError as e:
+            self.frontend.send_multipart(envelope + [json.dumps({'status': 'error', 'error_message': f'Invalid query: {e}'}).encode()])
+            return
+
+        if lane is None:
+            self.frontend.send_multipart(envelope + [json.dumps({'status': 'success', 'result': self.get_stats()}).encode()])
+            return
+
+        self.__queues[lane].append((time.monotonic(), envelope, query))
+        self.__counters[lane]['received'] += 1
+
+    def __receive_response(self) -> None:
+        """
+            Receive a message from a worker: either its ready announcement or a response to forward to the client.
+
+            The worker is marked as idle in both cases, unless the response is partial.
+        """
+
+        frames = self.backend.recv_multipart()
+        worker, message = frames[0], frames[1:]
+
+        if message[0] == self.partial_message:
+            self.frontend.send_multipart(message[1:])
+            return
+
+        self.__busy_workers.pop(worker, None)
+        self.__idle_workers.append(worker)
+
+        if message != [self.ready_message]:
+            self.frontend.send_multipart(message)
+
+    def __can_dispatch(self, lane: str) -> bool:
+        """
+            Check if a query of the given lane can be handed to an idle worker.
+
+            Parameters:
+                lane (str): The lane of the query.
+
+            Returns:
+                bool: True if an idle worker is available for this lane, False otherwise.
+        """
+
+        if not self.__idle_workers:
+            return False
+
+        if lane == 'interactive':
+            return True
+
+        busy_batch_workers = sum(1 for busy_lane in self.__busy_workers.values() if busy_lane == 'batch')
+        return busy_batch_workers < self.number_of_workers - self.reserved_interactive_workers
+
+    def __dispatch_queries(self) -> None:
+        """
+            Hand queued queries to idle workers, draining the lanes by decreasing priority.
+        """
+
+        for lane in self.lanes:
+            queue = self.__queues[lane]
+
+            while queue and self.__can_dispatch(lane):
+                enqueued_at, envelope, query = queue.popleft()
+                worker = self.__idle_workers.popleft()
+                self.__busy_workers[worker] = lane
+
+                wait_time = time.monotonic() - enqueued_at
+                counters = self.__counters[lane]
+                counters['dispatched'] += 1
+                counters['total_wait_time'] += wait_time
+                counters['max_wait_time'] = max(counters['max_wait_time'], wait_time)
+
+                self.backend.send_multipart([worker] + envelope + [query])
+
+    def bind(self) -> None:
+        """
+            Create the ZeroMQ context and bind the frontend and backend sockets.
+
+            Queries sent by the clients are queued by ZeroMQ until `run` is called.
+        """
+
+        self.context = zmq.Context()
+        self.frontend = self.context.socket(zmq.ROUTER)
+        self.frontend.bind(self.frontend_address)
+        self.backend = self.context.socket(zmq.ROUTER)
+        self.backend.bind(self.backend_address)
+
+    def run(self) -> None:
+        """
+            Start the worker threads and schedule the queries received from the clients.
+
+            This method blocks until the ZeroMQ context is terminated by `stop`.
+        """
+
+        self.is_running = True
+
+        for i in range(self.number_of_workers):
+            worker = Thread(target=self.__process_queries, name=f"llm-worker-{i}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+        poller = zmq.Poller()
+        poller.register(self.frontend, zmq.POLLIN)
+        poller.register(self.backend, zmq.POLLIN)
+
+        try:
+            while True:
+                sockets = dict(poller.poll())
+
+                if self.backend in sockets:
+                    self.__receive_response()
+
+                if self.frontend in sockets:
+                    self.__receive_query()
+
+                self.__dispatch_queries()
+        except zmq.error.ContextTerminated:
+            self.app_logger.warning("Context terminated during processing. Exiting...")
+        finally:
+            self.is_running = False
+            self.frontend.close(0)
+            self.backend.close(0)
+
+    def stop(self) -> None:
+        """
+            Terminate the ZeroMQ context, which ends the broker and the workers once their current query is processed.
+        """
+
+        if self.context is None:
+            return
+
+        if not self.is_running:  # The broker never ran, so nothing else will close its sockets.
+            self.frontend.close(0)
+            self.backend.close(0)
+
+        self.is_running = False
+        self.context.term()
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """
+            Get the queue depth and wait time counters of each lane.
+
+            Returns:
+                dict: For each lane, the number of queued, received, dispatched and running queries,
+                    and the average and maximum time (in seconds) a query waited before reaching a worker.
+        """
+
+        stats = {}
+
+        for lane in self.lanes:
+            counters = self.__counters[lane]
+            stats[lane] = {
+                'queue_depth': len(self.__queues[lane]),
+                'running': sum(1 for busy_lane in self.__busy_workers.values() if busy_lane == lane),
+                'received': counters['received'],
+                'dispatched': counters['dispatched'],
+                'average_wait_time': counters['total_wait_time'] / counters['dispatched'] if counters['dispatched'] else 0.0,
+                'max_wait_time': counters['max_wait_time'],
+            }
+
+        return stats
@@ -0,0 +1,229 @@
+import json
+import os
+import zmq
+from threading import Lock, BoundedSemaphore
+from typing import Iterator, Optional
+from zmq import Context, Socket
+
+
+class LLMClient:
+    """
+        Per-process ZeroMQ client used to send queries to the LLM processor.
+
+        The client keeps one ZeroMQ context and a pool of connected REQ sockets that are reused across calls,
+        instead of creating a new context, socket and TCP handshake for every query. It is thread-safe and
+        fork-aware: a process forked by gunicorn rebuilds its own context and pool on first use, and never touches
+        the sockets inherited from its parent.
+
+        Attributes:
+            address (str): The address of the LLM processor.
+            timeout (int): The send/receive timeout of a query, in milliseconds.
+            pool_size (int): The maximum number of sockets opened at the same time by this process.
+            retries (int): The number of times a query is resent on a new socket after a connection failure.
+    """
+
+    def __init__(self, address: str, timeout: int, pool_size: int, retries: int):
+        self.address: str = address
+        self.timeout: int = timeout
+        self.pool_size: int = pool_size
+        self.retries: int = retries
+        self.__pid: Optional[int] = None
+        self.__context: Optional[Context] = None
+        self.__idle_sockets: list[Socket] = []
+        self.__lock: Lock = Lock()
+        self.__available_sockets: BoundedSemaphore = BoundedSemaphore(pool_size)
+
+        # A lock or semaphore held by another thread when the process forks would stay held forever in the child.
+        os.register_at_fork(after_in_child=self.__reset_after_fork)
+
+    def __reset_after_fork(self) -> None:
+        """
+            Reset the synchronization primitives and the pool in a freshly forked process.
+
+            The context and sockets inherited from the parent process are dropped without being closed, as they belong to the parent.
+        """
+
+        self.__pid = None
+        self.__context = None
+        self.__idle_sockets = []
+        self.__lock = Lock()
+        self.__available_sockets = BoundedSemaphore(self.pool_size)
+
+    def __get_context(self) -> Context:
+        """
+            Get the ZeroMQ context of the current process, creating it if needed.
+
+            Returns:
+                Context: The ZeroMQ context owned by the current process.
+        """
+
+        if self.__context is None or self.__pid != os.getpid():
+            self.__pid = os.getpid()
+            self.__context = zmq.Context()
+            self.__idle_sockets = []
+
+        return self.__context
+
+    def __acquire_socket(self) -> Socket:
+        """
+            Take an idle socket from the pool, or open a new one if none is idle.
+
+            This method blocks while `pool_size` sockets are already in use by other threads.
+
+            Returns:
+                Socket: A REQ socket connected to the LLM processor.
+        """
+
+        self.__available_sockets.acquire()
+
+        try:
+            with self.__lock:
+                context = self.__get_context()
+                if self.__idle_sockets:
+                    return self.__idle_sockets.pop()
+
+                socket = context.socket(zmq.REQ)
+                socket.setsockopt(zmq.LINGER, 0)
+                socket.setsockopt(zmq.SNDTIMEO, self.timeout)
+                socket.setsockopt(zmq.RCVTIMEO, self.timeout)
+                socket.connect(self.address)
+                return socket
+        except Exception:
+            self.__available_sockets.release()
+            raise
+
+    def __release_socket(self, socket: Socket) -> None:
+        """
+            Give a healthy socket back to the pool.
+
+            Parameters:
+                socket (Socket): The socket to release.
+        """
+
+        with self.__lock:
+            if self.__pid == os.getpid():
+                self.__idle_sockets.append(socket)
+
+        self.__available_sockets.release()
+
+    def __discard_socket(self, socket: Socket) -> None:
+        """
+            Close a socket that is in an unknown state (timeout or connection error) instead of returning it to the pool.
+
+            A REQ socket that did not receive its reply cannot send again, so it must be replaced by a new one.
+
+            Parameters:
+                socket (Socket): The socket to discard.
+        """
+
+        socket.close(linger=0)
+        self.__available_sockets.release()
+
+    def request(self, message: dict) -> dict:
+        """
+            Send a message to the LLM processor and wait for its response.
+
+            This method:
+                1. Takes a connected socket from the pool.
+                2. Sends the message and waits for the response, up to `timeout` milliseconds.
+                3. On a connection error, discards the socket and resends the message on a new one, up to `retries` times.
+
+            Parameters:
+                message (dict): The JSON serializable message to send.
+
+            Returns:
+                dict: The response of the LLM processor.
+
+            Raises:
+                TimeoutError: If the LLM processor did not respond in time. The query is not resent, as it may still be processed.
+                ConnectionError: If the query could not be delivered after all the retries.
+        """
+
+        last_error = None
+
+        for attempt in range(self.retries + 1):
+            socket = self.__acquire_socket()
+
+            try:
+                socket.send_json(message)
+                response = socket.recv_json()
+            except zmq.Again:
+                self.__discard_socket(socket)
+                raise TimeoutError(f"The LLM processor did not respond within {self.timeout} ms.")
+            except zmq.ZMQError as e:
+                self.__discard_socket(socket)
+                last_error = e
+            else:
+                self.__release_socket(socket)
+                return response
+
+        raise ConnectionError(f"Unable to reach the LLM processor at {self.address}: {last_error}")
+
+    def stream(self, message: dict) -> Iterator[dict]:
+        """
+            Send a message to the LLM processor and yield its responses as they arrive, for the methods streaming their result.
+
+            This method:
+                1. Opens a DEALER socket, as a REQ socket only accepts one response per query, and counts it in the pool size.
+                2. Sends the message with the empty delimiter frame expected by the broker.
+                3. Yields every response, the partial ones ('status': 'partial') then the final one, waiting up to
+                   `timeout` milliseconds for each.
+                4. Closes the socket, also when the caller stops iterating before the final response.
+
+            The query is not resent on a connection error, as some of its responses may already have been yielded.
+
+            Parameters:
+                message (dict): The JSON serializable message to send.
+
+            Yields:
+                dict: The responses of the LLM processor.
+
+            Raises:
+                TimeoutError: If the LLM processor did not send a response in time.
+                ConnectionError: If the LLM processor could not be reached.
+        """
+
+        self.__available_sockets.acquire()
+
+        try:
+            with self.__lock:
+                socket = self.__get_context().socket(zmq.DEALER)
+        except Exception:
+            self.__available_sockets.release()
+            raise
+
+        try:
+            socket.setsockopt(zmq.LINGER, 0)
+            socket.setsockopt(zmq.SNDTIMEO, self.timeout)
+            socket.setsockopt(zmq.RCVTIMEO, self.timeout)
+            socket.connect(self.address)
+            socket.send_multipart([b'', json.dumps(message).encode()])
+
+            while True:
+                response = json.loads(socket.recv_multipart()[-1])
+                yield response
+
+                if response.get('status') != 'partial':
+                    return
+        except zmq.Again:
+            raise TimeoutError(f"The LLM processor did not respond within {self.timeout} ms.")
+        except zmq.ZMQError as e:
+            raise ConnectionError(f"Unable to reach the LLM processor at {self.address}: {e}")
+        finally:
+            socket.close(linger=0)
+            self.__available_sockets.release()
+
+    def close(self) -> None:
+        """
+            Close all the idle sockets and terminate the context of the current process.
+        """
+
+        with self.__lock:
+            if self.__context is not None and self.__pid == os.getpid():
+                for socket in self.__idle_sockets:
+                    socket.close(linger=0)
+                self.__context.term()
+
+            self.__pid = None
+            self.__context = None
+            self.__idle_sockets = []
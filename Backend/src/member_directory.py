@@ -0,0 +1,315 @@
+import base64
+import datetime
+import gzip
+import hashlib
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, fields
+from threading import Lock
+from typing import Any, Callable, ClassVar, Iterable, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class Member:
+    """
+        Immutable record of a member of the directory, with the same attributes (and JSON serialization) as `User`.
+    """
+
+    user_id: int
+    first_name: str
+    last_name: str
+    registration_date: Optional[datetime.datetime]
+    email: str
+    membership_category: Optional[str]
+    job_position: Optional[str]
+    affiliation_organization: Optional[str]
+    skills: Optional[str]
+    years_experience_ia: Optional[float]
+    years_experience_healthcare: Optional[float]
+    community_involvement: Optional[str]
+    suggestions: Optional[str]
+    tags: Optional[str]
+    consent: Optional[str]
+    profile_photo: Optional[str]
+    linkedin: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class MemberDirectorySnapshot:
+    """
+        Immutable snapshot of all the members at a given version of the directory.
+
+        Attributes:
+            version (int): The version of the directory the snapshot was built from.
+            members (tuple[Member, ...]): All the members, ordered by id.
+            members_by_id (dict[int, Member]): The members, keyed by id.
+            members_by_email (dict[str, Member]): The members, keyed by email.
+            orderings (dict[str, tuple[list[tuple], tuple[Member, ...]]]): The sort keys and the members sorted by each
+                field, computed on the first page requested with this sort field.
+    """
+
+    sortable_fields: ClassVar[tuple[str, ...]] = (
+        'user_id', 'first_name', 'last_name', 'email', 'registration_date', 'membership_category',
+        'affiliation_organization', 'years_experience_ia', 'years_experience_healthcare'
+    )
+
+    version: int
+    members: tuple[Member, ...]
+    members_by_id: dict[int, Member]
+    members_by_email: dict[str, Member]
+    orderings: dict[str, tuple[list[tuple], tuple[Member, ...]]] = field(default_factory=dict, compare=False)
+
+    @classmethod
+    def build(cls, version: int, members: Iterable[Member]) -> 'MemberDirectorySnapshot':
+        """
+            Build a snapshot from the members of a version of the directory.
+
+            Parameters:
+                version (int): The version of the directory.
+                members (Iterable[Member]): The members, ordered by id.
+
+            Returns:
+                MemberDirectorySnapshot: The snapshot.
+        """
+
+        members = tuple(members)
+        return cls(version, members, {member.user_id: member for member in members}, {member.email: member for member in members})
+
+    @staticmethod
+    def get_sort_key(member: Member, sort_field: str) -> tuple:
+        """
+            Get the sort key of a member: its value of the sort field (case-insensitive, missing values after the others), then its id.
+
+            Parameters:
+                member (Member): The member.
+                sort_field (str): The sort field.
+
+            Returns:
+                tuple: The sort key.
+        """
+
+        value = getattr(member, sort_field)
+
+        if isinstance(value, str):
+            value = value.casefold()
+
+        return value is None, value, member.user_id
+
+    @staticmethod
+    def encode_cursor(sort: str, sort_key: tuple) -> str:
+        """
+            Encode the position after a member in a sort order as an opaque cursor.
+
+            Parameters:
+                sort (str): The sort order, a sortable field optionally prefixed by '-' for the descending order.
+                sort_key (tuple): The sort key of the member.
+
+            Returns:
+                str: The cursor.
+        """
+
+        is_none, value, user_id = sort_key
+
+        if isinstance(value, datetime.datetime):
+            value = value.isoformat()
+
+        return base64.urlsafe_b64encode(json.dumps([sort, is_none, value, user_id]).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(sort: str, cursor: str) -> tuple:
+        """
+            Decode a cursor returned by `encode_cursor`.
+
+            Parameters:
+                sort (str): The sort order of the requested page.
+                cursor (str): The cursor.
+
+            Returns:
+                tuple: The sort key of the member the cursor points after.
+
+            Raises:
+                ValueError: If the cursor is invalid or was returned for another sort order.
+        """
+
+        try:
+            cursor_sort, is_none, value, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+            if value is not None and sort.lstrip('-') == 'registration_date':
+                value = datetime.datetime.fromisoformat(value)
+        except (ValueError, TypeError) as e:
+            raise ValueError("Invalid cursor.") from e
+
+        if cursor_sort != sort or is_none != (value is None) or not isinstance(user_id, int):
+            raise ValueError("Invalid cursor.")
+
+        return is_none, value, user_id
+
+    def get_page(self, sort: str, limit: int, cursor: Optional[str] = None) -> tuple[list[Member], Optional[str]]:
+        """
+            Get a page of members in a sort order, with keyset pagination.
+
+            This method:
+                1. Sorts the members by the sort field then by id, once per snapshot and sort field.
+                2. Finds the position following the cursor by bisecting the sort keys, so that members added or removed
+                   before the cursor do not shift the next pages.
+                3. Returns at most `limit` members from that position, and the cursor of the next page.
+
+            Parameters:
+                sort (str): The sort order, a sortable field optionally prefixed by '-' for the descending order.
+                limit (int): The maximum number of members of the page.
+                cursor (Optional[str]): The cursor returned with the previous page, or None for the first page.
+
+            Returns:
+                tuple[list[Member], Optional[str]]: The members of the page, and the cursor of the next page (None if it is the last page).
+
+            Raises:
+                ValueError: If the sort order or the cursor is invalid.
+        """
+
+        sort_field = sort.lstrip('-')
+        descending = sort.startswith('-')
+
+        if sort_field not in self.sortable_fields:
+            raise ValueError(f"Unsupported sort field: {sort_field}")
+
+        if sort_field not in self.orderings:
+            members = tuple(sorted(self.members, key=lambda member: self.get_sort_key(member, sort_field)))
+            self.orderings[sort_field] = [self.get_sort_key(member, sort_field) for member in members], members
+
+        sort_keys, members = self.orderings[sort_field]
+        cursor_key = self.decode_cursor(sort, cursor) if cursor else None
+
+        try:
+            if descending:
+                end = bisect_left(sort_keys, cursor_key) if cursor_key else len(sort_keys)
+                start = max(0, end - limit)
+                page = list(reversed(members[start:end]))
+                has_next_page = start > 0
+            else:
+                start = bisect_right(sort_keys, cursor_key) if cursor_key else 0
+                end = start + limit
+                page = list(members[start:end])
+                has_next_page = end < len(members)
+        except TypeError as e:  # The value of the cursor is not of the type of the sort field.
+            raise ValueError("Invalid cursor.") from e
+
+        next_cursor = self.encode_cursor(sort, self.get_sort_key(page[-1], sort_field)) if page and has_next_page else None
+
+        return page, next_cursor
+
+
+@dataclass(frozen=True, slots=True)
+class SerializedMembers:
+    """
+        JSON body of the list of all the members of a snapshot, ready to be sent.
+
+        Attributes:
+            version (int): The version of the directory the body was built from.
+            body (bytes): The JSON body.
+            gzip_body (bytes): The gzip-compressed JSON body.
+            etag (str): The strong entity tag of the body, derived from its hash. The compressed body uses the same tag
+                with a '-gzip' suffix, as it is a different representation.
+    """
+
+    version: int
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+    @classmethod
+    def build(cls, version: int, body: bytes) -> 'SerializedMembers':
+        """
+            Build the serialized members from a JSON body.
+
+            Parameters:
+                version (int): The version of the directory.
+                body (bytes): The JSON body.
+
+            Returns:
+                SerializedMembers: The serialized members.
+        """
+
+        return cls(version, body, gzip.compress(body, mtime=0), hashlib.sha256(body).hexdigest()[:32])
+
+
+def project_member(member: Member, field_names: Iterable[str]) -> dict[str, Any]:
+    """
+        Get some of the attributes of a member.
+
+        Parameters:
+            member (Member): The member.
+            field_names (Iterable[str]): The names of the attributes.
+
+        Returns:
+            dict[str, Any]: The attributes, keyed by name.
+    """
+
+    return {field_name: getattr(member, field_name) for field_name in field_names}
+
+
+MEMBER_FIELDS: tuple[str, ...] = tuple(member_field.name for member_field in fields(Member))
+
+
+class MemberDirectory:
+    """
+        In-memory read model of the members, shared by the read routes.
+
+        The directory keeps an immutable snapshot of all the members. Each write to the users table increments a version
+        stored in the database, in the same transaction, so every process of the server notices the writes made by the
+        others: a read compares the version of its snapshot with the stored one, and the snapshot is rebuilt and swapped
+        only if they differ. Reads are then served from memory, without hydrating any ORM object.
+
+        Attributes:
+            load_version (Callable[[], int]): The function returning the stored version of the directory.
+            load_members (Callable[[], Iterable[Member]]): The function returning all the members, ordered by id.
+    """
+
+    def __init__(self, load_version: Callable[[], int], load_members: Callable[[], Iterable[Member]]):
+        self.load_version: Callable[[], int] = load_version
+        self.load_members: Callable[[], Iterable[Member]] = load_members
+        self.__snapshot: Optional[MemberDirectorySnapshot] = None
+        self.__serialized_members: Optional[SerializedMembers] = None
+        self.__lock: Lock = Lock()
+
+    def get_snapshot(self) -> MemberDirectorySnapshot:
+        """
+            Get the snapshot of the current version of the directory, rebuilding it if the directory changed.
+
+            Returns:
+                MemberDirectorySnapshot: The snapshot.
+        """
+
+        version = self.load_version()
+        snapshot = self.__snapshot
+
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self.__lock:
+            if self.__snapshot is None or self.__snapshot.version != version:  # Another thread may have rebuilt it while we waited.
+                self.__snapshot = MemberDirectorySnapshot.build(version, self.load_members())
+
+            return self.__snapshot
+
+    def get_serialized_members(self, snapshot: MemberDirectorySnapshot, serialize: Callable[[list[Member]], bytes]) -> SerializedMembers:
+        """
+            Get the JSON body of the list of all the members of a snapshot, serializing it only once per version.
+
+            Parameters:
+                snapshot (MemberDirectorySnapshot): The snapshot.
+                serialize (Callable[[list[Member]], bytes]): The function serializing the members.
+
+            Returns:
+                SerializedMembers: The serialized members of the snapshot.
+        """
+
+        serialized_members = self.__serialized_members
+
+        if serialized_members is not None and serialized_members.version == snapshot.version:
+            return serialized_members
+
+        with self.__lock:
+            if self.__serialized_members is None or self.__serialized_members.version != snapshot.version:
+                self.__serialized_members = SerializedMembers.build(snapshot.version, serialize(list(snapshot.members)))
+
+            return self.__serialized_members
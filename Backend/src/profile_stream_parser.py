@@ -0,0 +1,82 @@
+import json
+import re
+from typing import Optional
+
+
+class GenericProfileStreamParser:
+    """
+        Incremental parser of the generic profiles generated by the LLM, as its output is streamed.
+
+        The expert recommendation prompt asks for the JSON format of `Experts`, i.e. '{"profiles": ["...", "..."]}'.
+        The parser looks for the 'profiles' array in the text received so far, and returns every string of the array as
+        soon as its closing quote is received, so that the experts of the first profiles can be searched while the LLM
+        is still generating the next ones. Any text before the array (such as a Markdown code fence) is ignored.
+
+        Attributes:
+            output (str): All the text received so far.
+            profiles (list[str]): The profiles parsed so far, in order.
+            is_complete (bool): Whether the closing bracket of the array was received.
+            is_invalid (bool): Whether the array contains something else than strings, in which case the parsing stops
+                and only the complete output can be parsed.
+    """
+
+    array_start_pattern: re.Pattern = re.compile(r'"profiles"\s*:\s*\[')
+    decoder: json.JSONDecoder = json.JSONDecoder()
+
+    def __init__(self):
+        self.output: str = ""
+        self.profiles: list[str] = []
+        self.is_complete: bool = False
+        self.is_invalid: bool = False
+        self.__position: Optional[int] = None  # Position of the next array item in the output, once the array was found.
+
+    def feed(self, chunk: str) -> list[str]:
+        """
+            Parse a chunk of the output of the LLM.
+
+            Parameters:
+                chunk (str): The text generated since the previous chunk.
+
+            Returns:
+                list[str]: The profiles completed by this chunk.
+        """
+
+        self.output += chunk
+
+        if self.is_complete or self.is_invalid:
+            return []
+
+        if self.__position is None:
+            array_start = self.array_start_pattern.search(self.output)
+
+            if array_start is None:
+                return []
+
+            self.__position = array_start.end()
+
+        profiles = []
+
+        while True:
+            while self.__position < len(self.output) and self.output[self.__position] in ' \t\r\n,':
+                self.__position += 1
+
+            if self.__position == len(self.output):
+                break
+
+            if self.output[self.__position] == ']':
+                self.is_complete = True
+                break
+
+            if self.output[self.__position] != '"':
+                self.is_invalid = True
+                break
+
+            try:
+                profile, self.__position = self.decoder.raw_decode(self.output, self.__position)
+            except json.JSONDecodeError:  # The closing quote of the string was not received yet.
+                break
+
+            profiles.append(profile)
+
+        self.profiles.extend(profiles)
+        return profiles
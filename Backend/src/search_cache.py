@@ -0,0 +1,362 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import unicodedata
+import numpy as np
+from threading import Lock
+from typing import Any, Optional
+
+
+class SearchResultCache:
+    """
+        Cache of the expert recommendations of the '/search' route, shared by all the processes of the server.
+
+        Recommendations are stored in a SQLite file, keyed by the hash of the normalized question and by the version of
+        the vector store they were computed from. The LLM processor increments the version whenever experts are added,
+        updated or deleted, so that a recommendation computed from a previous state of the vector store is never served,
+        even if it is stored after the change. Entries expire after `ttl` seconds, and only the `max_entries` most
+        recently used entries are kept.
+
+        The number of hits and misses and the time taken to answer them are also stored in the file, so that the
+        statistics cover the searches of every process.
+
+        Each process opens its own connection on first use, as SQLite connections must not be shared across a fork.
+
+        Attributes:
+            cache_file (str): The path of the SQLite file of the cache.
+            ttl (float): The number of seconds a recommendation is served for.
+            max_entries (int): The maximum number of recommendations kept.
+    """
+
+    def __init__(self, cache_file: str, ttl: float, max_entries: int):
+        self.cache_file: str = cache_file
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.__connection: Optional[sqlite3.Connection] = None
+        self.__pid: Optional[int] = None
+        self.__lock: Lock = Lock()
+
+    def __get_connection(self) -> sqlite3.Connection:
+        """
+            Get the connection of the current process to the cache file, creating the tables on first use.
+
+            Returns:
+                sqlite3.Connection: The connection.
+        """
+
+        if self.__connection is None or self.__pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            self.__connection = sqlite3.connect(self.cache_file, check_same_thread=False)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS search_results "
+                "(key TEXT PRIMARY KEY, version INTEGER NOT NULL, recommendation TEXT NOT NULL, created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+            )
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache_state "
+                "(id INTEGER PRIMARY KEY, version INTEGER NOT NULL, hits INTEGER NOT NULL, misses INTEGER NOT NULL, hit_seconds REAL NOT NULL, miss_seconds REAL NOT NULL)"
+            )
+            self.__connection.execute("INSERT OR IGNORE INTO search_cache_state VALUES (1, 0, 0, 0, 0.0, 0.0)")
+            self.__connection.commit()
+            self.__pid = os.getpid()
+
+        return self.__connection
+
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """
+            Normalize a question, so that questions differing only by their case, whitespaces or final punctuation share the same recommendation.
+
+            Parameters:
+                question (str): The question.
+
+            Returns:
+                str: The normalized question.
+        """
+
+        return ' '.join(unicodedata.normalize('NFKC', question).casefold().split()).rstrip(' ?!.')
+
+    def __get_key(self, question: str, version: int) -> str:
+        """
+            Get the cache key of a question for a version of the vector store.
+
+            Parameters:
+                question (str): The question.
+                version (int): The version of the vector store.
+
+            Returns:
+                str: The hash of the version and the normalized question.
+        """
+
+        return hashlib.sha256(f"{version}\0{self.normalize_question(question)}".encode()).hexdigest()
+
+    def get(self, question: str) -> tuple[Optional[dict[str, Any]], int]:
+        """
+            Get the recommendation of a question computed from the current version of the vector store.
+
+            Parameters:
+                question (str): The question.
+
+            Returns:
+                tuple[Optional[dict[str, Any]], int]: The recommendation, or None if it is not cached or expired, and the
+                    current version of the vector store, with which a recommendation computed now must be stored.
+        """
+
+        now = time.time()
+
+        with self.__lock:
+            connection = self.__get_connection()
+            version = connection.execute("SELECT version FROM search_cache_state WHERE id = 1").fetchone()[0]
+            key = self.__get_key(question, version)
+            row = connection.execute("SELECT recommendation FROM search_results WHERE key = ? AND created_at > ?", (key, now - self.ttl)).fetchone()
+
+            if row:
+                connection.execute("UPDATE search_results SET last_used_at = ? WHERE key = ?", (now, key))
+                connection.commit()
+
+        return (json.loads(row[0]) if row else None), version
+
+    def put(self, question: str, version: int, recommendation: dict[str, Any]) -> None:
+        """
+            Store the recommendation of a question, and evict the expired and least recently used recommendations.
+
+            Parameters:
+                question (str): The question.
+                version (int): The version of the vector store returned by `get` before the recommendation was computed.
+                recommendation (dict[str, Any]): The recommendation.
+        """
+
+        now = time.time()
+
+        with self.__lock:
+            connection = self.__get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO search_results (key, version, recommendation, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                (self.__get_key(question, version), version, json.dumps(recommendation), now, now)
+            )
+            connection.execute("DELETE FROM search_results WHERE created_at <= ?", (now - self.ttl,))
+            connection.execute(
+                "DELETE FROM search_results WHERE key NOT IN (SELECT key FROM search_results ORDER BY last_used_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            connection.commit()
+
+    def invalidate(self) -> None:
+        """
+            Increment the version of the vector store, so that no recommendation computed before is served, and delete them.
+        """
+
+        with self.__lock:
+            connection = self.__get_connection()
+            connection.execute("UPDATE search_cache_state SET version = version + 1 WHERE id = 1")
+            connection.execute("DELETE FROM search_results")
+            connection.commit()
+
+    def record_search(self, is_hit: bool, seconds: float) -> None:
+        """
+            Count a search answered from the cache or not, with the time taken to answer it.
+
+            Parameters:
+                is_hit (bool): True if the recommendation was found in the cache, False otherwise.
+                seconds (float): The time taken to answer the search, in seconds.
+        """
+
+        with self.__lock:
+            connection = self.__get_connection()
+
+            if is_hit:
+                connection.execute("UPDATE search_cache_state SET hits = hits + 1, hit_seconds = hit_seconds + ? WHERE id = 1", (seconds,))
+            else:
+                connection.execute("UPDATE search_cache_state SET misses = misses + 1, miss_seconds = miss_seconds + ? WHERE id = 1", (seconds,))
+
+            connection.commit()
+
+    def get_stats(self) -> dict[str, float]:
+        """
+            Get the counters of the cache, for the searches of every process.
+
+            Returns:
+                dict[str, float]: The number of hits and misses, the hit ratio, the average time taken to answer a hit
+                    and a miss in seconds, the number of stored recommendations and the version of the vector store.
+        """
+
+        with self.__lock:
+            connection = self.__get_connection()
+            version, hits, misses, hit_seconds, miss_seconds = connection.execute(
+                "SELECT version, hits, misses, hit_seconds, miss_seconds FROM search_cache_state WHERE id = 1"
+            ).fetchone()
+            entries = connection.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+            'average_hit_seconds': hit_seconds / hits if hits else 0.0,
+            'average_miss_seconds': miss_seconds / misses if misses else 0.0,
+            'entries': entries,
+            'version': version,
+        }
+
+
+class SimilarQuestionCache:
+    """
+        Cache of the generic profiles generated by the LLM for the questions of the '/search' route, looked up by similarity.
+
+        Each answered question is stored with its embedding and its generic profiles. A new question whose embedding has
+        a cosine similarity of at least `threshold` with a stored question reuses its generic profiles, so that the
+        paraphrases of a question skip the generation; the experts are still queried from the current vector store.
+
+        The index is the matrix of the normalized embeddings of the stored questions, searched exhaustively with a single
+        matrix product: with at most `max_entries` questions, this takes well under a millisecond, and unlike an
+        approximate index it never misses the closest question. The least recently used question is replaced once the
+        cache is full. The questions are persisted in a SQLite file and loaded at start.
+
+        Attributes:
+            cache_file (str): The path of the SQLite file of the cache.
+            threshold (float): The minimum cosine similarity with a stored question to reuse its generic profiles.
+            max_entries (int): The maximum number of questions kept.
+            hits (int): The number of questions answered with the generic profiles of a similar question.
+            misses (int): The number of questions without a similar question.
+    """
+
+    def __init__(self, cache_file: str, threshold: float, max_entries: int):
+        self.cache_file: str = cache_file
+        self.threshold: float = threshold
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__lock: Lock = Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+        self.__connection: sqlite3.Connection = sqlite3.connect(cache_file, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS similar_questions (question TEXT PRIMARY KEY, embedding BLOB NOT NULL, generic_profiles TEXT NOT NULL, last_used_at REAL NOT NULL)"
+        )
+        self.__connection.commit()
+
+        rows = self.__connection.execute(
+            "SELECT question, embedding, generic_profiles, last_used_at FROM similar_questions ORDER BY last_used_at DESC LIMIT ?", (max_entries,)
+        ).fetchall()
+        self.__questions: list[str] = [row[0] for row in rows]
+        self.__embeddings: Optional[np.ndarray] = np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows]) if rows else None
+        self.__generic_profiles: list[list[str]] = [json.loads(row[2]) for row in rows]
+        self.__last_used_at: list[float] = [row[3] for row in rows]
+
+    @staticmethod
+    def normalize_embedding(embedding: list[float]) -> np.ndarray:
+        """
+            Scale an embedding to a unit norm, so that the dot product of two embeddings is their cosine similarity.
+
+            Parameters:
+                embedding (list[float]): The embedding.
+
+            Returns:
+                np.ndarray: The normalized embedding.
+        """
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+
+        return vector / norm if norm else vector
+
+    def find(self, embedding: list[float]) -> tuple[Optional[str], float]:
+        """
+            Find the stored question closest to a question, without counting a hit or a miss.
+
+            Parameters:
+                embedding (list[float]): The embedding of the question.
+
+            Returns:
+                tuple[Optional[str], float]: The closest stored question (None if the cache is empty) and its cosine similarity.
+        """
+
+        with self.__lock:
+            if self.__embeddings is None:
+                return None, 0.0
+
+            similarities = self.__embeddings @ self.normalize_embedding(embedding)
+            index = int(np.argmax(similarities))
+
+            return self.__questions[index], float(similarities[index])
+
+    def get(self, embedding: list[float]) -> Optional[list[str]]:
+        """
+            Get the generic profiles of the stored question most similar to a question, if it is similar enough.
+
+            Parameters:
+                embedding (list[float]): The embedding of the question.
+
+            Returns:
+                Optional[list[str]]: The generic profiles, or None if no stored question has a similarity of at least `threshold`.
+        """
+
+        question, similarity = self.find(embedding)
+
+        with self.__lock:
+            if question is None or similarity < self.threshold or question not in self.__questions:  # The question may have been evicted since.
+                self.misses += 1
+                return None
+
+            index = self.__questions.index(question)
+            self.__last_used_at[index] = time.time()
+            self.__connection.execute("UPDATE similar_questions SET last_used_at = ? WHERE question = ?", (self.__last_used_at[index], question))
+            self.__connection.commit()
+            self.hits += 1
+
+            return list(self.__generic_profiles[index])
+
+    def put(self, question: str, embedding: list[float], generic_profiles: list[str]) -> None:
+        """
+            Store the generic profiles of a question, replacing the least recently used question if the cache is full.
+
+            Parameters:
+                question (str): The question.
+                embedding (list[float]): The embedding of the question.
+                generic_profiles (list[str]): The generic profiles generated for the question.
+        """
+
+        vector = self.normalize_embedding(embedding)
+        now = time.time()
+
+        with self.__lock:
+            if question in self.__questions:
+                index = self.__questions.index(question)
+            elif len(self.__questions) < self.max_entries:
+                index = len(self.__questions)
+                self.__questions.append(question)
+                self.__generic_profiles.append(generic_profiles)
+                self.__last_used_at.append(now)
+                self.__embeddings = vector[np.newaxis] if self.__embeddings is None else np.vstack([self.__embeddings, vector])
+            else:
+                index = int(np.argmin(self.__last_used_at))
+                self.__connection.execute("DELETE FROM similar_questions WHERE question = ?", (self.__questions[index],))
+
+            self.__questions[index] = question
+            self.__embeddings[index] = vector
+            self.__generic_profiles[index] = generic_profiles
+            self.__last_used_at[index] = now
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO similar_questions (question, embedding, generic_profiles, last_used_at) VALUES (?, ?, ?, ?)",
+                (question, vector.tobytes(), json.dumps(generic_profiles), now)
+            )
+            self.__connection.commit()
+
+    def get_stats(self) -> dict[str, float]:
+        """
+            Get the counters of the cache.
+
+            Returns:
+                dict[str, float]: The number of hits and misses, the hit ratio and the number of stored questions.
+        """
+
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'entries': len(self.__questions),
+        }
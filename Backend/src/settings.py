@@ -6,16 +6,50 @@ SERVER_SETTINGS = {
     "vector_directory": "../vector_store",
     "expert_recommendation_llm_model": "mistral:instruct",
     "expert_recommendation_embeddings": "all-mpnet-base-v2",
+    "expert_recommendation_experts_per_profile": 5,
+    "expert_recommendation_max_distance": 0.5,
+    "expert_recommendation_aggregation": "min",  # Score of an expert: 'min' (closest sentence) or 'mean' distance of its sentences
+    "expert_recommendation_n_results": 20,
+    "expert_recommendation_max_n_results": 320,
+    "expert_recommendation_retriever": "shortlist",  # 'shortlist' (closest expert vectors, then their sentences) or 'sentences'
+    "expert_recommendation_shortlist_size": 50,
+    "expert_recommendation_sentence_cache_bytes": 256 * 1024 * 1024,  # Embeddings of the sentences of the shortlisted experts kept in memory
+    "embedding_cache_file": "../cache/embeddings.db",
+    "embedding_cache_memory_size": 20000,
+    "translator_backend": "google",  # 'google', or 'identity' to run without network
+    "translation_memory_file": "../cache/translations.db",
+    "search_cache_file": "../cache/search_results.db",
+    "search_cache_ttl": 86400,
+    "search_cache_max_entries": 1000,
+    "similar_question_cache_file": "../cache/similar_questions.db",
+    "similar_question_threshold": 0.9,
+    "similar_question_cache_size": 2000,
     "keywords_llm_model": "camembert/camembert-large",
     "spacy_nlp_fr": "fr_core_news_sm",
     "spacy_nlp_en": "en_core_web_sm",
+    "spacy_batch_size": 64,
+    "spacy_n_process": 1,
     "users_csv_file": "../resources/users.csv",
     "users_json_file": "../resources/users.json",
+    "users_csv_export_directory": "../cache/exports",
     "linkedin_data_file": "../resources/out.json",
     "access_log_file": "../server_access.log",
     "error_log_file": "../server_error.log",
     "sqlite_db": "users.db",
     "chroma_collection_name": "Experts",
+    "chroma_expert_collection_name": "ExpertVectors",
+    "chroma_batch_size": 1000,
     "zeromq_request_address": "tcp://localhost:5555",
     "zeromq_response_address": "tcp://*:5555",
+    "zeromq_request_timeout": 600000,  # milliseconds
+    "zeromq_request_retries": 2,
+    "zeromq_client_pool_size": 8,
+    "llm_workers": 4,
+    "llm_reserved_interactive_workers": 1,
+    "keywords_tagging_workers": 3,
+    "populate_commit_batch_size": 25,
+    "csv_chunk_size": 500,
+    "import_jobs_poll_interval": 2,
+    "users_page_size": 100,
+    "users_max_page_size": 1000,
 }
@@ -0,0 +1,82 @@
+import spacy
+from typing import Literal
+from spacy import Language
+
+
+class SentenceSegmenter:
+    """
+        Sentence segmentation shared by the ingestion of the experts skills and the keywords extraction.
+
+        The spaCy models are loaded with all their components disabled except the statistical sentence recognizer
+        ('senter'), or with the rule-based sentencizer if the model has no sentence recognizer, as only the sentence
+        boundaries are needed. Texts are processed in batches with `nlp.pipe`.
+
+        Attributes:
+            nlps (dict[str, Language]): The spaCy Language object of each language.
+            batch_size (int): The number of texts processed at once by spaCy.
+            n_process (int): The number of processes used by spaCy for the batches larger than `batch_size`.
+    """
+
+    def __init__(self, model_names: dict[str, str], batch_size: int, n_process: int):
+        self.nlps: dict[str, Language] = {language: self.load_nlp(model_name) for language, model_name in model_names.items()}
+        self.batch_size: int = batch_size
+        self.n_process: int = n_process
+
+    @staticmethod
+    def load_nlp(model_name: str) -> Language:
+        """
+            Load a spaCy model for sentence segmentation. Downloads the model if not already installed.
+
+            Parameters:
+                model_name (str): Name of the spaCy model.
+
+            Returns:
+                Language: spaCy Language object whose only enabled component sets the sentence boundaries.
+        """
+
+        if not spacy.util.is_package(model_name):
+            spacy.cli.download(model_name)
+
+        nlp = spacy.load(model_name)
+
+        for pipe_name in nlp.pipe_names:
+            nlp.disable_pipe(pipe_name)
+
+        sentence_component = next((name for name in ('senter', 'sentencizer') if name in nlp.component_names), None)
+
+        if sentence_component:
+            nlp.enable_pipe(sentence_component)
+        else:
+            nlp.add_pipe('sentencizer')
+
+        return nlp
+
+    def get_nlp(self, language: Literal['en', 'fr']) -> Language:
+        """
+            Get the spaCy Language object of a language.
+
+            Parameters:
+                language (Literal['en', 'fr']): The language code.
+
+            Returns:
+                Language: spaCy Language object.
+        """
+
+        return self.nlps[language]
+
+    def segment(self, texts: list[str], language: Literal['en', 'fr']) -> list[list[str]]:
+        """
+            Split several texts into sentences.
+
+            Parameters:
+                texts (list[str]): The texts to split.
+                language (Literal['en', 'fr']): The language of the texts.
+
+            Returns:
+                list[list[str]]: The sentences of each text, in the same order.
+        """
+
+        n_process = self.n_process if len(texts) > self.batch_size else 1  # Starting processes costs more than small batches.
+        docs = self.nlps[language].pipe(texts, batch_size=self.batch_size, n_process=n_process)
+
+        return [[sentence.text for sentence in doc.sents] for doc in docs]
@@ -0,0 +1,320 @@
+import hashlib
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Literal
+from deep_translator import GoogleTranslator
+
+
+class TranslatorBackend(ABC):
+    """
+        Base class of the services translating lines of text.
+
+        Attributes:
+            name (str): The name of the backend, part of the translation memory keys.
+            external_calls (int): The number of requests sent to an external service.
+    """
+
+    name: str = ''
+
+    def __init__(self):
+        self.external_calls: int = 0
+
+    @abstractmethod
+    def translate_lines(self, lines: list[str], destination_language: Literal['en', 'fr']) -> list[str]:
+        """
+            Translate several lines of text, none of them containing a line break.
+
+            Parameters:
+                lines (list[str]): The lines to translate.
+                destination_language (Literal['en', 'fr']): Destination language code ('en' for English, 'fr' for French).
+
+            Returns:
+                list[str]: The translation of each line, in the same order.
+        """
+
+
+class IdentityTranslatorBackend(TranslatorBackend):
+    """
+        Local stand-in backend returning the lines unchanged, so that the pipeline can run and be benchmarked without network.
+    """
+
+    name: str = 'identity'
+
+    def translate_lines(self, lines: list[str], destination_language: Literal['en', 'fr']) -> list[str]:
+        return list(lines)
+
+
+class GoogleTranslatorBackend(TranslatorBackend):
+    """
+        Backend translating lines with the Google Translator API.
+
+        Lines are packed into as few requests as possible: each request joins consecutive lines with line breaks, up to the
+        maximum text length accepted by the API. The API detects a single source language per request, so the lines
+        passed at once must come from the same text. If a translated request does not have as many lines as the original
+        one, its lines are translated one request at a time instead.
+    """
+
+    name: str = 'google'
+    max_length: int = 5000  # Maximum text length accepted by the Google Translator API
+
+    def send_request(self, text: str, destination_language: Literal['en', 'fr']) -> str:
+        """
+            Send a single translation request to the Google Translator API.
+
+            Parameters:
+                text (str): The text to translate, at most `max_length` characters long.
+                destination_language (Literal['en', 'fr']): Destination language code.
+
+            Returns:
+                str: The translated text.
+        """
+
+        self.external_calls += 1
+        return GoogleTranslator(source='auto', target=destination_language).translate(text) or ''
+
+    def __translate_line(self, line: str, destination_language: Literal['en', 'fr']) -> str:
+        """
+            Translate a single line, splitting it on whitespaces if it is longer than the maximum text length.
+
+            Parameters:
+                line (str): The line to translate.
+                destination_language (Literal['en', 'fr']): Destination language code.
+
+            Returns:
+                str: The translated line.
+        """
+
+        if len(line) <= self.max_length:
+            return self.send_request(line, destination_language)
+
+        chunks = []
+        chunk = ''
+
+        for word in line.split():
+            if chunk and len(chunk) + len(word) + 1 > self.max_length:
+                chunks.append(chunk)
+                chunk = ''
+            chunk = f"{chunk} {word}" if chunk else word
+
+        if chunk:
+            chunks.append(chunk)
+
+        return ' '.join(self.send_request(chunk, destination_language) for chunk in chunks)
+
+    def __translate_pack(self, lines: list[str], destination_language: Literal['en', 'fr']) -> list[str]:
+        """
+            Translate consecutive lines with a single request, or one request per line if the line count is not preserved.
+
+            Parameters:
+                lines (list[str]): The lines to translate, whose total length fits in a single request.
+                destination_language (Literal['en', 'fr']): Destination language code.
+
+            Returns:
+                list[str]: The translation of each line, in the same order.
+        """
+
+        if len(lines) == 1:
+            return [self.__translate_line(lines[0], destination_language)]
+
+        translated_lines = self.send_request('\n'.join(lines), destination_language).split('\n')
+
+        if len(translated_lines) != len(lines):
+            return [self.__translate_line(line, destination_language) for line in lines]
+
+        return [translated_line.strip() for translated_line in translated_lines]
+
+    def translate_lines(self, lines: list[str], destination_language: Literal['en', 'fr']) -> list[str]:
+        translated_lines = []
+        pack = []
+        pack_length = 0
+
+        for line in lines:
+            if pack and pack_length + len(line) + 1 > self.max_length:
+                translated_lines.extend(self.__translate_pack(pack, destination_language))
+                pack = []
+                pack_length = 0
+
+            pack.append(line)
+            pack_length += len(line) + 1
+
+        if pack:
+            translated_lines.extend(self.__translate_pack(pack, destination_language))
+
+        return translated_lines
+
+
+class Translator:
+    """
+        Translator with a persistent translation memory in front of a pluggable backend.
+
+        Texts are translated line by line. Each line is looked up in the translation memory (a SQLite file keyed by the
+        backend name, the destination language and the hash of the line), and only the lines never translated before
+        are sent to the backend, with one call per text: a backend may detect a single source language per request, so
+        the lines of texts written in different languages are never translated together. Editing one line of a profile
+        therefore only translates that line again. A line translated into itself (already in the destination language,
+        or left untranslated) is not stored, so that it is translated again next time.
+
+        Attributes:
+            backend (TranslatorBackend): The backend translating the lines missing from the translation memory.
+            memory_file (str): The path of the SQLite file of the translation memory.
+            hits (int): The number of lines found in the translation memory.
+            misses (int): The number of lines translated by the backend.
+    """
+
+    backends: dict[str, type[TranslatorBackend]] = {
+        GoogleTranslatorBackend.name: GoogleTranslatorBackend,
+        IdentityTranslatorBackend.name: IdentityTranslatorBackend,
+    }
+
+    def __init__(self, backend: TranslatorBackend, memory_file: str):
+        self.backend: TranslatorBackend = backend
+        self.memory_file: str = memory_file
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__lock: Lock = Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(memory_file)), exist_ok=True)
+        self.__connection: sqlite3.Connection = sqlite3.connect(memory_file, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, translation TEXT NOT NULL)")
+        self.__connection.create_function('sha256', 1, lambda text: hashlib.sha256(text.encode()).hexdigest(), deterministic=True)
+        self.__connection.execute("DELETE FROM translations WHERE substr(key, -64) = sha256(translation)")  # Lines stored as their own translation.
+        self.__connection.commit()
+
+    @classmethod
+    def from_backend_name(cls, backend_name: str, memory_file: str) -> 'Translator':
+        """
+            Create a translator using the backend registered under the given name.
+
+            Parameters:
+                backend_name (str): The name of the backend ('google' or 'identity').
+                memory_file (str): The path of the SQLite file of the translation memory.
+
+            Returns:
+                Translator: The translator.
+        """
+
+        if backend_name not in cls.backends:
+            raise ValueError(f"Unknown translator backend: {backend_name}")
+
+        return cls(cls.backends[backend_name](), memory_file)
+
+    def __get_key(self, line: str, destination_language: str) -> str:
+        """
+            Get the translation memory key of a line.
+
+            Parameters:
+                line (str): The line to translate.
+                destination_language (str): Destination language code.
+
+            Returns:
+                str: The key of the translation.
+        """
+
+        return f"{self.backend.name}:{destination_language}:{hashlib.sha256(line.encode()).hexdigest()}"
+
+    def __get_from_memory(self, keys: list[str]) -> dict[str, str]:
+        """
+            Get the stored translations of several keys, 500 keys per query.
+
+            Parameters:
+                keys (list[str]): The translation memory keys.
+
+            Returns:
+                dict[str, str]: The translations found, keyed by translation memory key.
+        """
+
+        translations = {}
+
+        with self.__lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self.__connection.execute(f"SELECT key, translation FROM translations WHERE key IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+                translations.update(rows)
+
+        return translations
+
+    def __put_in_memory(self, translations: dict[str, str]) -> None:
+        """
+            Store new translations in the translation memory.
+
+            Parameters:
+                translations (dict[str, str]): The translations, keyed by translation memory key.
+        """
+
+        with self.__lock:
+            self.__connection.executemany("INSERT OR REPLACE INTO translations (key, translation) VALUES (?, ?)", list(translations.items()))
+            self.__connection.commit()
+
+    def translate_batch(self, texts: list[str], destination_language: Literal['en', 'fr']) -> list[str]:
+        """
+            Translate several texts to the specified destination language.
+
+            This method:
+                1. Splits every text into lines, and removes duplicated lines.
+                2. Looks up the translation of each line in the translation memory.
+                3. Translates the missing lines of each text with one call to the backend, and stores the lines whose
+                   translation differs from the original line.
+                4. Rebuilds each text from its translated lines.
+
+            Parameters:
+                texts (list[str]): The texts to translate.
+                destination_language (Literal['en', 'fr']): Destination language code ('en' for English, 'fr' for French).
+
+            Returns:
+                list[str]: The translation of each text, in the same order.
+        """
+
+        texts_lines = [[line.strip() for line in text.split('\n')] for text in texts]
+        keys = {line: self.__get_key(line, destination_language) for lines in texts_lines for line in lines if line}
+        translations = self.__get_from_memory(list(keys.values()))
+        missing_lines = {line for line, key in keys.items() if key not in translations}
+
+        self.hits += len(keys) - len(missing_lines)
+        self.misses += len(missing_lines)
+        translated_lines = {}
+
+        for lines in texts_lines:
+            text_missing_lines = [line for line in dict.fromkeys(lines) if line in missing_lines and line not in translated_lines]
+
+            if text_missing_lines:
+                translated_lines.update(zip(text_missing_lines, self.backend.translate_lines(text_missing_lines, destination_language)))
+
+        if translated_lines:
+            self.__put_in_memory({keys[line]: translation for line, translation in translated_lines.items() if translation != line})
+            translations.update((keys[line], translation) for line, translation in translated_lines.items())
+
+        return ['\n'.join(translations[keys[line]] if line else '' for line in lines).strip() for lines in texts_lines]
+
+    def translate(self, text: str, destination_language: Literal['en', 'fr']) -> str:
+        """
+            Translate a text to the specified destination language.
+
+            Parameters:
+                text (str): Text to be translated.
+                destination_language (Literal['en', 'fr']): Destination language code ('en' for English, 'fr' for French).
+
+            Returns:
+                str: Translated text.
+        """
+
+        return self.translate_batch([text], destination_language)[0]
+
+    def get_stats(self) -> dict[str, float]:
+        """
+            Get the counters of the translation memory and of the backend.
+
+            Returns:
+                dict[str, float]: The number of hits and misses of the translation memory, its hit ratio and the number of external calls of the backend.
+        """
+
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'external_calls': self.backend.external_calls,
+        }
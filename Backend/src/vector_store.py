@@ -0,0 +1,535 @@
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from threading import Lock
+from typing import Literal, Optional
+from chromadb.api.models import Collection
+from chromadb.api.types import EmbeddingFunction
+
+
+class ExpertVectorStore:
+    """
+        Sentence-level vector store of the experts skills, backed by a Chroma collection.
+
+        Each document is one sentence of an expert's skills, with the expert's email as metadata. Documents are
+        embedded and written in large batches rather than one sentence at a time, so that building the collection
+        is bounded by the embedding throughput instead of the per-call overhead of Chroma.
+
+        Document ids are derived from the expert's email and a hash of the sentence, so updating an expert only
+        embeds the sentences that are new and deletes the ones that vanished.
+
+        Optionally, a second collection stores one vector per expert, the normalized centroid of the embeddings of its
+        sentences, with the expert's email as id. It is kept up to date with the sentences, and serves as a first-stage
+        retriever: an expert with many sentences is then a single candidate instead of crowding the closest sentences.
+        The sentences of the shortlisted experts are re-scored in memory, from their embeddings kept by expert (in
+        float32) after their first shortlisting and forgotten when the sentences of the expert change. The least
+        recently shortlisted experts are forgotten first once their embeddings exceed `sentence_cache_bytes`.
+
+        Attributes:
+            collection (Collection): The Chroma collection storing the sentences.
+            embedding_function (EmbeddingFunction): The function used to embed the sentences.
+            batch_size (int): The number of sentences embedded and written to the collection at once.
+            expert_collection (Optional[Collection]): The Chroma collection storing the vector of each expert, if any.
+            sentence_cache_bytes (Optional[int]): The maximum size of the embeddings of the sentences kept in memory,
+                unbounded if None.
+    """
+
+    def __init__(
+            self,
+            collection: Collection,
+            embedding_function: EmbeddingFunction,
+            batch_size: int,
+            expert_collection: Optional[Collection] = None,
+            sentence_cache_bytes: Optional[int] = None
+    ):
+        self.collection: Collection = collection
+        self.embedding_function: EmbeddingFunction = embedding_function
+        self.batch_size: int = batch_size
+        self.expert_collection: Optional[Collection] = expert_collection
+        self.sentence_cache_bytes: Optional[int] = sentence_cache_bytes
+        self.__sentence_vectors: OrderedDict[str, np.ndarray] = OrderedDict()  # expert email -> normalized embeddings of its sentences, least recently used first
+        self.__sentence_vectors_bytes: int = 0
+        self.__sentence_vectors_generation: int = 0  # Incremented when some sentence vectors are forgotten.
+        self.__lock: Lock = Lock()
+
+    @staticmethod
+    def get_document_id(expert_email: str, sentence: str) -> str:
+        """
+            Get the deterministic id of a sentence of an expert's skills.
+
+            Parameters:
+                expert_email (str): The email of the expert.
+                sentence (str): The sentence.
+
+            Returns:
+                str: The id of the document, made of the expert's email and the hash of the sentence.
+        """
+
+        return f"{expert_email}:{hashlib.sha256(sentence.encode()).hexdigest()[:32]}"
+
+    def count(self) -> int:
+        """
+            Get the number of sentences stored in the collection.
+
+            Returns:
+                int: The number of documents in the collection.
+        """
+
+        return self.collection.count()
+
+    def get_expert_emails(self) -> set[str]:
+        """
+            Get the emails of all the experts having sentences in the collection, reading the metadata only, one batch at a time.
+
+            Returns:
+                set[str]: The emails of the experts.
+        """
+
+        expert_emails = set()
+        offset = 0
+
+        while True:
+            stored_documents = self.collection.get(include=["metadatas"], limit=self.batch_size, offset=offset)
+            expert_emails.update(metadata['expert_email'] for metadata in stored_documents['metadatas'])
+
+            if len(stored_documents['ids']) < self.batch_size:
+                return expert_emails
+
+            offset += self.batch_size
+
+    def get_expert_document_ids(self, expert_emails: list[str]) -> dict[str, set[str]]:
+        """
+            Get the ids of the stored sentences of several experts, with one query per batch of experts.
+
+            Parameters:
+                expert_emails (list[str]): The emails of the experts.
+
+            Returns:
+                dict[str, set[str]]: The ids of the stored sentences of each expert found in the collection.
+        """
+
+        expert_document_ids = {}
+
+        for start in range(0, len(expert_emails), self.batch_size):
+            stored_documents = self.collection.get(where={"expert_email": {"$in": expert_emails[start:start + self.batch_size]}}, include=["metadatas"])
+
+            for document_id, metadata in zip(stored_documents['ids'], stored_documents['metadatas']):
+                expert_document_ids.setdefault(metadata['expert_email'], set()).add(document_id)
+
+        return expert_document_ids
+
+    def add_documents(self, ids: list[str], documents: list[str], metadatas: list[dict]) -> None:
+        """
+            Embed and add documents to the collection, one batch of `batch_size` documents at a time.
+
+            Parameters:
+                ids (list[str]): The ids of the documents.
+                documents (list[str]): The documents.
+                metadatas (list[dict]): The metadata of each document.
+        """
+
+        for start in range(0, len(documents), self.batch_size):
+            end = start + self.batch_size
+            self.collection.add(
+                ids=ids[start:end],
+                embeddings=self.embedding_function(documents[start:end]),
+                documents=documents[start:end],
+                metadatas=metadatas[start:end]
+            )
+
+    def sync_experts(self, expert_sentences: dict[str, list[str]]) -> tuple[int, int]:
+        """
+            Make the stored sentences of several experts match their current sentences.
+
+            This method:
+                1. Computes the deterministic id of every current sentence of the experts.
+                2. Fetches the ids of the sentences already stored for these experts.
+                3. Deletes the stored sentences that are no longer part of the experts' skills.
+                4. Embeds and adds, in batches, only the sentences that are not stored yet.
+                5. Updates the vectors of the experts whose sentences changed.
+
+            Parameters:
+                expert_sentences (dict[str, list[str]]): The current sentences of each expert, keyed by email.
+
+            Returns:
+                tuple[int, int]: The number of sentences added and deleted.
+        """
+
+        ids = []
+        documents = []
+        metadatas = []
+        obsolete_document_ids = []
+        changed_expert_emails = []
+        stored_document_ids = self.get_expert_document_ids(list(expert_sentences))
+
+        for expert_email, sentences in expert_sentences.items():
+            current_document_ids = set()
+            known_document_ids = stored_document_ids.get(expert_email, set())
+
+            for sentence in sentences:
+                document_id = self.get_document_id(expert_email, sentence)
+
+                if document_id in current_document_ids:  # Same sentence repeated in the skills of the expert
+                    continue
+
+                current_document_ids.add(document_id)
+
+                if document_id not in known_document_ids:
+                    ids.append(document_id)
+                    documents.append(sentence)
+                    metadatas.append({"expert_email": expert_email})
+
+            obsolete_document_ids.extend(known_document_ids - current_document_ids)
+
+            if current_document_ids != known_document_ids:
+                changed_expert_emails.append(expert_email)
+
+        for start in range(0, len(obsolete_document_ids), self.batch_size):
+            self.collection.delete(ids=obsolete_document_ids[start:start + self.batch_size])
+
+        self.add_documents(ids, documents, metadatas)
+        self.update_expert_vectors(changed_expert_emails)
+        self.forget_sentence_vectors(changed_expert_emails)
+
+        return len(documents), len(obsolete_document_ids)
+
+    def count_experts(self) -> int:
+        """
+            Get the number of experts stored in the expert collection.
+
+            Returns:
+                int: The number of expert vectors, 0 without expert collection.
+        """
+
+        return self.expert_collection.count() if self.expert_collection is not None else 0
+
+    def get_expert_vector_emails(self) -> set[str]:
+        """
+            Get the emails of all the experts having a vector in the expert collection, one batch at a time.
+
+            Returns:
+                set[str]: The emails of the experts, empty without expert collection.
+        """
+
+        expert_emails = set()
+        offset = 0
+
+        while self.expert_collection is not None:
+            stored_experts = self.expert_collection.get(include=[], limit=self.batch_size, offset=offset)
+            expert_emails.update(stored_experts['ids'])
+
+            if len(stored_experts['ids']) < self.batch_size:
+                break
+
+            offset += self.batch_size
+
+        return expert_emails
+
+    @staticmethod
+    def get_expert_vectors(expert_emails: list[str], embeddings: list[list[float]]) -> tuple[list[str], np.ndarray]:
+        """
+            Compute the vector of each expert, the normalized centroid of the normalized embeddings of its sentences.
+
+            Parameters:
+                expert_emails (list[str]): The email of the expert of each sentence.
+                embeddings (list[list[float]]): The embedding of each sentence.
+
+            Returns:
+                tuple[list[str], np.ndarray]: The emails of the experts, and their vectors (one row per expert).
+        """
+
+        emails, expert_indexes = np.unique(np.asarray(expert_emails, dtype=object), return_inverse=True)
+        sentence_vectors = np.asarray(embeddings, dtype=np.float64).reshape(len(expert_emails), -1)
+        sentence_vectors /= np.maximum(np.linalg.norm(sentence_vectors, axis=1, keepdims=True), 1e-12)
+
+        expert_vectors = np.zeros((len(emails), sentence_vectors.shape[1]))
+        np.add.at(expert_vectors, expert_indexes, sentence_vectors)
+        expert_vectors /= np.maximum(np.linalg.norm(expert_vectors, axis=1, keepdims=True), 1e-12)
+
+        return emails.tolist(), expert_vectors
+
+    def get_sentence_vectors(self, expert_emails: list[str]) -> tuple[list[str], np.ndarray]:
+        """
+            Get the stored embeddings of the sentences of several experts, with one query per batch of experts.
+
+            Parameters:
+                expert_emails (list[str]): The emails of the experts.
+
+            Returns:
+                tuple[list[str], np.ndarray]: The email of the expert of each sentence, and the embeddings of the sentences (one row per sentence).
+        """
+
+        sentence_emails = []
+        embeddings = []
+
+        for start in range(0, len(expert_emails), self.batch_size):
+            stored_documents = self.collection.get(where={"expert_email": {"$in": expert_emails[start:start + self.batch_size]}}, include=["embeddings", "metadatas"])
+            sentence_emails.extend(metadata['expert_email'] for metadata in stored_documents['metadatas'])
+            embeddings.extend(stored_documents['embeddings'])
+
+        return sentence_emails, np.asarray(embeddings, dtype=np.float64).reshape(len(sentence_emails), -1)
+
+    def get_shortlisted_sentence_vectors(self, expert_emails: list[str]) -> dict[str, np.ndarray]:
+        """
+            Get the normalized embeddings of the sentences of several experts, fetching only the experts not kept in memory yet.
+
+            The fetched experts are kept in memory, forgetting the least recently used ones beyond `sentence_cache_bytes`.
+
+            Parameters:
+                expert_emails (list[str]): The emails of the experts.
+
+            Returns:
+                dict[str, np.ndarray]: The normalized embeddings of the sentences of each expert found (one row per sentence).
+        """
+
+        with self.__lock:
+            generation = self.__sentence_vectors_generation
+            expert_vectors = {expert_email: self.__sentence_vectors[expert_email] for expert_email in expert_emails if expert_email in self.__sentence_vectors}
+
+            for expert_email in expert_vectors:
+                self.__sentence_vectors.move_to_end(expert_email)
+
+        missing_expert_emails = [expert_email for expert_email in expert_emails if expert_email not in expert_vectors]
+
+        if missing_expert_emails:
+            sentence_emails, sentence_vectors = self.get_sentence_vectors(missing_expert_emails)
+            sentence_vectors = sentence_vectors.astype(np.float32)
+            sentence_vectors /= np.maximum(np.linalg.norm(sentence_vectors, axis=1, keepdims=True), 1e-12)
+            emails, expert_indexes = np.unique(np.asarray(sentence_emails, dtype=object), return_inverse=True)
+            loaded_vectors = {expert_email: sentence_vectors[expert_indexes == i] for i, expert_email in enumerate(emails.tolist())}
+            expert_vectors.update(loaded_vectors)
+
+            with self.__lock:
+                if generation == self.__sentence_vectors_generation:  # The sentences did not change while they were fetched.
+                    for expert_email, vectors in loaded_vectors.items():
+                        self.__forget_sentence_vectors(expert_email)
+                        self.__sentence_vectors[expert_email] = vectors
+                        self.__sentence_vectors_bytes += vectors.nbytes
+
+                    while self.sentence_cache_bytes is not None and self.__sentence_vectors_bytes > self.sentence_cache_bytes:
+                        self.__forget_sentence_vectors(next(iter(self.__sentence_vectors)))
+
+        return expert_vectors
+
+    def forget_sentence_vectors(self, expert_emails: list[str]) -> None:
+        """
+            Forget the embeddings of the sentences of several experts kept in memory, as their sentences changed.
+
+            Parameters:
+                expert_emails (list[str]): The emails of the experts.
+        """
+
+        with self.__lock:
+            self.__sentence_vectors_generation += 1
+
+            for expert_email in expert_emails:
+                self.__forget_sentence_vectors(expert_email)
+
+    def __forget_sentence_vectors(self, expert_email: str) -> None:
+        """
+            Forget the embeddings of the sentences of an expert kept in memory, if any. Must be called with the lock held.
+
+            Parameters:
+                expert_email (str): The email of the expert.
+        """
+
+        vectors = self.__sentence_vectors.pop(expert_email, None)
+
+        if vectors is not None:
+            self.__sentence_vectors_bytes -= vectors.nbytes
+
+    def update_expert_vectors(self, expert_emails: list[str]) -> None:
+        """
+            Recompute the vectors of several experts from their stored sentences, one batch of experts at a time.
+
+            The vectors of the experts without any sentence left are deleted. Nothing is done without expert collection.
+
+            Parameters:
+                expert_emails (list[str]): The emails of the experts.
+        """
+
+        if self.expert_collection is None:
+            return
+
+        for start in range(0, len(expert_emails), self.batch_size):
+            batch_expert_emails = expert_emails[start:start + self.batch_size]
+            sentence_emails, sentence_vectors = self.get_sentence_vectors(batch_expert_emails)
+
+            if sentence_emails:
+                emails, expert_vectors = self.get_expert_vectors(sentence_emails, sentence_vectors)
+                self.expert_collection.upsert(ids=emails, embeddings=expert_vectors.tolist(), metadatas=[{"expert_email": email} for email in emails])
+            else:
+                emails = []
+
+            emails_without_sentences = sorted(set(batch_expert_emails) - set(emails))
+
+            if emails_without_sentences:
+                self.expert_collection.delete(ids=emails_without_sentences)
+
+    def delete_experts(self, expert_emails: list[str]) -> None:
+        """
+            Delete all the sentences of several experts from the collection.
+
+            Parameters:
+                expert_emails (list[str]): The emails of the experts.
+        """
+
+        for start in range(0, len(expert_emails), self.batch_size):
+            self.collection.delete(where={"expert_email": {"$in": expert_emails[start:start + self.batch_size]}})
+
+            if self.expert_collection is not None:
+                self.expert_collection.delete(ids=expert_emails[start:start + self.batch_size])
+
+        self.forget_sentence_vectors(expert_emails)
+
+    @staticmethod
+    def rank_experts(expert_emails: list[str], distances: list[float], max_distance: float, aggregation: Literal['min', 'mean']) -> tuple[list[str], list[float]]:
+        """
+            Rank the experts found for a query text by the distance of their sentences.
+
+            Parameters:
+                expert_emails (list[str]): The email of the expert of each sentence found.
+                distances (list[float]): The cosine distance of each sentence to the query text.
+                max_distance (float): The maximum distance of the sentences taken into account.
+                aggregation (Literal['min', 'mean']): How the distances of the sentences of an expert are aggregated
+                    into its score: the distance of its closest sentence, or the mean distance of its sentences.
+
+            Returns:
+                tuple[list[str], list[float]]: The emails of the experts having a sentence within the maximum distance,
+                    by increasing score (then by order of appearance), and their scores.
+        """
+
+        distances = np.asarray(distances, dtype=np.float64)
+        is_close = distances <= max_distance
+
+        if not is_close.any():
+            return [], []
+
+        emails, first_indexes, expert_indexes = np.unique(np.asarray(expert_emails, dtype=object)[is_close], return_index=True, return_inverse=True)
+        close_distances = distances[is_close]
+
+        if aggregation == 'mean':
+            scores = np.bincount(expert_indexes, weights=close_distances) / np.bincount(expert_indexes)
+        else:
+            scores = np.full(len(emails), np.inf)
+            np.minimum.at(scores, expert_indexes, close_distances)
+
+        order = np.lexsort((first_indexes, scores))
+        return emails[order].tolist(), scores[order].tolist()
+
+    def query_experts(
+            self,
+            query_texts: list[str],
+            number_of_experts: int,
+            max_distance: float,
+            aggregation: Literal['min', 'mean'],
+            n_results: int,
+            max_n_results: int
+    ) -> list[dict[str, list]]:
+        """
+            Get the experts closest to each query text, as several sentences of the same expert may be found.
+
+            This method:
+                1. Embeds the query texts once, and queries the `n_results` closest sentences of all of them at once.
+                2. Ranks the experts of each query text with `rank_experts`.
+                3. Queries again, with twice as many results, the query texts that may lack experts: fewer than
+                   `number_of_experts` distinct experts were found ('min'), or some sentences of the experts within the
+                   maximum distance may not have been returned yet ('mean'). It stops once the returned sentences are
+                   all of the collection, are beyond the maximum distance, or reach `max_n_results`.
+
+            Parameters:
+                query_texts (list[str]): The texts to search for.
+                number_of_experts (int): The maximum number of experts to return for each query text.
+                max_distance (float): The maximum cosine distance of the sentences of the returned experts.
+                aggregation (Literal['min', 'mean']): How the distances of the sentences of an expert are aggregated into its score.
+                n_results (int): The number of sentences first returned for each query text.
+                max_n_results (int): The maximum number of sentences returned for a query text.
+
+            Returns:
+                list[dict[str, list]]: For each query text, the 'expert_emails' of the closest experts and their 'scores'.
+        """
+
+        query_embeddings = self.embedding_function(query_texts) if query_texts else []
+        experts = [{'expert_emails': [], 'scores': []} for _ in query_texts]
+        pending_indexes = list(range(len(query_texts)))
+
+        while pending_indexes:
+            found_sentences = self.collection.query(
+                query_embeddings=[query_embeddings[i] for i in pending_indexes],
+                n_results=n_results,
+                include=["metadatas", "distances"]
+            )
+            next_pending_indexes = []
+
+            for i, metadatas, distances in zip(pending_indexes, found_sentences['metadatas'], found_sentences['distances']):
+                expert_emails, scores = self.rank_experts([metadata['expert_email'] for metadata in metadatas], distances, max_distance, aggregation)
+                experts[i] = {'expert_emails': expert_emails[:number_of_experts], 'scores': scores[:number_of_experts]}
+
+                is_exhausted = len(distances) < n_results or distances[-1] > max_distance or n_results >= max_n_results
+                is_complete = aggregation == 'min' and len(expert_emails) >= number_of_experts  # The next sentences can only rank after them.
+
+                if not is_exhausted and not is_complete:
+                    next_pending_indexes.append(i)
+
+            pending_indexes = next_pending_indexes
+            n_results = min(2 * n_results, max_n_results)
+
+        return experts
+
+    def query_experts_in_shortlist(
+            self,
+            query_texts: list[str],
+            number_of_experts: int,
+            max_distance: float,
+            aggregation: Literal['min', 'mean'],
+            shortlist_size: int
+    ) -> list[dict[str, list]]:
+        """
+            Get the experts closest to each query text in two stages, as an alternative to `query_experts`.
+
+            This method:
+                1. Embeds the query texts once, and queries the `shortlist_size` closest expert vectors of all of them at once.
+                2. Gets the embeddings of the sentences of all the shortlisted experts, fetching at once the ones not kept in memory.
+                3. Computes the cosine distances of the query texts to these sentences, and ranks the experts of the
+                   shortlist of each query text with `rank_experts`, so that the scores are the ones of `query_experts`.
+
+            No expert is found without expert vectors, which `update_expert_vectors` builds from the stored sentences.
+
+            Parameters:
+                query_texts (list[str]): The texts to search for.
+                number_of_experts (int): The maximum number of experts to return for each query text.
+                max_distance (float): The maximum cosine distance of the sentences of the returned experts.
+                aggregation (Literal['min', 'mean']): How the distances of the sentences of an expert are aggregated into its score.
+                shortlist_size (int): The number of experts shortlisted for each query text.
+
+            Returns:
+                list[dict[str, list]]: For each query text, the 'expert_emails' of the closest experts and their 'scores'.
+        """
+
+        number_of_stored_experts = self.count_experts()
+
+        if not number_of_stored_experts or not query_texts:
+            return [{'expert_emails': [], 'scores': []} for _ in query_texts]
+
+        query_vectors = np.asarray(self.embedding_function(query_texts), dtype=np.float64).reshape(len(query_texts), -1)
+        query_vectors /= np.maximum(np.linalg.norm(query_vectors, axis=1, keepdims=True), 1e-12)
+
+        found_experts = self.expert_collection.query(query_embeddings=query_vectors.tolist(), n_results=min(shortlist_size, number_of_stored_experts), include=["metadatas"])
+        shortlists = [[metadata['expert_email'] for metadata in metadatas] for metadatas in found_experts['metadatas']]
+
+        expert_vectors = self.get_shortlisted_sentence_vectors(sorted(set().union(*shortlists)))
+        experts = []
+
+        for shortlist, query_vector in zip(shortlists, query_vectors):
+            shortlist = [expert_email for expert_email in shortlist if expert_email in expert_vectors]
+
+            if not shortlist:
+                experts.append({'expert_emails': [], 'scores': []})
+                continue
+
+            sentence_emails = [expert_email for expert_email in shortlist for _ in range(len(expert_vectors[expert_email]))]
+            distances = 1.0 - np.concatenate([expert_vectors[expert_email] for expert_email in shortlist]) @ query_vector.astype(np.float32)
+            expert_emails, scores = self.rank_experts(sentence_emails, distances, max_distance, aggregation)
+            experts.append({'expert_emails': expert_emails[:number_of_experts], 'scores': scores[:number_of_experts]})
+
+        return experts